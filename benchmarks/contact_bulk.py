@@ -0,0 +1,72 @@
+"""
+Benchmark: importing contacts one by one vs. through the bulk upsert path.
+
+Seeds a temporary SQLite database and times ``ContactRepository.create`` in a
+loop against ``ContactService.upsert_contacts`` for the same payloads, then
+re-runs the bulk path over existing emails to time updates. Run from the
+project root:
+
+    python -m benchmarks.contact_bulk [contacts]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from src.database.models import Base, User
+from src.repository.contacts import ContactRepository
+from src.schemas.contact import ContactCreate
+from src.services.contacts import ContactService
+
+
+def payloads(prefix: str, contacts: int):
+    return [
+        {
+            "first_name": f"First{i}",
+            "last_name": f"Last{i}",
+            "email": f"{prefix}{i}@example.com",
+            "phone": "123456789",
+            "birth_date": f"19{50 + i % 50}-{1 + i % 12:02d}-{1 + i % 28:02d}",
+        }
+        for i in range(contacts)
+    ]
+
+
+async def main(contacts: int):
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(insert(User), [{"id": 1, "username": "bench", "email": "bench@example.com", "password": "x"}])
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+
+        async with Session() as session:
+            repo = ContactRepository(session)
+            started = time.perf_counter()
+            for row in payloads("single", contacts):
+                await repo.create(ContactCreate.model_validate(row), user_id=1)
+            single = time.perf_counter() - started
+
+        async with Session() as session:
+            started = time.perf_counter()
+            await ContactService(session).upsert_contacts(payloads("bulk", contacts), user_id=1)
+            bulk = time.perf_counter() - started
+
+        async with Session() as session:
+            started = time.perf_counter()
+            results = await ContactService(session).upsert_contacts(payloads("bulk", contacts), user_id=1)
+            update = time.perf_counter() - started
+            assert all(r.status == "updated" for r in results)
+
+        print(f"{'path':<22}{'seconds':>10}{'rows/s':>12}")
+        for name, seconds in [("single create", single), ("bulk upsert (insert)", bulk), ("bulk upsert (update)", update)]:
+            print(f"{name:<22}{seconds:>10.2f}{contacts / seconds:>12.0f}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000))
@@ -0,0 +1,81 @@
+"""
+Benchmark: contact search through the FTS5 trigram index vs. a plain ILIKE scan.
+
+Seeds one account with N contacts in a temporary SQLite database and times
+``ContactRepository.search_contacts`` on both paths. Run from the project root:
+
+    python -m benchmarks.contact_search [contacts] [iterations]
+"""
+import asyncio
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+from datetime import date
+from unittest.mock import patch
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from src.database.models import Base, Contact, User
+from src.repository.contacts import ContactRepository
+
+QUERIES = ["john", "smi", "mar", "example.org", "zq7"]
+
+
+def random_word(rng: random.Random, length: int) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=length)).capitalize()
+
+
+async def seed(engine, contacts: int):
+    rng = random.Random(0)
+    names = ["John", "Mary", "Smith", "Johnson", "Marta"] + [random_word(rng, 6) for _ in range(2000)]
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User), [{"id": 1, "username": "bench", "email": "bench@example.com", "password": "x"}])
+        for start in range(0, contacts, 10000):
+            await conn.execute(insert(Contact), [
+                {
+                    "first_name": rng.choice(names),
+                    "last_name": rng.choice(names),
+                    "email": f"user{i}@{rng.choice(['example.com', 'example.org', 'mail.net'])}",
+                    "phone": "123456789",
+                    "birth_date": date(1990, 1, 1),
+                    "user_id": 1,
+                }
+                for i in range(start, min(start + 10000, contacts))
+            ])
+
+
+async def timed(session, query: str, iterations: int, indexed: bool) -> float:
+    repo = ContactRepository(session)
+    with patch.object(ContactRepository, "_dialect", return_value="sqlite" if indexed else None):
+        await repo.search_contacts(query, limit=20, user_id=1)
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await repo.search_contacts(query, limit=20, user_id=1)
+    return (time.perf_counter() - started) / iterations * 1000
+
+
+async def main(contacts: int, iterations: int):
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}")
+        started = time.perf_counter()
+        await seed(engine, contacts)
+        print(f"seeded {contacts} contacts in {time.perf_counter() - started:.1f}s")
+
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        print(f"{'query':<14}{'ILIKE ms':>10}{'FTS5 ms':>10}")
+        async with Session() as session:
+            for query in QUERIES:
+                scan = await timed(session, query, iterations, indexed=False)
+                indexed = await timed(session, query, iterations, indexed=True)
+                print(f"{query:<14}{scan:>10.2f}{indexed:>10.2f}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    asyncio.run(main(*(args + [200000, 20][len(args):])))
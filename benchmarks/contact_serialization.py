@@ -0,0 +1,79 @@
+"""
+Benchmark: CPU per contact list page, ORM + ContactResponse vs. plain rows + orjson.
+
+Seeds a temporary SQLite database and renders the same page repeatedly
+through both paths: loading ORM objects and serialising them through
+``ContactResponse``, and loading plain column rows and encoding them with
+``dump_contact_rows``. Both paths must produce identical bytes. Run from the
+project root:
+
+    python -m benchmarks.contact_serialization [page_size] [pages]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from src.database.models import Base, User
+from src.schemas.contact import ContactResponse
+from src.services.contacts import ContactService
+from src.services.serialization import dump_contact_rows
+
+adapter = TypeAdapter(List[ContactResponse])
+
+
+async def main(page_size: int, pages: int):
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(insert(User), [{"id": 1, "username": "bench", "email": "bench@example.com", "password": "x"}])
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+
+        async with Session() as session:
+            await ContactService(session).upsert_contacts([
+                {
+                    "first_name": f"First{i}",
+                    "last_name": f"Last{i}",
+                    "email": f"contact{i}@example.com",
+                    "phone": "123456789",
+                    "birth_date": f"19{50 + i % 50}-{1 + i % 12:02d}-{1 + i % 28:02d}",
+                    "additional_data": "note" if i % 2 else None,
+                }
+                for i in range(page_size)
+            ], user_id=1)
+
+        async def orm_page() -> bytes:
+            async with Session() as session:
+                contacts = await ContactService(session).get_contacts(0, page_size, 1)
+                return adapter.dump_json(adapter.validate_python(contacts, from_attributes=True))
+
+        async def row_page() -> bytes:
+            async with Session() as session:
+                return dump_contact_rows(await ContactService(session).get_contacts(0, page_size, 1, rows=True))
+
+        assert await orm_page() == await row_page()
+
+        print(f"{'path':<24}{'CPU ms/page':>14}")
+        results = {}
+        for name, render in [("ORM + ContactResponse", orm_page), ("rows + orjson", row_page)]:
+            started = time.process_time()
+            for _ in range(pages):
+                await render()
+            results[name] = (time.process_time() - started) / pages * 1000
+            print(f"{name:<24}{results[name]:>14.2f}")
+        print(f"saved per page: {results['ORM + ContactResponse'] - results['rows + orjson']:.2f} ms")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200,
+    ))
@@ -0,0 +1,38 @@
+"""
+Microbenchmark: verifying an access token with and without the token cache.
+
+Run from the project root:
+
+    python -m benchmarks.jwt_decode [iterations]
+"""
+import sys
+import timeit
+
+from jose import jwt
+
+from src.conf.config import config
+from src.services.auth import create_access_token, decode_token, token_cache
+
+
+def main(iterations: int = 20000):
+    token = create_access_token(
+        data={"sub": "firstname.lastname@example.com"},
+        expires_delta=config.ACCESS_TOKEN_EXPIRE_MINUTES,
+    )
+    print(f"algorithm={config.ALGORITHM} token_size={len(token)} bytes iterations={iterations}")
+
+    uncached = timeit.timeit(
+        lambda: jwt.decode(token, config.SECRET_KEY, algorithms=[config.ALGORITHM]),
+        number=iterations,
+    )
+    token_cache.clear()
+    decode_token(token)
+    cached = timeit.timeit(lambda: decode_token(token), number=iterations)
+
+    for name, total in (("jwt.decode", uncached), ("decode_token (cached)", cached)):
+        print(f"{name:<24}{total / iterations * 1e6:10.2f} us/op")
+    print(f"speedup: {uncached / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -1,9 +1,39 @@
-from fastapi import FastAPI, Depends
+import asyncio
+import math
+from contextlib import asynccontextmanager, suppress
+
+from fastapi import FastAPI, Depends, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from fastapi.staticfiles import StaticFiles
+
+from src.api import contacts, utils, auth, metrics
+from src.conf.config import config
+from src.database.db import AsyncDBSession, engine
+from src.database.schema import upgrade_schema
+from src.services.auth import hashing_pool, mailer, setup_password_hashing
+from src.services.hashing import PoolSaturatedError
+from src.services.rate_limit import RateLimitExceeded
+
 
-from src.api import contacts, utils, auth
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if config.DB_UPGRADE_SCHEMA:
+        await upgrade_schema(engine)
+    await setup_password_hashing()
+    digest_job = None
+    if config.BIRTHDAY_DIGEST_ENABLED:
+        digest_job = asyncio.create_task(contacts.birthday_digest.run_daily(AsyncDBSession))
+    yield
+    if digest_job is not None:
+        digest_job.cancel()
+        with suppress(asyncio.CancelledError):
+            await digest_job
+    await mailer.stop()
+    hashing_pool.shutdown()
 
-app = FastAPI(title="Contacts API")
+
+app = FastAPI(title="Contacts API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -11,12 +41,37 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+
+@app.exception_handler(PoolSaturatedError)
+async def pool_saturated_handler(request: Request, exc: PoolSaturatedError):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Service is busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
+
+
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": "Too many requests"},
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+    )
+
+
 app.include_router(contacts.router, prefix="/api")
 app.include_router(utils.router, prefix="/api")
 app.include_router(auth.router, prefix="/api")
+app.include_router(metrics.router, prefix="/api")
+
+if config.STORAGE_BACKEND == "local":
+    app.mount(config.LOCAL_STORAGE_URL, StaticFiles(directory=config.LOCAL_STORAGE_DIR, check_dir=False), name="uploads")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -1,33 +1,40 @@
-import cloudinary
-import cloudinary.uploader
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, BackgroundTasks
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, status, UploadFile, File, BackgroundTasks
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
-from jose import JWTError, jwt
+from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 from email_validator import validate_email, EmailNotValidError
 from src.conf.config import config
 from src.database.db import get_db
 from src.database.models import User, Role
-from src.schemas.user import UserResponse, UserCreate, TokenSchema, UserLogin, PasswordResetRequest, PasswordReset
+from src.schemas.user import (
+    UserResponse, UserCreate, BulkUserResult, TokenSchema, UserLogin, RefreshTokenRequest, PasswordResetRequest, PasswordReset
+)
 from src.services.auth import (
-    create_access_token,
-    get_password_hash,
+    decode_token,
+    get_password_hash_async,
     authenticate_user,
     generate_email_verification_token,
     send_reset_password_email
 )
 from src.repository.users import UserRepository
+from src.services import metrics
 from src.services.cache import CacheService
-
-cloudinary.config(
-    cloud_name=config.CLOUDINARY_CLOUD_NAME,
-    api_key=config.CLOUDINARY_API_KEY,
-    api_secret=config.CLOUDINARY_API_SECRET
-)
+from src.services.rate_limit import RateLimiter, client_ip
+from src.services.storage import FileTooLargeError, get_storage
+from src.services.tokens import InvalidRefreshTokenError, RefreshTokenStore
+from src.services.users import UserCache, bulk_register_users
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 cache_service = CacheService()
+user_cache = UserCache(cache_service)
+metrics.register("cache", cache_service.stats)
+storage = get_storage()
+refresh_tokens = RefreshTokenStore(cache_service)
+rate_limiter = RateLimiter(cache_service)
+metrics.register("rate_limit", rate_limiter.stats)
 
 async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
     """
@@ -49,20 +56,17 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, config.SECRET_KEY, algorithms=[config.ALGORITHM])
+        payload = decode_token(token)
         email = payload.get("sub")
-        if email is None:
+        if email is None or payload.get("type") == "refresh":
             raise credentials_exception
     except JWTError:
         raise credentials_exception
 
-    user_repo = UserRepository(db)
-    user = await user_repo.get_user_by_email(email)
+    user = await user_cache.get_user(email, db)
     if user is None:
         raise credentials_exception
 
-    await cache_service.set(f"user:{user.id}", user.json(), ex=config.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
-
     return user
 
 async def get_current_admin(current_user: User = Depends(get_current_user)):
@@ -85,7 +89,12 @@ async def get_current_admin(current_user: User = Depends(get_current_user)):
         )
     return current_user
 
-@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/register",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limiter.limit("register"))]
+)
 async def register_user(body: UserCreate, db: AsyncSession = Depends(get_db)):
     """
         Register a new user.
@@ -100,6 +109,7 @@ async def register_user(body: UserCreate, db: AsyncSession = Depends(get_db)):
         Raises:
             HTTPException: If the user already exists.
         """
+    await rate_limiter.check_email("register", body.email)
     user_repo = UserRepository(db)
 
     existing_user = await user_repo.get_user_by_email(body.email)
@@ -109,7 +119,7 @@ async def register_user(body: UserCreate, db: AsyncSession = Depends(get_db)):
             detail="User with this email already exists"
         )
 
-    hashed_password = get_password_hash(body.password)
+    hashed_password = await get_password_hash_async(body.password)
 
     user = await user_repo.create_user(body, hashed_password)
 
@@ -120,15 +130,47 @@ async def register_user(body: UserCreate, db: AsyncSession = Depends(get_db)):
         role=user.role
     )
 
-@router.post("/login", response_model=TokenSchema)
+@router.post("/register/bulk", response_model=List[BulkUserResult])
+async def register_users_bulk(
+        body: List[Dict[str, Any]] = Body(...),
+        db: AsyncSession = Depends(get_db),
+        current_admin: User = Depends(get_current_admin)
+):
+    """
+        Register many users at once. Admin only.
+
+        Args:
+            body (List[Dict[str, Any]]): The user registration data, one object per user.
+            db (AsyncSession): The database session.
+            current_admin (User): The current admin user.
+
+        Returns:
+            List[BulkUserResult]: The result of every row, in input order.
+
+        Raises:
+            HTTPException: If the batch is too large.
+        """
+    if len(body) > config.BULK_USERS_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {config.BULK_USERS_MAX_ROWS} users per request"
+        )
+    return await bulk_register_users(body, db)
+
+@router.post("/login", response_model=TokenSchema, dependencies=[Depends(rate_limiter.limit("login"))])
 async def login(
+        request: Request,
         form_data: OAuth2PasswordRequestForm = Depends(),
         db: AsyncSession = Depends(get_db)
 ):
     """
         Log in a user.
 
+        Attempts are limited per email and client IP, so one client
+        cannot lock another out of an account.
+
         Args:
+            request (Request): The request, used for the client IP.
             form_data (OAuth2PasswordRequestForm): The login form data.
             db (AsyncSession): The database session.
 
@@ -138,6 +180,7 @@ async def login(
         Raises:
             HTTPException: If the username or password is incorrect.
         """
+    await rate_limiter.check_email("login", form_data.username, client_ip(request))
     user = await authenticate_user(form_data.username, form_data.password, db)
 
     if not user:
@@ -147,15 +190,39 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    access_token = create_access_token(
-        data={"sub": user.email},
-        expires_delta=config.ACCESS_TOKEN_EXPIRE_MINUTES
-    )
+    access_token, refresh_token = await refresh_tokens.issue(user.email)
 
-    refresh_token = create_access_token(
-        data={"sub": user.email},
-        expires_delta=config.REFRESH_TOKEN_EXPIRE_MINUTES
-    )
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer"
+    }
+
+@router.post("/refresh", response_model=TokenSchema)
+async def refresh(body: RefreshTokenRequest):
+    """
+        Exchange a refresh token for a new pair of tokens.
+
+        The presented refresh token is rotated; reusing an old one revokes
+        all tokens issued from the same login.
+
+        Args:
+            body (RefreshTokenRequest): The refresh token.
+
+        Returns:
+            TokenSchema: The new access and refresh tokens.
+
+        Raises:
+            HTTPException: If the refresh token is invalid, revoked or reused.
+        """
+    try:
+        access_token, refresh_token = await refresh_tokens.rotate(body.refresh_token)
+    except InvalidRefreshTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
     return {
         "access_token": access_token,
@@ -169,17 +236,43 @@ async def upload_avatar(
         current_user: User = Depends(get_current_user),
         db: AsyncSession = Depends(get_db)
 ):
-    result = cloudinary.uploader.upload(file.file, folder="avatars")
+    """
+        Upload a new avatar for the current user.
+
+        Args:
+            file (UploadFile): The image file.
+            current_user (User): The current user.
+            db (AsyncSession): The database session.
+
+        Returns:
+            UserResponse: The updated user.
+
+        Raises:
+            HTTPException: If the file is too large or the user is not found.
+        """
+    try:
+        avatar_url = await storage.save(file, "avatars")
+    except FileTooLargeError:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="File is too large"
+        )
 
-    current_user.avatar = result['secure_url']
-    await db.commit()
+    user_repo = UserRepository(db)
+    user = await user_repo.update_avatar(current_user.email, avatar_url)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    await user_cache.invalidate(user.email)
 
     return UserResponse(
-        id=current_user.id,
-        username=current_user.username,
-        email=current_user.email,
-        avatar=current_user.avatar,
-        role=current_user.role
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        avatar=user.avatar,
+        role=user.role
     )
 
 @router.get("/me", response_model=UserResponse)
@@ -201,7 +294,11 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
         role=current_user.role
     )
 
-@router.post("/request-reset-password", response_model=dict)
+@router.post(
+    "/request-reset-password",
+    response_model=dict,
+    dependencies=[Depends(rate_limiter.limit("reset_password"))]
+)
 async def request_reset_password(body: PasswordResetRequest, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db)):
     """
         Request a password reset.
@@ -217,6 +314,7 @@ async def request_reset_password(body: PasswordResetRequest, background_tasks: B
         Raises:
             HTTPException: If the user is not found.
         """
+    await rate_limiter.check_email("reset_password", body.email)
     user_repo = UserRepository(db)
     user = await user_repo.get_user_by_email(body.email)
     if not user:
@@ -262,10 +360,11 @@ async def reset_password(body: PasswordReset, db: AsyncSession = Depends(get_db)
             detail="User not found"
         )
 
-    hashed_password = get_password_hash(body.new_password)
-    user.password = hashed_password
-    await db.commit()
+    hashed_password = await get_password_hash_async(body.new_password)
+    await user_repo.update_password(user, hashed_password)
 
     await cache_service.delete(f"reset_token:{body.token}")
+    await user_cache.invalidate(user.email)
+    await refresh_tokens.revoke_all(user.email)
 
     return {"msg": "Password has been reset"}
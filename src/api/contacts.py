@@ -1,92 +1,429 @@
-from typing import List, Optional
+import os
+from datetime import date
+from functools import partial
+from typing import Any, AsyncGenerator, Callable, Dict, List, Literal, Optional, Tuple, Union
 
-from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi import APIRouter, BackgroundTasks, Body, File, Header, HTTPException, Depends, Query, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.db import get_db
+from src.conf.config import config
+from src.database.db import get_db, get_session_factory, replica_router
 from src.database.models import User
-from src.schemas.contact import ContactCreate, ContactUpdate, ContactResponse
-from src.services.contacts import ContactService
-from src.api.auth import get_current_user
+from src.repository.contacts import ContactRepository, VersionConflictError
+from src.schemas.contact import (
+    ContactBulkResult, ContactCreate, ContactUpdate, ContactResponse, ContactSuggestion, ImportJobStatus,
+    SparseContactResponse
+)
+from src.services import metrics
+from src.services.autocomplete import AutocompleteIndex
+from src.services.birthdays import BirthdayDigest
+from src.services.consistency import ReadYourWrites
+from src.services.contacts import (
+    ContactService, collection_etag, contact_etag, encode_cursor, decode_cursor, etag_matches, parse_if_match,
+    version_etag
+)
+from src.services.export import EXPORT_FORMATS, export_contacts
+from src.services.imports import ImportJobs
+from src.services.responses import ResponseCache
+from src.services.serialization import ORJSONResponse, dump_contact_row, dump_contact_rows, parse_fields
+from src.services.storage import FileTooLargeError
+from src.services.versions import CollectionVersions
+from src.api.auth import get_current_user, cache_service
 
 router = APIRouter(prefix="/contacts", tags=["contacts"])
 
-@router.get("/", response_model=List[ContactResponse])
+autocomplete_index = AutocompleteIndex()
+ContactRepository.add_write_hook(autocomplete_index.on_write)
+metrics.register("autocomplete", autocomplete_index.stats)
+birthday_digest = BirthdayDigest(cache_service)
+ContactRepository.add_write_hook(birthday_digest.on_write)
+metrics.register("birthday_digest", birthday_digest.stats)
+import_jobs = ImportJobs(cache_service)
+collection_versions = CollectionVersions(cache_service)
+ContactRepository.add_write_hook(collection_versions.bump)
+metrics.register("collection_versions", collection_versions.stats)
+response_cache = ResponseCache(cache_service)
+metrics.register("response_cache", response_cache.stats)
+_contacts_adapter = TypeAdapter(List[ContactResponse])
+read_your_writes = ReadYourWrites(cache_service)
+ContactRepository.add_write_hook(read_your_writes.mark)
+metrics.register("read_your_writes", read_your_writes.stats)
+metrics.register("db_replicas", replica_router.stats)
+
+async def get_read_db(
+    db: AsyncSession = Depends(get_db),
+    session_factory: Callable[[], AsyncSession] = Depends(get_session_factory),
+    current_user: User = Depends(get_current_user)
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency yielding a session for read-only endpoints.
+
+    The session is on a read replica unless none is configured or healthy,
+    or the user wrote contacts within the last ``DB_PRIMARY_STICKY_SECONDS``;
+    then it is the primary session, which connects only if used.
+
+    Yields:
+        AsyncSession: The database session.
+    """
+    session = None
+    if replica_router.engines and not await read_your_writes.recent(current_user.id):
+        session = await replica_router.open_session(session_factory)
+    if session is None:
+        yield db
+        return
+    try:
+        yield session
+    finally:
+        await session.close()
+
+async def get_read_session_factory(
+    session_factory: Callable[[], AsyncSession] = Depends(get_session_factory),
+    current_user: User = Depends(get_current_user)
+) -> Callable[[], AsyncSession]:
+    """
+    Dependency returning a session factory for read-only work outliving the request.
+
+    Returns:
+        Callable[[], AsyncSession]: Factory of sessions on a replica, chosen as in ``get_read_db``.
+    """
+    if replica_router.engines and not await read_your_writes.recent(current_user.id):
+        replica = replica_router.pick()
+        if replica is not None:
+            return partial(session_factory, bind=replica)
+    return session_factory
+
+async def _collection_version(user_id: int) -> Optional[str]:
+    try:
+        return await collection_versions.current(user_id)
+    except RedisError:
+        return None
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+def _parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    try:
+        return parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _dump_contacts(contacts) -> str:
+    return _contacts_adapter.dump_json(_contacts_adapter.validate_python(contacts, from_attributes=True)).decode()
+
+async def _cached(
+    db: AsyncSession, user_id: int, generation: Optional[str], endpoint: str, params: dict, loader
+) -> Tuple[str, bool]:
+    """Return the body and whether it is known to be current for ``generation``."""
+    if generation is None:
+        return await loader(), False
+    if not db.info.get("replica"):
+        return await response_cache.get_or_load(user_id, generation, endpoint, params, loader), True
+    # A replica may not have replayed the writes behind this generation yet,
+    # so its rendering is served once but neither cached nor tagged.
+    body = await response_cache.get(user_id, generation, endpoint, params)
+    if body is not None:
+        return body, True
+    return await loader(), False
+
+@router.get("/", response_model=Union[List[ContactResponse], List[SparseContactResponse]], response_class=ORJSONResponse)
 async def read_contacts(
     skip: int = 0,
     limit: int = 100,
     search: Optional[str] = Query(None, description="Search by name, last name or email"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. first_name,phone"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-        Get a list of contacts.
+        Get a list of contacts ordered by ID, or by relevance when searching.
+
+        Pages can be walked with ``cursor``: when more contacts may follow,
+        the response carries an ``X-Next-Cursor`` header to pass back.
+        The ``ETag`` changes with every write to the user's contacts; a
+        matching ``If-None-Match`` is answered with 304 without a query.
+        Pages are read as plain rows, encoded with orjson and cached until
+        the next write; pages read from a replica are neither cached nor
+        tagged. With ``fields``, only those columns are selected and returned.
 
         Args:
-            skip (int): The number of contacts to skip.
+            skip (int): The number of contacts to skip; ignored when a cursor is given.
             limit (int): The maximum number of contacts to return.
             search (Optional[str]): The search query.
+            cursor (Optional[str]): The cursor of the page to return.
+            fields (Optional[str]): The fields to return; all by default.
+            if_none_match (Optional[str]): ETags of the client's cached copies.
             db (AsyncSession): The database session.
             current_user (User): The current user.
 
         Returns:
-            List[ContactResponse]: The list of contacts.
+            Union[List[ContactResponse], List[SparseContactResponse]]: The list of contacts; with ``fields``, only those fields.
+
+        Raises:
+            HTTPException: If the cursor or the fields are invalid.
         """
-    contact_service = ContactService(db)
-    if search:
-        contacts = await contact_service.search_contacts(search, skip, limit, current_user.id)
-    else:
-        contacts = await contact_service.get_contacts(skip, limit, current_user.id)
-    return contacts
+    selected = _parse_fields(fields)
+    params = {
+        "skip": skip, "limit": limit, "search": search, "cursor": cursor,
+        "fields": ",".join(selected) if selected else None,
+    }
+    headers = {}
+    version = await _collection_version(current_user.id)
+    if version is not None:
+        headers["ETag"] = collection_etag(version, params)
+        if etag_matches(if_none_match, headers["ETag"]):
+            return _not_modified(headers["ETag"])
+
+    after_id = after_rank = None
+    if cursor:
+        try:
+            after_id, after_rank = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    async def render() -> str:
+        contact_service = ContactService(db)
+        if search:
+            rows = await contact_service.search_contacts(
+                search, skip, limit, current_user.id, after_id, after_rank, rows=True, fields=selected
+            )
+        else:
+            rows = await contact_service.get_contacts(skip, limit, current_user.id, after_id, rows=True, fields=selected)
+        next_cursor = ""
+        if rows and len(rows) == limit:
+            last = rows[-1]
+            next_cursor = encode_cursor(last.id, getattr(last, "search_rank", None))
+        # The cursor is base64, so it can share the cached value with the body.
+        return f"{next_cursor}\n{dump_contact_rows(rows, selected).decode()}"
 
-@router.get("/birthdays/", response_model=List[ContactResponse])
+    payload, current = await _cached(db, current_user.id, version, "list", params, render)
+    next_cursor, _, body = payload.partition("\n")
+    if not current:
+        headers.pop("ETag", None)
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return ORJSONResponse(content=body.encode(), headers=headers)
+
+@router.get("/birthdays/", response_model=List[ContactResponse], response_class=ORJSONResponse)
 async def upcoming_birthdays(
-    db: AsyncSession = Depends(get_db),
+    days: int = Query(config.BIRTHDAY_DIGEST_DAYS, ge=0, le=366, description="Days after today to include"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-       Get a list of upcoming birthdays.
+       Get a list of upcoming birthdays, soonest first.
+
+       The default window is answered from the daily digest in Redis, and
+       rendered responses are cached until the next write or midnight.
 
        Args:
+           days (int): How many days after today the window extends; today is always included.
            db (AsyncSession): The database session.
            current_user (User): The current user.
 
        Returns:
            List[ContactResponse]: The list of contacts with upcoming birthdays.
        """
+    async def render() -> str:
+        contact_service = ContactService(db)
+        return _dump_contacts(await contact_service.get_upcoming_birthdays(current_user.id, days, birthday_digest))
+
+    version = await _collection_version(current_user.id)
+    params = {"days": days, "today": date.today().isoformat()}
+    body, _ = await _cached(db, current_user.id, version, "birthdays", params, render)
+    return ORJSONResponse(content=body.encode())
+
+@router.get("/autocomplete", response_model=List[ContactSuggestion])
+async def autocomplete_contacts(
+    q: str = Query(..., min_length=1, max_length=100, description="Prefix of a name, last name or email"),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+        Suggest contacts for a search box as the user types.
+
+        Served from an in-process prefix index, so no database query is made
+        once the user's index is loaded. Users with too many contacts to index
+        are served by a prefix query on the search index.
+
+        Args:
+            q (str): The typed prefix.
+            limit (int): The maximum number of suggestions.
+            db (AsyncSession): The database session, used to build the index.
+            current_user (User): The current user.
+
+        Returns:
+            List[ContactSuggestion]: The suggested contacts.
+
+        Raises:
+            HTTPException: If the prefix is blank.
+        """
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=400, detail="Query must not be blank")
     contact_service = ContactService(db)
-    contacts = await contact_service.get_upcoming_birthdays(current_user.id)
-    return contacts
+    return await contact_service.autocomplete(autocomplete_index, q, limit, current_user.id)
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_contacts_stream(
+    fmt: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+    session_factory: Callable[[], AsyncSession] = Depends(get_read_session_factory),
+    current_user: User = Depends(get_current_user)
+):
+    """
+        Export all contacts as a CSV or NDJSON download.
+
+        The body is streamed from a server-side cursor in fixed-size chunks,
+        so large accounts are never held in memory at once.
+
+        Args:
+            fmt (str): The export format, ``csv`` or ``ndjson``.
+            session_factory (Callable): Factory of database sessions for the streamed body.
+            current_user (User): The current user.
+
+        Returns:
+            StreamingResponse: The exported contacts.
+        """
+    return StreamingResponse(
+        export_contacts(session_factory, current_user.id, fmt),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="contacts.{fmt}"'},
+    )
+
+@router.post("/import", response_model=ImportJobStatus, status_code=status.HTTP_202_ACCEPTED)
+async def import_contacts(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    fmt: Optional[Literal["csv", "vcard"]] = Query(None, alias="format", description="Defaults to the file extension"),
+    session_factory: Callable[[], AsyncSession] = Depends(get_session_factory),
+    current_user: User = Depends(get_current_user)
+):
+    """
+        Start importing contacts from a CSV or vCard file.
+
+        The file is parsed and imported in the background; contacts are
+        matched to existing ones by email. Poll ``/contacts/import/{job_id}``
+        for progress.
+
+        Args:
+            background_tasks (BackgroundTasks): Runs the import after the response is sent.
+            file (UploadFile): The CSV or vCard file.
+            fmt (Optional[str]): The file format, ``csv`` or ``vcard``.
+            session_factory (Callable): Factory of database sessions for the import job.
+            current_user (User): The current user.
+
+        Returns:
+            ImportJobStatus: The queued job.
+
+        Raises:
+            HTTPException: If the file is too large.
+        """
+    if fmt is None:
+        fmt = "vcard" if (file.filename or "").lower().endswith((".vcf", ".vcard")) else "csv"
+    try:
+        path = await import_jobs.spool(file)
+    except FileTooLargeError:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File is too large")
 
-@router.get("/{contact_id}", response_model=ContactResponse)
+    try:
+        job_id = await import_jobs.create(current_user.id, fmt, file.filename)
+    except Exception:
+        os.remove(path)
+        raise
+    background_tasks.add_task(import_jobs.run, job_id, path, fmt, current_user.id, session_factory)
+    return await import_jobs.get(job_id, current_user.id)
+
+@router.get("/import/{job_id}", response_model=ImportJobStatus)
+async def read_import_status(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+        Get the progress of an import job.
+
+        Args:
+            job_id (str): The job ID.
+            current_user (User): The current user.
+
+        Returns:
+            ImportJobStatus: The job status.
+
+        Raises:
+            HTTPException: If the job is not found.
+        """
+    job = await import_jobs.get(job_id, current_user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
+
+@router.get("/{contact_id}", response_model=Union[ContactResponse, SparseContactResponse])
 async def read_contact(
     contact_id: int,
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. first_name,phone"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
         Get a contact by ID.
 
+        The response carries the contact's ``ETag`` for use in ``If-Match``
+        and ``If-None-Match``. The version of a contact read since the last
+        write to the user's contacts is known from Redis, so a matching
+        ``If-None-Match`` is then answered with 304 without a query.
+        With ``fields``, only those columns are selected and returned.
+
         Args:
             contact_id (int): The ID of the contact.
+            response (Response): The response, used to set the ETag header.
+            fields (Optional[str]): The fields to return; all by default.
+            if_none_match (Optional[str]): ETags of the client's cached copies.
             db (AsyncSession): The database session.
             current_user (User): The current user.
 
         Returns:
-            ContactResponse: The contact.
+            Union[ContactResponse, SparseContactResponse]: The contact; with ``fields``, only those fields.
 
         Raises:
-            HTTPException: If the contact is not found.
+            HTTPException: If the contact is not found or the fields are invalid.
         """
+    selected = _parse_fields(fields)
+    version = await _collection_version(current_user.id)
+    if version is not None and if_none_match is not None:
+        try:
+            known = await collection_versions.contact_version(current_user.id, version, contact_id)
+        except RedisError:
+            known = None
+        if known is not None and etag_matches(if_none_match, version_etag(known, selected)):
+            return _not_modified(version_etag(known, selected))
+
     contact_service = ContactService(db)
-    contact = await contact_service.get_contact(contact_id, current_user.id)
+    contact = await contact_service.get_contact(contact_id, current_user.id, fields=selected)
     if contact is None:
         raise HTTPException(status_code=404, detail="Contact not found")
+    etag = contact_etag(contact, selected)
+    if version is not None and not db.info.get("replica"):
+        try:
+            await collection_versions.remember(current_user.id, version, contact.id, contact.version)
+        except RedisError:
+            pass
+    if etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    if selected:
+        return ORJSONResponse(content=dump_contact_row(contact, selected), headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return contact
 
 @router.post("/", response_model=ContactResponse, status_code=status.HTTP_201_CREATED)
 async def create_contact(
     body: ContactCreate,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -95,6 +432,7 @@ async def create_contact(
 
         Args:
             body (ContactCreate): The contact data.
+            response (Response): The response, used to set the ETag header.
             db (AsyncSession): The database session.
             current_user (User): The current user.
 
@@ -102,21 +440,112 @@ async def create_contact(
             ContactResponse: The created contact.
         """
     contact_service = ContactService(db)
-    return await contact_service.create_contact(body, current_user.id)
+    contact = await contact_service.create_contact(body, current_user.id)
+    response.headers["ETag"] = contact_etag(contact)
+    return contact
+
+@router.post("/bulk", response_model=List[ContactBulkResult])
+async def upsert_contacts_bulk(
+    body: List[Dict[str, Any]] = Body(...),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+        Create or update many contacts at once, matching existing contacts by email.
+
+        Args:
+            body (List[Dict[str, Any]]): The contact data, one object per contact.
+            db (AsyncSession): The database session.
+            current_user (User): The current user.
+
+        Returns:
+            List[ContactBulkResult]: The result of every row, in input order.
+
+        Raises:
+            HTTPException: If the batch is too large.
+        """
+    if len(body) > config.BULK_CONTACTS_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {config.BULK_CONTACTS_MAX_ROWS} contacts per request",
+        )
+    contact_service = ContactService(db)
+    return await contact_service.upsert_contacts(body, current_user.id)
+
+def _precondition_failed(exc: VersionConflictError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="Contact was modified",
+        headers={"ETag": version_etag(exc.current_version)},
+    )
+
+async def _write_contact(
+    contact_id: int,
+    body: Union[ContactCreate, ContactUpdate],
+    if_match: Optional[str],
+    response: Response,
+    db: AsyncSession,
+    current_user: User
+):
+    contact_service = ContactService(db)
+    try:
+        contact = await contact_service.update_contact(contact_id, body, current_user.id, parse_if_match(if_match))
+    except VersionConflictError as e:
+        raise _precondition_failed(e)
+    if contact is None:
+        raise HTTPException(status_code=404, detail="Contact not found")
+    response.headers["ETag"] = contact_etag(contact)
+    return contact
 
 @router.put("/{contact_id}", response_model=ContactResponse)
+async def replace_contact(
+    contact_id: int,
+    body: ContactCreate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+        Replace a contact.
+
+        With ``If-Match``, the contact is only replaced if its ETag still matches.
+
+        Args:
+            contact_id (int): The ID of the contact.
+            body (ContactCreate): The complete new contact data.
+            response (Response): The response, used to set the ETag header.
+            if_match (Optional[str]): ETags of the versions the client expects.
+            db (AsyncSession): The database session.
+            current_user (User): The current user.
+
+        Returns:
+            ContactResponse: The updated contact.
+
+        Raises:
+            HTTPException: If the contact is not found or was modified in the meantime.
+        """
+    return await _write_contact(contact_id, body, if_match, response, db, current_user)
+
+@router.patch("/{contact_id}", response_model=ContactResponse)
 async def update_contact(
     contact_id: int,
     body: ContactUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-        Update a contact.
+        Update some fields of a contact.
+
+        With ``If-Match``, the contact is only updated if its ETag still matches.
 
         Args:
             contact_id (int): The ID of the contact.
-            body (ContactUpdate): The updated contact data.
+            body (ContactUpdate): The fields to change.
+            response (Response): The response, used to set the ETag header.
+            if_match (Optional[str]): ETags of the versions the client expects.
             db (AsyncSession): The database session.
             current_user (User): The current user.
 
@@ -124,25 +553,25 @@ async def update_contact(
             ContactResponse: The updated contact.
 
         Raises:
-            HTTPException: If the contact is not found.
+            HTTPException: If the contact is not found or was modified in the meantime.
         """
-    contact_service = ContactService(db)
-    contact = await contact_service.update_contact(contact_id, body, current_user.id)
-    if contact is None:
-        raise HTTPException(status_code=404, detail="Contact not found")
-    return contact
+    return await _write_contact(contact_id, body, if_match, response, db, current_user)
 
 @router.delete("/{contact_id}", response_model=ContactResponse)
 async def delete_contact(
     contact_id: int,
+    if_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
        Delete a contact.
 
+       With ``If-Match``, the contact is only deleted if its ETag still matches.
+
        Args:
            contact_id (int): The ID of the contact.
+           if_match (Optional[str]): ETags of the versions the client expects.
            db (AsyncSession): The database session.
            current_user (User): The current user.
 
@@ -150,10 +579,13 @@ async def delete_contact(
            ContactResponse: The deleted contact.
 
        Raises:
-           HTTPException: If the contact is not found.
+           HTTPException: If the contact is not found or was modified in the meantime.
        """
     contact_service = ContactService(db)
-    contact = await contact_service.delete_contact(contact_id, current_user.id)
+    try:
+        contact = await contact_service.delete_contact(contact_id, current_user.id, parse_if_match(if_match))
+    except VersionConflictError as e:
+        raise _precondition_failed(e)
     if contact is None:
         raise HTTPException(status_code=404, detail="Contact not found")
-    return contact
\ No newline at end of file
+    return contact
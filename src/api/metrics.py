@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+
+from src.api.auth import get_current_admin
+from src.database.models import User
+from src.services import metrics
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+@router.get("/")
+async def read_metrics(current_user: User = Depends(get_current_admin)):
+    """
+    Endpoint with runtime metrics of the API services, for admins only
+
+    Args:
+        current_user (User): The current admin user.
+
+    Returns:
+        dict: Metrics grouped by source name.
+    """
+    return metrics.collect()
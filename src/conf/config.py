@@ -5,6 +5,16 @@ load_dotenv()
 
 class Config:
     DB_URL = os.getenv("DATABASE_URL")
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", -1))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() == "true"
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 100))
+    DB_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+    DB_REPLICA_RETRY = int(os.getenv("DB_REPLICA_RETRY", 30))
+    DB_PRIMARY_STICKY_SECONDS = int(os.getenv("DB_PRIMARY_STICKY_SECONDS", 5))
+    DB_UPGRADE_SCHEMA = os.getenv("DB_UPGRADE_SCHEMA", "true").lower() == "true"
     SECRET_KEY = os.getenv("SECRET_KEY")
     ALGORITHM = os.getenv("ALGORITHM")
     ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
@@ -12,6 +22,53 @@ class Config:
     CLOUDINARY_CLOUD_NAME = os.getenv("CLOUDINARY_CLOUD_NAME")
     CLOUDINARY_API_KEY = os.getenv("CLOUDINARY_API_KEY")
     CLOUDINARY_API_SECRET = os.getenv("CLOUDINARY_API_SECRET")
+    STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "cloudinary")
+    LOCAL_STORAGE_DIR = os.getenv("LOCAL_STORAGE_DIR", "uploads")
+    LOCAL_STORAGE_URL = os.getenv("LOCAL_STORAGE_URL", "/uploads")
+    AVATAR_MAX_BYTES = int(os.getenv("AVATAR_MAX_BYTES", 5 * 1024 * 1024))
+    UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 64 * 1024))
+    SMTP_HOST = os.getenv("SMTP_HOST", "smtp.example.com")
+    SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
+    SMTP_USERNAME = os.getenv("SMTP_USERNAME", "your_email@example.com")
+    SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "your_password")
+    SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+    MAIL_FROM = os.getenv("MAIL_FROM", "your_email@example.com")
+    MAIL_POOL_SIZE = int(os.getenv("MAIL_POOL_SIZE", 2))
+    MAIL_BATCH_SIZE = int(os.getenv("MAIL_BATCH_SIZE", 20))
+    MAIL_MAX_RETRIES = int(os.getenv("MAIL_MAX_RETRIES", 5))
+    MAIL_RETRY_DELAY = float(os.getenv("MAIL_RETRY_DELAY", 2))
+    MAIL_IDLE_TIMEOUT = float(os.getenv("MAIL_IDLE_TIMEOUT", 30))
     REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
+    USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", 300))
+    USER_CACHE_LOCAL_TTL = int(os.getenv("USER_CACHE_LOCAL_TTL", 30))
+    CACHE_LOCAL_MAXSIZE = int(os.getenv("CACHE_LOCAL_MAXSIZE", 10000))
+    CACHE_LOCAL_MAX_BYTES = int(os.getenv("CACHE_LOCAL_MAX_BYTES", 32 * 1024 * 1024))
+    TOKEN_CACHE_MAXSIZE = int(os.getenv("TOKEN_CACHE_MAXSIZE", 10000))
+    TOKEN_CACHE_TTL = int(os.getenv("TOKEN_CACHE_TTL", 300))
+    CACHE_NEGATIVE_TTL = int(os.getenv("CACHE_NEGATIVE_TTL", 30))
+    HASH_POOL_KIND = os.getenv("HASH_POOL_KIND", "thread")
+    HASH_POOL_WORKERS = int(os.getenv("HASH_POOL_WORKERS", os.cpu_count() or 1))
+    HASH_POOL_MAX_QUEUE = int(os.getenv("HASH_POOL_MAX_QUEUE", 64))
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_IP = os.getenv("RATE_LIMIT_IP", "20/minute")
+    RATE_LIMIT_EMAIL = os.getenv("RATE_LIMIT_EMAIL", "5/minute")
+    RATE_LIMIT_GLOBAL = os.getenv("RATE_LIMIT_GLOBAL", "100/second")
+    BULK_USERS_MAX_ROWS = int(os.getenv("BULK_USERS_MAX_ROWS", 10000))
+    BULK_CONTACTS_MAX_ROWS = int(os.getenv("BULK_CONTACTS_MAX_ROWS", 10000))
+    EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 1000))
+    IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", 1000))
+    IMPORT_MAX_BYTES = int(os.getenv("IMPORT_MAX_BYTES", 200 * 1024 * 1024))
+    IMPORT_STATUS_TTL = int(os.getenv("IMPORT_STATUS_TTL", 24 * 3600))
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 0)) or None
+    BCRYPT_CALIBRATE = os.getenv("BCRYPT_CALIBRATE", "false").lower() == "true"
+    BCRYPT_TARGET_MS = float(os.getenv("BCRYPT_TARGET_MS", 250))
+    AUTOCOMPLETE_MAX_USERS = int(os.getenv("AUTOCOMPLETE_MAX_USERS", 1000))
+    AUTOCOMPLETE_MAX_ENTRIES = int(os.getenv("AUTOCOMPLETE_MAX_ENTRIES", 2_000_000))
+    AUTOCOMPLETE_TTL = int(os.getenv("AUTOCOMPLETE_TTL", 300))
+    BIRTHDAY_DIGEST_ENABLED = os.getenv("BIRTHDAY_DIGEST_ENABLED", "true").lower() == "true"
+    BIRTHDAY_DIGEST_DAYS = int(os.getenv("BIRTHDAY_DIGEST_DAYS", 7))
+    BIRTHDAY_DIGEST_RETRY = int(os.getenv("BIRTHDAY_DIGEST_RETRY", 60))
+    CONTACT_VERSIONS_TTL = int(os.getenv("CONTACT_VERSIONS_TTL", 3600))
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", 300))
 
 config = Config
\ No newline at end of file
@@ -1,17 +1,103 @@
-from typing import AsyncGenerator
+import itertools
+import logging
+import time
+from typing import AsyncGenerator, Callable, Dict, List, Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy import exc, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.conf.config import config
+from src.services import metrics
 
-engine = create_async_engine(
-    config.DB_URL,
-    echo=False,
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=30
-)
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long connection checkouts take.
+
+    Every checkout is timed from the request for a connection until it is
+    handed out, which covers waiting for a free connection, opening an
+    overflow one and the pre-ping. Timeouts and the highest overflow in use
+    are counted too, so pools can be sized from data. The counters survive
+    ``recreate``, which ``engine.dispose()`` uses to replace the pool.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.counters = {"checkouts": 0, "timeouts": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0, "peak_overflow": 0}
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.counters["timeouts"] += 1
+            raise
+        finally:
+            waited = (time.perf_counter() - started) * 1000
+            self.counters["checkouts"] += 1
+            self.counters["wait_ms_total"] += waited
+            self.counters["wait_ms_max"] = max(self.counters["wait_ms_max"], waited)
+            self.counters["peak_overflow"] = max(self.counters["peak_overflow"], self.overflow())
+
+    def recreate(self) -> "InstrumentedPool":
+        pool = super().recreate()
+        pool.counters = self.counters
+        return pool
+
+    def stats(self) -> dict:
+        checkouts = self.counters["checkouts"]
+        return {
+            "checkouts": checkouts,
+            "timeouts": self.counters["timeouts"],
+            "wait_ms_avg": round(self.counters["wait_ms_total"] / checkouts, 3) if checkouts else 0.0,
+            "wait_ms_max": round(self.counters["wait_ms_max"], 3),
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "peak_overflow": self.counters["peak_overflow"],
+        }
+
+
+def make_engine(url: str) -> AsyncEngine:
+    """
+    Create an engine with the pool and driver settings from ``Config``.
+
+    Args:
+        url (str): The database URL.
+
+    Returns:
+        AsyncEngine: The engine, pooled by an ``InstrumentedPool``.
+    """
+    connect_args = {}
+    if make_url(url).drivername == "postgresql+asyncpg":
+        connect_args = {
+            "statement_cache_size": config.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": config.DB_STATEMENT_CACHE_SIZE,
+        }
+    return create_async_engine(
+        url,
+        echo=False,
+        poolclass=InstrumentedPool,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+
+engine = make_engine(config.DB_URL)
+metrics.register("db_pool", lambda: engine.pool.stats())
+
+replica_engines = [make_engine(url) for url in config.DB_REPLICA_URLS]
+for _index, _replica in enumerate(replica_engines):
+    metrics.register(f"db_pool_replica_{_index}", lambda replica=_replica: replica.pool.stats())
 
 AsyncDBSession = sessionmaker(
     engine,
@@ -19,6 +105,88 @@ AsyncDBSession = sessionmaker(
     expire_on_commit=False
 )
 
+
+class ReplicaRouter:
+    """
+    Round-robin choice of read replica engines, skipping unhealthy ones.
+
+    A replica whose connection fails is taken out of rotation for
+    ``retry_after`` seconds; after that the next read tries it again and
+    either brings it back or takes it out once more. With no healthy
+    replica, reads go to the primary.
+    """
+
+    def __init__(self, engines: List[AsyncEngine], retry_after: float = config.DB_REPLICA_RETRY):
+        self.engines = engines
+        self.retry_after = retry_after
+        self._next = itertools.cycle(range(len(engines)))
+        self._down_until: Dict[int, float] = {}
+        self.counters = {"replica_sessions": 0, "primary_fallbacks": 0, "failures": 0}
+
+    def pick(self) -> Optional[AsyncEngine]:
+        """
+        Get the next healthy replica engine.
+
+        Returns:
+            Optional[AsyncEngine]: The engine, or None if no replica is available.
+        """
+        now = time.monotonic()
+        for _ in range(len(self.engines)):
+            index = next(self._next)
+            if self._down_until.get(index, 0) <= now:
+                return self.engines[index]
+        return None
+
+    def mark_down(self, replica: AsyncEngine):
+        """
+        Take a replica out of rotation after a failure.
+
+        Args:
+            replica (AsyncEngine): The failed engine.
+        """
+        self.counters["failures"] += 1
+        self._down_until[self.engines.index(replica)] = time.monotonic() + self.retry_after
+
+    async def open_session(self, session_factory: Callable[..., AsyncSession]) -> Optional[AsyncSession]:
+        """
+        Open a session connected to a healthy replica.
+
+        The connection is made right away, so a replica that is down is
+        detected here and the next one is tried. The session is flagged with
+        ``info["replica"]``, since what it reads may lag behind the primary.
+
+        Args:
+            session_factory (Callable): Factory of database sessions, called with the replica as ``bind``.
+
+        Returns:
+            Optional[AsyncSession]: The session, or None if every replica is unavailable.
+        """
+        tried = set()
+        while (replica := self.pick()) is not None and replica not in tried:
+            tried.add(replica)
+            session = session_factory(bind=replica)
+            try:
+                await session.connection()
+            except (exc.DBAPIError, OSError) as e:
+                await session.close()
+                logger.warning("Read replica %s is unavailable: %s", replica.url.render_as_string(), e)
+                self.mark_down(replica)
+                continue
+            session.info["replica"] = True
+            self.counters["replica_sessions"] += 1
+            return session
+        if self.engines:
+            self.counters["primary_fallbacks"] += 1
+        return None
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        healthy = sum(1 for index in range(len(self.engines)) if self._down_until.get(index, 0) <= now)
+        return {**self.counters, "replicas": len(self.engines), "healthy": healthy}
+
+
+replica_router = ReplicaRouter(replica_engines)
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency function for FastAPI endpoint-ах to Depends.
@@ -30,4 +198,14 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     try:
         yield session
     finally:
-        await session.close()
\ No newline at end of file
+        await session.close()
+
+def get_session_factory() -> Callable[[], AsyncSession]:
+    """
+    Dependency returning the session factory, for work that outlives the request,
+    such as streaming a response body after the endpoint has returned.
+
+    Returns:
+        Callable[[], AsyncSession]: Factory of database sessions.
+    """
+    return AsyncDBSession
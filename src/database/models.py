@@ -1,8 +1,8 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import List
 
-from sqlalchemy import Column, Integer, String, Date, Boolean, Text, ForeignKey, Enum
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy import Column, Integer, String, Date, Boolean, Text, ForeignKey, Enum, Index, DDL, event
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, validates
 from sqlalchemy.sql.sqltypes import DateTime
 from sqlalchemy import func
 from sqlalchemy.orm import relationship
@@ -15,6 +15,10 @@ class Role(enum.Enum):
     USER = "user"
     ADMIN = "admin"
 
+def month_day(value: date) -> int:
+    """Encode the month and day of a date as ``MMDD``, e.g. 1231 for December 31."""
+    return value.month * 100 + value.day
+
 class Contact(Base):
     __tablename__ = "contacts"
 
@@ -24,12 +28,57 @@ class Contact(Base):
     email: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
     phone: Mapped[str] = mapped_column(String(20), nullable=False)
     birth_date: Mapped[Date] = mapped_column(Date, nullable=False)
+    birth_md: Mapped[int] = mapped_column(Integer, nullable=False)
     additional_data: Mapped[str] = mapped_column(String(500), nullable=True)
     created_at: Mapped[datetime] = mapped_column('created_at', DateTime, default=func.now())
     updated_at: Mapped[datetime] = mapped_column('updated_at', DateTime, default=func.now(), onupdate=func.now())
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey('users.id'), nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
     owner: Mapped["User"] = relationship("User", back_populates="contacts")
 
+    __table_args__ = (
+        Index("ix_contacts_user_id_id", "user_id", "id"),
+        Index("ix_contacts_user_id_birth_md", "user_id", "birth_md"),
+    )
+
+    @validates("birth_date")
+    def _sync_birth_md(self, key, value):
+        self.birth_md = month_day(value) if value is not None else None
+        return value
+
+# Contact search is backed by a trigram index on Postgres and by an FTS5
+# trigram table kept in sync by triggers on SQLite. New tables get them from
+# ``after_create``; existing databases from ``src.database.schema``.
+SEARCH_DOCUMENT_SQL = "lower(first_name || ' ' || last_name || ' ' || email)"
+
+SEARCH_SCHEMA = {
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        f"CREATE INDEX IF NOT EXISTS ix_contacts_search_trgm ON contacts USING gin ({SEARCH_DOCUMENT_SQL} gin_trgm_ops)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5("
+        "first_name, last_name, email, content='contacts', content_rowid='id', tokenize='trigram')",
+        "CREATE TRIGGER IF NOT EXISTS contacts_fts_ai AFTER INSERT ON contacts BEGIN "
+        "INSERT INTO contacts_fts(rowid, first_name, last_name, email) "
+        "VALUES (new.id, new.first_name, new.last_name, new.email); END",
+        "CREATE TRIGGER IF NOT EXISTS contacts_fts_ad AFTER DELETE ON contacts BEGIN "
+        "INSERT INTO contacts_fts(contacts_fts, rowid, first_name, last_name, email) "
+        "VALUES ('delete', old.id, old.first_name, old.last_name, old.email); END",
+        "CREATE TRIGGER IF NOT EXISTS contacts_fts_au AFTER UPDATE OF first_name, last_name, email ON contacts BEGIN "
+        "INSERT INTO contacts_fts(contacts_fts, rowid, first_name, last_name, email) "
+        "VALUES ('delete', old.id, old.first_name, old.last_name, old.email); "
+        "INSERT INTO contacts_fts(rowid, first_name, last_name, email) "
+        "VALUES (new.id, new.first_name, new.last_name, new.email); END",
+    ],
+}
+
+for _dialect, _statements in SEARCH_SCHEMA.items():
+    for _statement in _statements:
+        event.listen(Contact.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
+
+event.listen(Contact.__table__, "before_drop", DDL("DROP TABLE IF EXISTS contacts_fts").execute_if(dialect="sqlite"))
+
 class User(Base):
     __tablename__ = "users"
 
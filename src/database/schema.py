@@ -0,0 +1,75 @@
+import logging
+
+from sqlalchemy import DDL, Integer, cast, extract, inspect, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.database.models import SEARCH_SCHEMA, Contact
+
+logger = logging.getLogger(__name__)
+
+
+def _index(name: str):
+    return next(i for i in Contact.__table__.indexes if i.name == name)
+
+
+def _add_birth_md(conn: Connection):
+    contacts = Contact.__table__
+    if conn.dialect.name == "sqlite":
+        # SQLite cannot add NOT NULL later; the default is overwritten below.
+        conn.execute(DDL("ALTER TABLE contacts ADD COLUMN birth_md INTEGER NOT NULL DEFAULT 0"))
+    else:
+        conn.execute(DDL("ALTER TABLE contacts ADD COLUMN birth_md INTEGER"))
+    month_day = extract("month", contacts.c.birth_date) * 100 + extract("day", contacts.c.birth_date)
+    result = conn.execute(update(contacts).values(birth_md=cast(month_day, Integer)))
+    if conn.dialect.name != "sqlite":
+        conn.execute(DDL("ALTER TABLE contacts ALTER COLUMN birth_md SET NOT NULL"))
+    _index("ix_contacts_user_id_birth_md").create(conn, checkfirst=True)
+    logger.info("Backfilled birth_md of %s contacts", result.rowcount)
+
+
+def _upgrade(conn: Connection):
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+    if "contacts" not in tables:
+        return
+    columns = {column["name"] for column in inspector.get_columns("contacts")}
+    if "birth_md" not in columns:
+        _add_birth_md(conn)
+    if "version" not in columns:
+        conn.execute(DDL("ALTER TABLE contacts ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+        logger.info("Added the contacts version column")
+    _index("ix_contacts_user_id_id").create(conn, checkfirst=True)
+    for statement in SEARCH_SCHEMA.get(conn.dialect.name, []):
+        conn.execute(DDL(statement))
+    if conn.dialect.name == "sqlite" and "contacts_fts" not in tables:
+        # An external-content table starts empty; index the existing rows.
+        conn.execute(DDL("INSERT INTO contacts_fts(contacts_fts) VALUES('rebuild')"))
+        logger.info("Built the contact search index")
+
+
+async def upgrade_schema(engine: AsyncEngine) -> bool:
+    """
+    Bring an existing database up to the current contacts schema.
+
+    Adds the ``version`` column and the ``birth_md`` column, backfilled from
+    ``birth_date``, and creates the keyset pagination index, the contact
+    search index, its triggers and, on Postgres, the trigram extension; a
+    newly created SQLite search index is filled from the existing contacts.
+    Every step is idempotent, so it runs on each start. A database without
+    a contacts table is left alone.
+
+    Args:
+        engine (AsyncEngine): The primary database engine.
+
+    Returns:
+        bool: True if the schema is up to date, False if the upgrade failed.
+    """
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(_upgrade)
+    except (SQLAlchemyError, OSError) as e:
+        logger.error("Database schema upgrade failed: %s", e)
+        return False
+    return True
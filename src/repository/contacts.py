@@ -1,47 +1,202 @@
+import inspect
 from datetime import date, timedelta
-from typing import List, Optional
+from typing import AsyncIterator, Callable, Collection, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
-from sqlalchemy import select, or_, and_, extract
+from sqlalchemy import Row, select, update, delete, or_, and_, case, func, literal_column, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.models import Contact
+from src.database.models import Contact, month_day
 from src.schemas.contact import ContactCreate, ContactUpdate
 
 
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+NULLABLE_FIELDS = {"additional_data"}
+
+
+class VersionConflictError(Exception):
+    """Raised when a conditional write finds the contact at a different version."""
+
+    def __init__(self, current_version: int):
+        super().__init__("Contact was modified")
+        self.current_version = current_version
+
+
+def birthday_ranges(today: date, days: int) -> List[Tuple[int, int]]:
+    """
+    Split the birthday window from ``today`` to ``today + days`` into ``birth_md`` ranges, soonest first.
+
+    Args:
+        today (date): The first day of the window.
+        days (int): How many days after today the window extends; today is always included.
+
+    Returns:
+        List[Tuple[int, int]]: Inclusive ``(low, high)`` month-day ranges; two of them when the window crosses the new year.
+    """
+    start = month_day(today)
+    end = month_day(today + timedelta(days=days)) if days < 365 else month_day(today - timedelta(days=1))
+    return [(start, end)] if start <= end else [(start, 1231), (101, end)]
+
+
+RESPONSE_COLUMNS = (
+    Contact.first_name,
+    Contact.last_name,
+    Contact.email,
+    Contact.phone,
+    Contact.birth_date,
+    Contact.additional_data,
+    Contact.id,
+    Contact.version,
+    Contact.created_at,
+    Contact.updated_at,
+)
+"""Columns of a ``ContactResponse``, in field order."""
+
+
+def response_columns(fields: Optional[Sequence[str]] = None) -> Tuple:
+    """
+    Columns of a projection of ``ContactResponse``.
+
+    Args:
+        fields (Optional[Sequence[str]]): The fields to select, in output order; None selects all.
+
+    Returns:
+        Tuple: The columns of ``fields``, followed by ``id`` and ``version`` if not among them.
+    """
+    if fields is None:
+        return RESPONSE_COLUMNS
+    names = list(fields) + [name for name in ("id", "version") if name not in fields]
+    return tuple(getattr(Contact, name) for name in names)
+
+
+EXPORT_COLUMNS = (
+    Contact.id,
+    Contact.first_name,
+    Contact.last_name,
+    Contact.email,
+    Contact.phone,
+    Contact.birth_date,
+    Contact.additional_data,
+    Contact.created_at,
+    Contact.updated_at,
+)
+
+
 class ContactRepository:
+    _write_hooks: List[Callable[[str, List[Contact]], None]] = []
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_all(self, skip: int = 0, limit: int = 100, user_id: int = None) -> List[Contact]:
+    @classmethod
+    def add_write_hook(cls, hook: Callable[[str, List[Contact]], None]):
         """
-        Get all contacts.
+        Register a callback run after every committed contact write.
+
+        A bulk write calls each hook once with all of its contacts, so hooks
+        should handle the list in as few round trips as they can.
+
+        Args:
+            hook (Callable): Called with the action (``"create"``, ``"update"``, ``"upsert"`` or ``"delete"``) and the list of written contacts; may be a coroutine function.
+        """
+        cls._write_hooks.append(hook)
+
+    @classmethod
+    def remove_write_hook(cls, hook: Callable[[str, List[Contact]], None]):
+        cls._write_hooks.remove(hook)
+
+    async def _notify(self, action: str, contact: Contact):
+        await self._notify_many(action, [contact])
+
+    async def _notify_many(self, action: str, contacts: List[Contact]):
+        if not contacts:
+            return
+        for hook in self._write_hooks:
+            result = hook(action, contacts)
+            if inspect.isawaitable(result):
+                await result
+
+    @staticmethod
+    def _paginate(stmt, skip: int, limit: int, after_id: Optional[int]):
+        stmt = stmt.order_by(Contact.id)
+        if after_id is not None:
+            stmt = stmt.filter(Contact.id > after_id)
+        elif skip:
+            stmt = stmt.offset(skip)
+        return stmt.limit(limit)
+
+    async def get_all(
+            self,
+            skip: int = 0,
+            limit: int = 100,
+            user_id: int = None,
+            after_id: Optional[int] = None,
+            rows: bool = False,
+            fields: Optional[Sequence[str]] = None
+    ) -> Union[List[Contact], List[Row]]:
+        """
+        Get all contacts ordered by ID.
 
         Args:
             skip (int): The number of contacts to skip.
             limit (int): The maximum number of contacts to return.
             user_id (int): The user ID.
+            after_id (Optional[int]): Keyset position; return only contacts with a greater ID instead of skipping.
+            rows (bool): Return plain rows of the ``RESPONSE_COLUMNS`` instead of ORM objects.
+            fields (Optional[Sequence[str]]): Select only the ``response_columns`` of these fields as rows.
 
         Returns:
-            List[Contact]: The list of contacts.
+            Union[List[Contact], List[Row]]: The list of contacts.
         """
-        stmt = select(Contact).filter_by(user_id=user_id).offset(skip).limit(limit)
+        entities = response_columns(fields) if rows or fields else (Contact,)
+        stmt = self._paginate(select(*entities).filter(Contact.user_id == user_id), skip, limit, after_id)
         contacts = await self.session.execute(stmt)
-        return contacts.scalars().all()
+        return contacts.all() if rows or fields else contacts.scalars().all()
+
+    async def stream_chunks(self, user_id: int, chunk_size: int = 1000) -> AsyncIterator[List[Tuple]]:
+        """
+        Stream all of a user's contacts as plain rows from a server-side cursor.
+
+        Rows are fetched ``chunk_size`` at a time and are not loaded as ORM
+        objects, so memory use does not grow with the number of contacts.
+
+        Args:
+            user_id (int): The user ID.
+            chunk_size (int): Rows fetched per round trip.
 
-    async def get_by_id(self, contact_id: int, user_id: int) -> Optional[Contact]:
+        Yields:
+            List[Tuple]: Chunks of rows of the ``EXPORT_COLUMNS`` columns, ordered by ID.
+        """
+        stmt = select(*EXPORT_COLUMNS).filter(Contact.user_id == user_id).order_by(Contact.id)
+        result = await self.session.stream(stmt.execution_options(yield_per=chunk_size))
+        async for partition in result.partitions():
+            yield [tuple(row) for row in partition]
+
+    async def get_by_id(
+            self,
+            contact_id: int,
+            user_id: int,
+            fields: Optional[Sequence[str]] = None
+    ) -> Union[Contact, Row, None]:
         """
         Get a contact by ID.
 
         Args:
             contact_id (int): The ID of the contact.
             user_id (int): The user ID.
+            fields (Optional[Sequence[str]]): Select only the ``response_columns`` of these fields as a row.
 
         Returns:
-            Optional[Contact]: The contact, or None if not found.
+            Union[Contact, Row, None]: The contact, or None if not found.
         """
-        stmt = select(Contact).filter_by(id=contact_id, user_id=user_id)
+        entities = response_columns(fields) if fields else (Contact,)
+        stmt = select(*entities).filter(Contact.id == contact_id, Contact.user_id == user_id)
         contact = await self.session.execute(stmt)
-        return contact.scalar_one_or_none()
+        return contact.one_or_none() if fields else contact.scalar_one_or_none()
 
     async def create(self, body: ContactCreate, user_id: int) -> Contact:
         """
@@ -60,115 +215,367 @@ class ContactRepository:
         self.session.add(contact)
         await self.session.commit()
         await self.session.refresh(contact)
+        await self._notify("create", contact)
         return contact
 
-    async def update(self, contact_id: int, body: ContactUpdate, user_id: int) -> Optional[Contact]:
+    async def get_email_owners(self, emails: Iterable[str]) -> Dict[str, int]:
+        """
+        Find which users already own contacts with the given emails.
+
+        Args:
+            emails (Iterable[str]): The emails to look up.
+
+        Returns:
+            Dict[str, int]: The owner user ID of every email that is taken.
+        """
+        emails = list(emails)
+        if not emails:
+            return {}
+        result = await self.session.execute(select(Contact.email, Contact.user_id).filter(Contact.email.in_(emails)))
+        return {email: user_id for email, user_id in result.all()}
+
+    async def upsert_many(self, rows: List[dict], user_id: int, batch_size: int = 500) -> List[Contact]:
+        """
+        Create or update many contacts in one transaction.
+
+        Rows are written with multi-row ``INSERT ... ON CONFLICT (email) DO
+        UPDATE`` statements of ``batch_size`` rows. A conflicting email is only
+        updated when it belongs to the same user; rows colliding with another
+        user's contact are skipped and absent from the result.
+
+        Args:
+            rows (List[dict]): ``ContactCreate`` field values, with unique emails.
+            user_id (int): The user ID.
+            batch_size (int): Rows per INSERT statement.
+
+        Returns:
+            List[Contact]: The created or updated contacts.
         """
-        Update a contact.
+        insert = pg_insert if self._dialect() == "postgresql" else sqlite_insert
+        written = []
+        try:
+            for start in range(0, len(rows), batch_size):
+                stmt = insert(Contact)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[Contact.email],
+                    set_={
+                        **{field: stmt.excluded[field] for field in ContactCreate.model_fields if field != "email"},
+                        "birth_md": stmt.excluded.birth_md,
+                        "updated_at": func.now(),
+                        "version": Contact.version + 1,
+                    },
+                    where=Contact.user_id == stmt.excluded.user_id,
+                ).returning(Contact).execution_options(populate_existing=True)
+                result = await self.session.scalars(stmt, [
+                    {**row, "birth_md": month_day(row["birth_date"]), "user_id": user_id}
+                    for row in rows[start:start + batch_size]
+                ])
+                written.extend(result.all())
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        await self._notify_many("upsert", written)
+        return written
+
+    async def _check_version(self, contact_id: int, user_id: int, versions: Optional[Collection[int]]):
+        if versions is None:
+            return
+        stmt = select(Contact.version).filter_by(id=contact_id, user_id=user_id)
+        current = (await self.session.execute(stmt)).scalar_one_or_none()
+        if current is not None:
+            raise VersionConflictError(current)
+
+    async def update(
+            self,
+            contact_id: int,
+            body: Union[ContactCreate, ContactUpdate],
+            user_id: int,
+            versions: Optional[Collection[int]] = None
+    ) -> Optional[Contact]:
+        """
+        Update a contact with a single ``UPDATE ... RETURNING`` statement.
+
+        A ``ContactCreate`` body replaces every field; a ``ContactUpdate``
+        body changes only the fields that were set. Every update increments
+        the contact's ``version``.
 
         Args:
             contact_id (int): The ID of the contact.
-            body (ContactUpdate): The updated contact data.
+            body (Union[ContactCreate, ContactUpdate]): The updated contact data.
             user_id (int): The user ID.
+            versions (Optional[Collection[int]]): Only update if the current version is one of these.
 
         Returns:
             Optional[Contact]: The updated contact, or None if not found.
+
+        Raises:
+            VersionConflictError: If the contact exists but its version does not match.
         """
-        stmt = select(Contact).filter_by(id=contact_id, user_id=user_id)
-        result = await self.session.execute(stmt)
-        contact = result.scalar_one_or_none()
+        values = body.model_dump(exclude_unset=isinstance(body, ContactUpdate))
+        values = {key: value for key, value in values.items() if value is not None or key in NULLABLE_FIELDS}
+        if values.get("birth_date") is not None:
+            values["birth_md"] = month_day(values["birth_date"])
 
-        if contact:
-            for key, value in body.model_dump(exclude_unset=True).items():
-                setattr(contact, key, value)
-            await self.session.commit()
-            await self.session.refresh(contact)
+        stmt = update(Contact).filter_by(id=contact_id, user_id=user_id)
+        if versions is not None:
+            stmt = stmt.filter(Contact.version.in_(versions))
+        stmt = stmt.values(**values, version=Contact.version + 1).returning(Contact)
+        result = await self.session.execute(stmt.execution_options(populate_existing=True))
+        contact = result.scalar_one_or_none()
+        await self.session.commit()
 
+        if contact is None:
+            await self._check_version(contact_id, user_id, versions)
+            return None
+        await self._notify("update", contact)
         return contact
 
-    async def delete(self, contact_id: int, user_id: int) -> Optional[Contact]:
+    async def delete(
+            self,
+            contact_id: int,
+            user_id: int,
+            versions: Optional[Collection[int]] = None
+    ) -> Optional[Contact]:
         """
-        Delete a contact.
+        Delete a contact with a single ``DELETE ... RETURNING`` statement.
 
         Args:
             contact_id (int): The ID of the contact.
             user_id (int): The user ID.
+            versions (Optional[Collection[int]]): Only delete if the current version is one of these.
 
         Returns:
             Optional[Contact]: The deleted contact, or None if not found.
-        """
-        stmt = select(Contact).filter_by(id=contact_id, user_id=user_id)
-        contact = await self.session.execute(stmt)
-        contact = contact.scalar_one_or_none()
 
-        if contact:
-            await self.session.delete(contact)
-            await self.session.commit()
+        Raises:
+            VersionConflictError: If the contact exists but its version does not match.
+        """
+        stmt = delete(Contact).filter_by(id=contact_id, user_id=user_id)
+        if versions is not None:
+            stmt = stmt.filter(Contact.version.in_(versions))
+        result = await self.session.execute(stmt.returning(Contact))
+        contact = result.scalar_one_or_none()
+        await self.session.commit()
+        if contact is not None and contact in self.session:
+            self.session.expunge(contact)
 
+        if contact is None:
+            await self._check_version(contact_id, user_id, versions)
+            return None
+        await self._notify("delete", contact)
         return contact
 
+    async def get_index_rows(self, user_id: int) -> List[Tuple[int, str, str, str]]:
+        """
+        Get the columns indexed for autocomplete for all of a user's contacts.
+
+        Args:
+            user_id (int): The user ID.
+
+        Returns:
+            List[Tuple[int, str, str, str]]: ``(id, first_name, last_name, email)`` rows.
+        """
+        stmt = select(Contact.id, Contact.first_name, Contact.last_name, Contact.email).filter_by(user_id=user_id)
+        result = await self.session.execute(stmt)
+        return [tuple(row) for row in result.all()]
+
+    async def get_prefix_matches(self, user_id: int, prefix: str, limit: int) -> List[Tuple[int, str, str, str]]:
+        """
+        Get a user's contacts whose first name, last name, full name or email starts with a prefix.
+
+        Uses the search index, for users whose contacts are too many to keep
+        an in-process autocomplete index.
+
+        Args:
+            user_id (int): The user ID.
+            prefix (str): The typed prefix.
+            limit (int): The maximum number of contacts to return.
+
+        Returns:
+            List[Tuple[int, str, str, str]]: ``(id, first_name, last_name, email)`` rows, name matches first.
+        """
+        query = prefix.strip().lower()
+        pattern = f"{_escape_like(query)}%"
+        full_name = Contact.first_name + literal_column("' '") + Contact.last_name
+        # Every match contains the first word, which the search index can find
+        # even when the words span the first and last name columns.
+        word = (query.split() or [query])[0]
+        stmt = select(Contact.id, Contact.first_name, Contact.last_name, Contact.email).filter(
+            Contact.user_id == user_id,
+            self._search_filter(word),
+            or_(*(
+                func.lower(column).like(pattern, escape="\\")
+                for column in (Contact.first_name, Contact.last_name, full_name, Contact.email)
+            )),
+        ).order_by(self._search_rank(query), Contact.id).limit(limit)
+        result = await self.session.execute(stmt)
+        return [tuple(row) for row in result.all()]
+
+    def _dialect(self) -> Optional[str]:
+        bind = self.session.bind
+        return getattr(getattr(bind, "dialect", None), "name", None)
+
+    def _search_filter(self, query: str):
+        """Build the indexed match condition for a lower-cased query."""
+        dialect = self._dialect()
+        if dialect == "sqlite" and len(query) >= 3:
+            phrase = '"' + query.replace('"', '""') + '"'
+            return Contact.id.in_(
+                select(literal_column("rowid"))
+                .select_from(text("contacts_fts"))
+                .where(text("contacts_fts MATCH :phrase").bindparams(phrase=phrase))
+            )
+        pattern = f"%{_escape_like(query)}%"
+        if dialect == "postgresql":
+            space = literal_column("' '")
+            document = func.lower(Contact.first_name + space + Contact.last_name + space + Contact.email)
+            return document.like(pattern, escape="\\")
+        return or_(
+            Contact.first_name.ilike(pattern, escape="\\"),
+            Contact.last_name.ilike(pattern, escape="\\"),
+            Contact.email.ilike(pattern, escape="\\")
+        )
+
+    @staticmethod
+    def _search_rank(query: str):
+        """Relevance tier: 0 for a name prefix match, 1 for an email prefix match, 2 otherwise."""
+        prefix = f"{_escape_like(query)}%"
+        return case(
+            (
+                or_(
+                    func.lower(Contact.first_name).like(prefix, escape="\\"),
+                    func.lower(Contact.last_name).like(prefix, escape="\\")
+                ),
+                0
+            ),
+            (func.lower(Contact.email).like(prefix, escape="\\"), 1),
+            else_=2
+        )
+
     async def search_contacts(
             self,
             search_query: str,
             skip: int = 0,
             limit: int = 10,
-            user_id: int = None
-    ) -> List[Contact]:
+            user_id: int = None,
+            after_id: Optional[int] = None,
+            after_rank: Optional[int] = None,
+            rows: bool = False,
+            fields: Optional[Sequence[str]] = None
+    ) -> Union[List[Contact], List[Row]]:
         """
         Search for contacts by name, last name or email.
 
+        Matching uses a trigram index on Postgres and an FTS5 trigram table
+        on SQLite. Results are ordered by relevance tier, then by ID; every
+        returned contact carries its tier in ``search_rank``, which is the
+        last column of a plain row.
+
         Args:
             search_query (str): The search query.
             skip (int): The number of contacts to skip.
             limit (int): The maximum number of contacts to return.
             user_id (int): The user ID.
+            after_id (Optional[int]): Keyset position: ID of the last contact of the previous page.
+            after_rank (Optional[int]): Keyset position: relevance tier of the last contact of the previous page.
+            rows (bool): Return plain rows of the ``RESPONSE_COLUMNS`` instead of ORM objects.
+            fields (Optional[Sequence[str]]): Select only the ``response_columns`` of these fields as rows.
 
         Returns:
-            List[Contact]: The list of contacts.
+            Union[List[Contact], List[Row]]: The list of contacts.
         """
-        search = f"%{search_query}%"
-        stmt = select(Contact).filter(
+        query = search_query.strip().lower()
+        rank = self._search_rank(query)
+
+        rows = rows or bool(fields)
+        entities = response_columns(fields) if rows else (Contact,)
+        stmt = select(*entities, rank.label("search_rank")).filter(
             and_(
-                or_(
-                    Contact.first_name.ilike(search),
-                    Contact.last_name.ilike(search),
-                    Contact.email.ilike(search)
-                ),
+                self._search_filter(query),
                 Contact.user_id == user_id
             )
-        ).offset(skip).limit(limit)
+        ).order_by(rank, Contact.id)
+        if after_id is not None and after_rank is not None:
+            stmt = stmt.filter(or_(rank > after_rank, and_(rank == after_rank, Contact.id > after_id)))
+        elif skip:
+            stmt = stmt.offset(skip)
+        stmt = stmt.limit(limit)
 
-        contacts = await self.session.execute(stmt)
-        return contacts.scalars().all()
+        result = await self.session.execute(stmt)
+        if rows:
+            return result.all()
+        contacts = []
+        for contact, search_rank in result.all():
+            contact.search_rank = search_rank
+            contacts.append(contact)
+        return contacts
 
-    async def get_upcoming_birthdays(self, user_id: int) -> List[Contact]:
+    async def get_upcoming_birthdays(
+            self,
+            user_id: int,
+            days: int = 7,
+            today: Optional[date] = None
+    ) -> List[Contact]:
         """
-        Get contacts whose birthday is in the next 7 days.
+        Get contacts whose birthday falls within the next ``days`` days.
+
+        Matches on the indexed ``birth_md`` column, so the lookup is a range
+        scan of ``(user_id, birth_md)``; a window crossing the new year is
+        split into two range scans. Results are ordered by how soon the
+        birthday comes.
 
         Args:
             user_id (int): The user ID.
+            days (int): How many days after today the window extends; today is always included.
+            today (Optional[date]): The first day of the window; defaults to the current date.
 
         Returns:
             List[Contact]: The list of contacts.
         """
-        today = date.today()
-        seven_days_later = today + timedelta(days=7)
+        contacts = []
+        for low, high in birthday_ranges(today or date.today(), days):
+            stmt = select(Contact).filter(
+                Contact.user_id == user_id,
+                Contact.birth_md.between(low, high)
+            ).order_by(Contact.birth_md, Contact.id)
+            result = await self.session.execute(stmt)
+            contacts.extend(result.scalars().all())
+        return contacts
+
+    async def stream_upcoming_birthdays(self, days: int, today: date) -> AsyncIterator[Contact]:
+        """
+        Stream the contacts of all users whose birthday falls within a window.
+
+        A single pass over the contacts table for batch jobs; rows are
+        fetched in chunks rather than loaded at once.
+
+        Args:
+            days (int): How many days after today the window extends; today is always included.
+            today (date): The first day of the window.
 
+        Yields:
+            Contact: The matching contacts.
+        """
         stmt = select(Contact).filter(
-            and_(
-                or_(
-                    and_(
-                        extract('month', Contact.birth_date) == today.month,
-                        extract('day', Contact.birth_date) >= today.day,
-                        extract('day', Contact.birth_date) <= seven_days_later.day
-                    ),
-                    and_(
-                        extract('month', Contact.birth_date) == seven_days_later.month,
-                        extract('day', Contact.birth_date) <= seven_days_later.day
-                    )
-                ),
-                Contact.user_id == user_id
-            )
-        )
-        contacts = await self.session.execute(stmt)
-        return contacts.scalars().all()
\ No newline at end of file
+            or_(*(Contact.birth_md.between(low, high) for low, high in birthday_ranges(today, days)))
+        ).execution_options(yield_per=1000)
+        result = await self.session.stream_scalars(stmt)
+        async for contact in result:
+            yield contact
+
+    async def get_by_ids(self, contact_ids: List[int]) -> List[Contact]:
+        """
+        Get contacts by ID regardless of owner.
+
+        Args:
+            contact_ids (List[int]): The contact IDs.
+
+        Returns:
+            List[Contact]: The contacts that exist.
+        """
+        if not contact_ids:
+            return []
+        stmt = select(Contact).filter(Contact.id.in_(contact_ids)).execution_options(populate_existing=True)
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
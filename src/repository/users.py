@@ -1,5 +1,7 @@
-from typing import Optional
+from typing import Iterable, List, Optional, Set
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.database.models import User, Role
 from src.schemas.user import UserCreate
@@ -37,3 +39,82 @@ class UserRepository:
         stmt = select(User).filter_by(email=email)
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
+
+    async def update_avatar(self, email: str, url: str) -> Optional[User]:
+        """
+        Update user avatar
+
+        Args:
+            email (str): User email
+            url (str): New avatar URL
+        Returns:
+            User: Updated user, or None if not found
+        """
+        user = await self.get_user_by_email(email)
+        if user is None:
+            return None
+        user.avatar = url
+        await self.session.commit()
+        await self.session.refresh(user)
+        return user
+
+    async def update_password(self, user: User, hashed_password: str) -> User:
+        """
+        Update user password hash
+
+        Args:
+            user (User): User to update
+            hashed_password (str): New hashed password
+        Returns:
+            User: Updated user
+        """
+        user.password = hashed_password
+        await self.session.commit()
+        return user
+
+    async def get_existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        """
+        Get which of the given emails are already registered
+
+        Args:
+            emails (Iterable[str]): Emails to check
+        Returns:
+            Set[str]: Registered emails
+        """
+        emails = list(emails)
+        if not emails:
+            return set()
+        stmt = select(User.email).where(User.email.in_(emails))
+        result = await self.session.execute(stmt)
+        return set(result.scalars().all())
+
+    async def create_users(self, rows: List[dict], batch_size: int = 1000) -> List[dict]:
+        """
+        Creates many users in one transaction using batched inserts
+
+        Rows whose email is already registered, including by a concurrent
+        request, are skipped by ``ON CONFLICT (email) DO NOTHING`` and
+        missing from the result.
+
+        Args:
+            rows (List[dict]): Column values with username, email, password and role
+            batch_size (int): Rows per INSERT statement
+        Returns:
+            List[dict]: The id and email of every created user
+        """
+        insert = pg_insert if self._dialect() == "postgresql" else sqlite_insert
+        created = []
+        try:
+            for start in range(0, len(rows), batch_size):
+                stmt = insert(User).on_conflict_do_nothing(index_elements=[User.email]).returning(User.id, User.email)
+                result = await self.session.execute(stmt, rows[start:start + batch_size])
+                created.extend(dict(row._mapping) for row in result)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return created
+
+    def _dialect(self) -> Optional[str]:
+        bind = self.session.bind
+        return getattr(getattr(bind, "dialect", None), "name", None)
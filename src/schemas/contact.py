@@ -1,6 +1,7 @@
 from datetime import date, datetime
-from typing import Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel, EmailStr, Field, ConfigDict
+from typing_extensions import TypedDict
 
 class ContactBase(BaseModel):
     first_name: str = Field(max_length=50)
@@ -23,7 +24,61 @@ class ContactUpdate(ContactBase):
 
 class ContactResponse(ContactBase):
     id: int
+    version: int
     created_at: datetime
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+class SparseContactResponse(BaseModel):
+    """A ``ContactResponse`` restricted to the fields requested with ``fields=``; the others are absent."""
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    birth_date: Optional[date] = None
+    additional_data: Optional[str] = None
+    id: Optional[int] = None
+    version: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class ContactRow(TypedDict):
+    """A ``ContactResponse`` read from trusted database columns, checked by type only."""
+    first_name: str
+    last_name: str
+    email: str
+    phone: str
+    birth_date: date
+    additional_data: Optional[str]
+    id: int
+    version: int
+    created_at: datetime
+    updated_at: datetime
+
+class ContactSuggestion(BaseModel):
+    id: int
+    first_name: str
+    last_name: str
+    email: str
+
+class ContactBulkResult(BaseModel):
+    index: int
+    email: Optional[str] = None
+    status: Literal["created", "updated", "duplicate", "conflict", "invalid"]
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+class ImportJobStatus(BaseModel):
+    id: str
+    status: Literal["queued", "running", "done", "failed"]
+    format: Literal["csv", "vcard"]
+    filename: Optional[str] = None
+    processed: int = 0
+    created: int = 0
+    updated: int = 0
+    rejected: int = 0
+    rows_per_second: float = 0.0
+    errors: List[str] = []
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field, ConfigDict
-from typing import Optional
+from typing import Optional, Literal
 from src.database.models import Role
 
 class UserCreate(BaseModel):
@@ -16,6 +16,13 @@ class UserResponse(BaseModel):
     role: Role
     model_config = ConfigDict(from_attributes=True)
 
+class BulkUserResult(BaseModel):
+    index: int
+    email: Optional[str] = None
+    status: Literal["created", "exists", "duplicate", "invalid"]
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
 class UserLogin(BaseModel):
     email: EmailStr
     password: str
@@ -25,6 +32,9 @@ class TokenSchema(BaseModel):
     refresh_token: str
     token_type: str = "bearer"
 
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
+
 class PasswordResetRequest(BaseModel):
     email: EmailStr
 
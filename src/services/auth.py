@@ -1,17 +1,28 @@
+import hashlib
 import secrets
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 
 from jose import jwt
 from passlib.context import CryptContext
+from passlib.hash import bcrypt
 from sqlalchemy.ext.asyncio import AsyncSession
 from email.mime.text import MIMEText
-import smtplib
 
 from src.conf.config import config
 from src.repository.users import UserRepository
+from src.services import metrics
+from src.services.cache import TTLCache
+from src.services.hashing import HashingPool
+from src.services.mail import Mailer
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+token_cache = TTLCache(maxsize=config.TOKEN_CACHE_MAXSIZE, ttl=config.TOKEN_CACHE_TTL)
+hashing_pool = HashingPool()
+metrics.register("password_hashing", hashing_pool.stats)
+mailer = Mailer()
+metrics.register("mail", mailer.stats)
 
 def create_access_token(data: dict, expires_delta: Optional[float] = None):
     """
@@ -37,6 +48,36 @@ def create_access_token(data: dict, expires_delta: Optional[float] = None):
     encoded_jwt = jwt.encode(to_encode, config.SECRET_KEY, algorithm=config.ALGORITHM)
     return encoded_jwt
 
+def decode_token(token: str) -> dict:
+    """
+    Decode and verify a JWT, reusing the result for tokens seen before.
+
+    Verified payloads are cached under a SHA-256 digest of the token and
+    expire no later than the token's ``exp`` claim, so a repeated token
+    skips signature verification and claim parsing.
+
+    Args:
+        token (str): The encoded JWT token.
+
+    Returns:
+        dict: The token payload.
+
+    Raises:
+        JWTError: If the token is invalid or expired.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return dict(payload)
+
+    payload = jwt.decode(token, config.SECRET_KEY, algorithms=[config.ALGORITHM])
+    ttl = token_cache.ttl
+    if "exp" in payload:
+        ttl = min(ttl, payload["exp"] - time.time())
+    if ttl > 0:
+        token_cache.set(key, payload, ttl=ttl)
+    return dict(payload)
+
 def verify_password(plain_password, hashed_password):
     """Verify that the plain text password matches the hashed password.
 
@@ -66,9 +107,121 @@ def get_password_hash(password):
     """
     return pwd_context.hash(password)
 
+async def verify_password_async(plain_password, hashed_password):
+    """Verify a password in the hashing pool without blocking the event loop.
+
+    Args:
+        plain_password (str): The plain text password.
+        hashed_password (str): The hashed password.
+
+    Returns:
+        bool: True if the passwords match, False otherwise.
+
+    Raises:
+        PoolSaturatedError: If the hashing pool is saturated.
+    """
+    return await hashing_pool.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password):
+    """Hash a password in the hashing pool without blocking the event loop.
+
+    Args:
+        password (str): The password.
+
+    Returns:
+        str: The hash of the password.
+
+    Raises:
+        PoolSaturatedError: If the hashing pool is saturated.
+    """
+    return await hashing_pool.run(get_password_hash, password)
+
+def verify_and_update_password(plain_password, hashed_password):
+    """Verify a password and rehash it if its bcrypt cost is outdated.
+
+    Args:
+        plain_password (str): The plain text password.
+        hashed_password (str): The hashed password.
+
+    Returns:
+        tuple: Whether the password matches, and a new hash or None if the stored one is current.
+
+    Raises:
+        None
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+def configure_bcrypt_rounds(rounds: int):
+    """Use a fixed bcrypt cost for new hashes and flag hashes with any other cost.
+
+    Args:
+        rounds (int): The bcrypt cost factor.
+
+    Returns:
+        None
+
+    Raises:
+        None
+    """
+    pwd_context.update(
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+def calibrate_bcrypt_rounds(target_ms: float, min_rounds: int = 10, max_rounds: int = 16):
+    """Pick the highest bcrypt cost whose hash time fits into the latency budget.
+
+    Every extra round doubles the work, so the cost is extrapolated from the
+    best of a few timed hashes at ``min_rounds``.
+
+    Args:
+        target_ms (float): The per-hash latency budget in milliseconds.
+        min_rounds (int): The lowest cost that may be chosen.
+        max_rounds (int): The highest cost that may be chosen.
+
+    Returns:
+        int: The bcrypt cost factor.
+
+    Raises:
+        None
+    """
+    handler = bcrypt.using(rounds=min_rounds)
+    samples = []
+    for _ in range(3):
+        started = time.perf_counter()
+        handler.hash("calibration")
+        samples.append((time.perf_counter() - started) * 1000)
+
+    rounds, estimate = min_rounds, min(samples)
+    while rounds < max_rounds and estimate * 2 <= target_ms:
+        rounds += 1
+        estimate *= 2
+    return rounds
+
+async def setup_password_hashing():
+    """Apply the configured or calibrated bcrypt cost at startup.
+
+    Returns:
+        Optional[int]: The bcrypt cost in use, or None to keep the passlib default.
+
+    Raises:
+        None
+    """
+    rounds = config.BCRYPT_ROUNDS
+    if config.BCRYPT_CALIBRATE:
+        rounds = await hashing_pool.run(calibrate_bcrypt_rounds, config.BCRYPT_TARGET_MS)
+    if rounds:
+        configure_bcrypt_rounds(rounds)
+        hashing_pool.set_initializer(configure_bcrypt_rounds, (rounds,))
+    return rounds
+
 async def authenticate_user(email: str, password: str, db: AsyncSession):
     """Authenticate a user.
 
+    A stored hash whose bcrypt cost differs from the configured one is
+    replaced with a fresh hash of the supplied password.
+
     Args:
         email (str): The email of the user.
         password (str): The password of the user.
@@ -78,7 +231,7 @@ async def authenticate_user(email: str, password: str, db: AsyncSession):
         User: The authenticated user.
 
     Raises:
-        None
+        PoolSaturatedError: If the hashing pool is saturated.
     """
     user_repo = UserRepository(db)
     user = await user_repo.get_user_by_email(email)
@@ -86,9 +239,13 @@ async def authenticate_user(email: str, password: str, db: AsyncSession):
     if not user:
         return False
 
-    if not verify_password(password, user.password):
+    valid, new_hash = await hashing_pool.run(verify_and_update_password, password, user.password)
+    if not valid:
         return False
 
+    if new_hash:
+        await user_repo.update_password(user, new_hash)
+
     return user
 
 def generate_email_verification_token():
@@ -100,9 +257,9 @@ def generate_email_verification_token():
     """
     return secrets.token_urlsafe(32)
 
-def send_reset_password_email(email: str, token: str):
+async def send_reset_password_email(email: str, token: str):
     """
-    Email the user with a password reset token.
+    Queue an email with a password reset token for the user.
 
     Args:
         email (str): The email address of the user.
@@ -112,15 +269,9 @@ def send_reset_password_email(email: str, token: str):
         None
 
     """
-    try:
-        msg = MIMEText(f"Your password reset token is: {token}")
-        msg['Subject'] = 'Password Reset'
-        msg['From'] = 'your_email@example.com'
-        msg['To'] = email
+    msg = MIMEText(f"Your password reset token is: {token}")
+    msg['Subject'] = 'Password Reset'
+    msg['From'] = config.MAIL_FROM
+    msg['To'] = email
 
-        with smtplib.SMTP('smtp.example.com', 587) as server:
-            server.starttls()
-            server.login('your_email@example.com', 'your_password')
-            server.sendmail('your_email@example.com', [email], msg.as_string())
-    except Exception as e:
-        print(f"Failed to send email: {e}")
\ No newline at end of file
+    await mailer.send(msg)
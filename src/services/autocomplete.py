@@ -0,0 +1,233 @@
+import asyncio
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.conf.config import config
+
+Row = Tuple[int, str, str, str]
+"""An indexed contact: ``(id, first_name, last_name, email)``."""
+
+
+def _tokens(row: Row) -> Set[str]:
+    _, first_name, last_name, email = row
+    first_name, last_name, email = (first_name or "").lower(), (last_name or "").lower(), (email or "").lower()
+    return {first_name, last_name, f"{first_name} {last_name}", email}
+
+
+def suggestion(row: Row) -> dict:
+    return {"id": row[0], "first_name": row[1], "last_name": row[2], "email": row[3]}
+
+
+class UserIndex:
+    """
+    Prefix index over one user's contacts.
+
+    Every contact contributes its first name, last name, full name and email
+    as lower-cased tokens to a sorted array of ``(token, id)`` pairs, so a
+    prefix lookup is a binary search followed by a short forward scan.
+    """
+
+    def __init__(self, rows: Iterable[Row] = ()):
+        self.rows: Dict[int, Row] = {}
+        self.entries: List[Tuple[str, int]] = []
+        self.built_at = time.monotonic()
+        for row in rows:
+            self.rows[row[0]] = row
+            self.entries.extend((token, row[0]) for token in _tokens(row))
+        self.entries.sort()
+
+    def add(self, row: Row):
+        self.remove(row[0])
+        self.rows[row[0]] = row
+        for token in _tokens(row):
+            insort(self.entries, (token, row[0]))
+
+    def remove(self, contact_id: int):
+        row = self.rows.pop(contact_id, None)
+        if row is None:
+            return
+        for token in _tokens(row):
+            position = bisect_left(self.entries, (token, contact_id))
+            if position < len(self.entries) and self.entries[position] == (token, contact_id):
+                del self.entries[position]
+
+    def search(self, prefix: str, limit: int) -> List[dict]:
+        prefix = prefix.strip().lower()
+        found: List[int] = []
+        seen: Set[int] = set()
+        position = bisect_left(self.entries, (prefix,))
+        while position < len(self.entries) and len(found) < limit:
+            token, contact_id = self.entries[position]
+            if not token.startswith(prefix):
+                break
+            if contact_id not in seen:
+                seen.add(contact_id)
+                found.append(contact_id)
+            position += 1
+        return [suggestion(self.rows[contact_id]) for contact_id in found]
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class AutocompleteIndex:
+    """
+    In-process, per-user prefix indexes for contact autocomplete.
+
+    A user's index is built lazily from the database on first use and kept
+    current through ``on_write``, which is registered as a
+    ``ContactRepository`` write hook. Indexes of cold users are evicted in
+    LRU order once the number of users or the total number of index entries
+    exceeds its cap, and every index is rebuilt after ``ttl`` seconds so that
+    writes served by other worker processes become visible. A user whose
+    index alone exceeds the entry cap is not indexed; for ``ttl`` seconds
+    their lookups go to the ``fallback`` query instead.
+    """
+
+    def __init__(
+            self,
+            max_users: int = config.AUTOCOMPLETE_MAX_USERS,
+            max_entries: int = config.AUTOCOMPLETE_MAX_ENTRIES,
+            ttl: float = config.AUTOCOMPLETE_TTL,
+    ):
+        self.max_users = max_users
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.total_entries = 0
+        self._users: "OrderedDict[int, UserIndex]" = OrderedDict()
+        self._builds: Dict[int, asyncio.Future] = {}
+        self._stale: Set[int] = set()
+        self._oversized: Dict[int, float] = {}
+        self.counters = {"hits": 0, "builds": 0, "evictions": 0, "updates": 0, "fallbacks": 0}
+
+    async def search(
+            self,
+            user_id: int,
+            prefix: str,
+            limit: int,
+            loader: Callable[[], Awaitable[Iterable[Row]]],
+            fallback: Optional[Callable[[], Awaitable[Iterable[Row]]]] = None
+    ) -> List[dict]:
+        """
+        Find a user's contacts whose name or email starts with a prefix.
+
+        Args:
+            user_id (int): The user ID.
+            prefix (str): The typed prefix.
+            limit (int): The maximum number of suggestions.
+            loader (Callable): Coroutine function returning the user's contact rows, used to build the index.
+            fallback (Optional[Callable]): Coroutine function returning the matching rows, used for users too large to index.
+
+        Returns:
+            List[dict]: The matching contacts, ordered by matched token.
+        """
+        if fallback is not None and self._is_oversized(user_id):
+            self.counters["fallbacks"] += 1
+            return [suggestion(row) for row in await fallback()]
+        index = self._get(user_id)
+        if index is None:
+            index = await self._build(user_id, loader)
+        else:
+            self.counters["hits"] += 1
+        return index.search(prefix, limit)
+
+    def on_write(self, action: str, contacts: List):
+        """
+        Apply contact writes to their owners' indexes, if they are loaded.
+
+        Args:
+            action (str): ``"create"``, ``"update"``, ``"upsert"`` or ``"delete"``.
+            contacts (List[Contact]): The written contacts.
+        """
+        for contact in contacts:
+            user_id = contact.user_id
+            if user_id in self._builds:
+                self._stale.add(user_id)
+            index = self._users.get(user_id)
+            if index is None:
+                continue
+            self.counters["updates"] += 1
+            self.total_entries -= len(index)
+            if action == "delete":
+                index.remove(contact.id)
+            else:
+                index.add((contact.id, contact.first_name, contact.last_name, contact.email))
+            self.total_entries += len(index)
+        self._enforce_limits()
+
+    def invalidate(self, user_id: int):
+        index = self._users.pop(user_id, None)
+        if index is not None:
+            self.total_entries -= len(index)
+
+    def clear(self):
+        self._users.clear()
+        self._oversized.clear()
+        self.total_entries = 0
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "users": len(self._users),
+            "entries": self.total_entries,
+            "oversized": len(self._oversized),
+        }
+
+    def _is_oversized(self, user_id: int) -> bool:
+        marked_at = self._oversized.get(user_id)
+        if marked_at is None:
+            return False
+        if time.monotonic() - marked_at > self.ttl:
+            del self._oversized[user_id]
+            return False
+        return True
+
+    def _get(self, user_id: int) -> Optional[UserIndex]:
+        index = self._users.get(user_id)
+        if index is None:
+            return None
+        if time.monotonic() - index.built_at > self.ttl:
+            self.invalidate(user_id)
+            return None
+        self._users.move_to_end(user_id)
+        return index
+
+    async def _build(self, user_id: int, loader) -> UserIndex:
+        inflight = self._builds.get(user_id)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._builds[user_id] = future
+        try:
+            index = UserIndex(await loader())
+            self.counters["builds"] += 1
+            if len(index) > self.max_entries:
+                # Keeping it would evict every other index and then itself;
+                # serve it once and use the fallback query until it expires.
+                self.invalidate(user_id)
+                self._oversized[user_id] = time.monotonic()
+            # A write that landed while the rows were loading may be missing
+            # from this snapshot; serve it once but do not keep it.
+            elif user_id not in self._stale:
+                self.invalidate(user_id)
+                self._users[user_id] = index
+                self.total_entries += len(index)
+                self._enforce_limits()
+            future.set_result(index)
+            return index
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()
+            raise
+        finally:
+            self._builds.pop(user_id, None)
+            self._stale.discard(user_id)
+
+    def _enforce_limits(self):
+        while self._users and (len(self._users) > self.max_users or self.total_entries > self.max_entries):
+            _, evicted = self._users.popitem(last=False)
+            self.total_entries -= len(evicted)
+            self.counters["evictions"] += 1
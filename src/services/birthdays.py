@@ -0,0 +1,231 @@
+import asyncio
+import json
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Dict, List, Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.conf.config import config
+from src.database.models import Contact, month_day
+from src.repository.contacts import ContactRepository, birthday_ranges
+from src.schemas.contact import ContactResponse
+from src.services.cache import CacheService
+
+logger = logging.getLogger(__name__)
+
+# Applies a write to a day's digest. A finished digest is patched in place;
+# while the daily job is still building it, the write is patched in and also
+# recorded so the job can re-apply it over its own, possibly older, rows.
+# KEYS: done marker, building marker, digest hash, dirty set.
+# ARGV: TTL, then "set" or "del", contact id, contact JSON and dirty set member
+# for each written contact of the digest's user.
+CORRECTION_SCRIPT = """
+local building = redis.call('EXISTS', KEYS[2]) == 1
+if not building and redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+for i = 2, #ARGV, 4 do
+    if building then
+        redis.call('SADD', KEYS[4], ARGV[i + 3])
+    end
+    if ARGV[i] == 'set' then
+        redis.call('HSET', KEYS[3], ARGV[i + 1], ARGV[i + 2])
+    else
+        redis.call('HDEL', KEYS[3], ARGV[i + 1])
+    end
+end
+if building then
+    redis.call('EXPIRE', KEYS[4], ARGV[1])
+end
+redis.call('EXPIRE', KEYS[3], ARGV[1])
+return 1
+"""
+
+
+class BirthdayDigest:
+    """
+    Per-user upcoming-birthday lists precomputed once a day in Redis.
+
+    The daily job makes one pass over the contacts table and stores every
+    user's matches in a hash keyed by day and user; a ``done`` marker tells
+    readers that a missing hash means "no birthdays" rather than "not built".
+    Contact writes are applied to today's digest through ``on_write``, which
+    is registered as a ``ContactRepository`` write hook.
+    """
+
+    def __init__(self, cache_service: CacheService, days: int = config.BIRTHDAY_DIGEST_DAYS):
+        self.cache_service = cache_service
+        self.days = days
+        self.ttl = 2 * 24 * 3600
+        self.script = cache_service.redis.register_script(CORRECTION_SCRIPT)
+        self.counters = {"hits": 0, "misses": 0, "builds": 0, "corrections": 0, "errors": 0}
+
+    @staticmethod
+    def _key(day: date, suffix) -> str:
+        return f"birthdays:{day.isoformat()}:{suffix}"
+
+    def _in_window(self, contact: Contact, day: date) -> bool:
+        if contact.birth_md is None:
+            return False
+        return any(low <= contact.birth_md <= high for low, high in birthday_ranges(day, self.days))
+
+    def _sort_key(self, day: date):
+        ranges = birthday_ranges(day, self.days)
+
+        def key(item: dict):
+            md = month_day(date.fromisoformat(item["birth_date"]))
+            lap = next((i for i, (low, high) in enumerate(ranges) if low <= md <= high), len(ranges))
+            return lap, md, item["id"]
+        return key
+
+    async def get(self, user_id: int, today: Optional[date] = None) -> Optional[List[dict]]:
+        """
+        Read a user's upcoming birthdays from today's digest.
+
+        Args:
+            user_id (int): The user ID.
+            today (Optional[date]): The digest day; defaults to the current date.
+
+        Returns:
+            Optional[List[dict]]: The contacts, soonest birthday first, or None if today's digest is not built.
+        """
+        today = today or date.today()
+        try:
+            async with self.cache_service.redis.pipeline(transaction=False) as pipe:
+                pipe.exists(self._key(today, "done"))
+                pipe.hgetall(self._key(today, user_id))
+                done, entries = await pipe.execute()
+        except RedisError:
+            self.counters["errors"] += 1
+            return None
+        if not done:
+            self.counters["misses"] += 1
+            return None
+        self.counters["hits"] += 1
+        return sorted((json.loads(value) for value in entries.values()), key=self._sort_key(today))
+
+    async def on_write(self, action: str, contacts: List[Contact], today: Optional[date] = None):
+        """
+        Apply contact writes to their owners' digests for today, in one call per owner.
+
+        Args:
+            action (str): ``"create"``, ``"update"``, ``"upsert"`` or ``"delete"``.
+            contacts (List[Contact]): The written contacts.
+            today (Optional[date]): The digest day; defaults to the current date.
+        """
+        today = today or date.today()
+        by_user: Dict[int, List[Contact]] = {}
+        for contact in contacts:
+            by_user.setdefault(contact.user_id, []).append(contact)
+        for user_id, written in by_user.items():
+            args = [self.ttl]
+            for contact in written:
+                keep = action != "delete" and self._in_window(contact, today)
+                args += [
+                    "set" if keep else "del",
+                    contact.id,
+                    ContactResponse.model_validate(contact).model_dump_json() if keep else "",
+                    f"{user_id}:{contact.id}",
+                ]
+            try:
+                applied = await self.script(
+                    keys=[
+                        self._key(today, "done"),
+                        self._key(today, "building"),
+                        self._key(today, user_id),
+                        self._key(today, "dirty"),
+                    ],
+                    args=args,
+                )
+            except RedisError as e:
+                self.counters["errors"] += 1
+                logger.warning("Birthday digest correction failed for user %s: %s", user_id, e)
+                continue
+            if applied:
+                self.counters["corrections"] += len(written)
+
+    async def build(self, db: AsyncSession, today: Optional[date] = None, force: bool = False) -> bool:
+        """
+        Compute every user's digest for a day in one pass over the contacts table.
+
+        Only one worker builds a given day; the others return immediately.
+
+        Args:
+            db (AsyncSession): The database session.
+            today (Optional[date]): The digest day; defaults to the current date.
+            force (bool): Rebuild even if the day's digest is already done.
+
+        Returns:
+            bool: True if this call built the digest.
+        """
+        today = today or date.today()
+        redis = self.cache_service.redis
+        done_key, building_key, dirty_key = (self._key(today, s) for s in ("done", "building", "dirty"))
+        if not force and await redis.exists(done_key):
+            return False
+        if not await redis.set(building_key, 1, nx=True, ex=600):
+            return False
+
+        try:
+            repository = ContactRepository(db)
+            await redis.delete(done_key)
+            pipe = redis.pipeline(transaction=False)
+            async for contact in repository.stream_upcoming_birthdays(self.days, today):
+                key = self._key(today, contact.user_id)
+                pipe.hset(key, contact.id, ContactResponse.model_validate(contact).model_dump_json())
+                pipe.expire(key, self.ttl)
+                if len(pipe) >= 1000:
+                    await pipe.execute()
+            await pipe.execute()
+
+            dirty = [member.split(":") for member in await redis.smembers(dirty_key)]
+            contacts = {c.id: c for c in await repository.get_by_ids([int(cid) for _, cid in dirty])}
+            for user_id, contact_id in dirty:
+                contact = contacts.get(int(contact_id))
+                if contact is not None and self._in_window(contact, today):
+                    pipe.hset(self._key(today, user_id), contact_id, ContactResponse.model_validate(contact).model_dump_json())
+                else:
+                    pipe.hdel(self._key(today, user_id), contact_id)
+            pipe.set(done_key, 1, ex=self.ttl)
+            pipe.delete(dirty_key)
+            await pipe.execute()
+            self.counters["builds"] += 1
+            return True
+        finally:
+            await redis.delete(building_key)
+
+    async def run_daily(self, session_factory: Callable[[], AsyncSession]):
+        """
+        Build today's digest now if needed, then again after every midnight.
+
+        A failed build is retried after ``BIRTHDAY_DIGEST_RETRY`` seconds;
+        until it succeeds, readers fall back to the database. So is a build
+        left to another worker, until that worker's digest is done, in case
+        it fails or dies holding the build lock.
+
+        Args:
+            session_factory (Callable): Factory of database sessions.
+        """
+        while True:
+            try:
+                today = date.today()
+                async with session_factory() as db:
+                    built = await self.build(db, today=today)
+                if not built and not await self.cache_service.redis.exists(self._key(today, "done")):
+                    await asyncio.sleep(config.BIRTHDAY_DIGEST_RETRY)
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.counters["errors"] += 1
+                logger.error("Birthday digest build failed: %s", e)
+                await asyncio.sleep(config.BIRTHDAY_DIGEST_RETRY)
+                continue
+            now = datetime.now()
+            midnight = datetime.combine(now.date() + timedelta(days=1), time())
+            await asyncio.sleep((midnight - now).total_seconds() + 1)
+
+    def stats(self) -> dict:
+        return dict(self.counters)
@@ -0,0 +1,48 @@
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+Body = TypeVar("Body", bound=BaseModel)
+Result = TypeVar("Result", bound=BaseModel)
+
+
+def validate_bulk_rows(
+        rows: List[Dict[str, Any]],
+        schema: Type[Body],
+        result_type: Type[Result],
+) -> Tuple[List[Optional[Result]], Dict[str, Tuple[int, Body]]]:
+    """
+    Validate the rows of a bulk request and drop repeated emails.
+
+    Invalid rows and later rows repeating an earlier row's email get their
+    final result right away; every other row becomes a candidate for the
+    write, keyed by email.
+
+    Args:
+        rows (List[Dict[str, Any]]): Raw payloads, one per row.
+        schema (Type[BaseModel]): The model each row is validated with.
+        result_type (Type[BaseModel]): The per-row result model, with ``index``, ``email``, ``status`` and ``detail`` fields.
+
+    Returns:
+        Tuple[List[Optional[BaseModel]], Dict[str, Tuple[int, BaseModel]]]: The results so far, None for candidates, and the candidates' input index and validated body by email.
+    """
+    results: List[Optional[Result]] = [None] * len(rows)
+    candidates: Dict[str, Tuple[int, Body]] = {}
+    for index, row in enumerate(rows):
+        try:
+            body = schema.model_validate(row)
+        except ValidationError as e:
+            error = e.errors()[0]
+            email = row.get("email") if isinstance(row, dict) else None
+            results[index] = result_type(
+                index=index,
+                email=email if isinstance(email, str) else None,
+                status="invalid",
+                detail=f"{'.'.join(map(str, error['loc']))}: {error['msg']}",
+            )
+            continue
+        if body.email in candidates:
+            results[index] = result_type(index=index, email=body.email, status="duplicate")
+            continue
+        candidates[body.email] = (index, body)
+    return results, candidates
@@ -1,15 +1,255 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
 import redis.asyncio as redis
+from redis.exceptions import RedisError
 from src.conf.config import config
 
+NEGATIVE = "\x00none"
+"""Marker stored in place of a value the loader reported as missing."""
+
+
+def _sizeof(value: Any) -> int:
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    return 64
+
+
+class TTLCache:
+    """
+    Bounded in-process LRU cache whose entries expire after a per-key TTL.
+
+    The cache is capped both by number of entries and by the approximate
+    size of the stored values; the least recently used entries are evicted
+    first when either cap is exceeded.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60, max_bytes: Optional[int] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.evictions = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        self.delete(key)
+        size = _sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value, size)
+        self.size_bytes += size
+        while len(self._data) > self.maxsize or (
+            self.max_bytes is not None and self.size_bytes > self.max_bytes
+        ):
+            _, (_, _, evicted_size) = self._data.popitem(last=False)
+            self.size_bytes -= evicted_size
+            self.evictions += 1
+
+    def delete(self, key: Hashable):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= entry[2]
+
+    def clear(self):
+        self._data.clear()
+        self.size_bytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
 class CacheService:
-    def __init__(self):
-        self.redis = redis.from_url(config.REDIS_URL)
+    """
+    Two-tier cache: a bounded in-process LRU tier in front of Redis.
+
+    Only values written with a ``local_ttl`` are kept in the in-process tier,
+    so keys that must be consistent across workers (one-time tokens and the
+    like) always go to Redis. ``get_or_load`` coalesces concurrent misses for
+    the same key into a single loader call and caches missing values too.
+    """
+
+    def __init__(
+            self,
+            local_maxsize: int = config.CACHE_LOCAL_MAXSIZE,
+            local_max_bytes: int = config.CACHE_LOCAL_MAX_BYTES,
+    ):
+        self.redis = redis.from_url(config.REDIS_URL, decode_responses=True)
+        self.local = TTLCache(maxsize=local_maxsize, max_bytes=local_max_bytes)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.counters = {
+            "local_hits": 0,
+            "redis_hits": 0,
+            "negative_hits": 0,
+            "misses": 0,
+            "loads": 0,
+            "coalesced": 0,
+        }
 
     async def get(self, key: str):
-        return await self.redis.get(key)
+        value = self.local.get(key)
+        if value is not None:
+            self.counters["local_hits"] += 1
+            return None if value == NEGATIVE else value
+        value = await self.redis.get(key)
+        if value is None:
+            self.counters["misses"] += 1
+            return None
+        self.counters["redis_hits"] += 1
+        return None if value == NEGATIVE else value
 
-    async def set(self, key: str, value: str, ex: int = None):
+    async def set(self, key: str, value: str, ex: int = None, local_ttl: Optional[float] = None):
         await self.redis.set(key, value, ex=ex)
+        if local_ttl:
+            self.local.set(key, value, ttl=local_ttl)
+        else:
+            self.local.delete(key)
 
     async def delete(self, key: str):
+        self.local.delete(key)
         await self.redis.delete(key)
+
+    async def swap(self, key: str, value: str, ex: int = None) -> Optional[str]:
+        """
+        Atomically replace an existing Redis value and return the previous one.
+
+        Args:
+            key (str): The cache key.
+            value (str): The new value.
+            ex (int): TTL in seconds.
+
+        Returns:
+            Optional[str]: The previous value, or None if the key did not exist (nothing is written then).
+        """
+        self.local.delete(key)
+        return await self.redis.set(key, value, ex=ex, xx=True, get=True)
+
+    async def incr(self, key: str) -> int:
+        """
+        Atomically increment a Redis counter.
+
+        Args:
+            key (str): The counter key.
+
+        Returns:
+            int: The new counter value.
+        """
+        self.local.delete(key)
+        return await self.redis.incr(key)
+
+    async def get_or_load(
+            self,
+            key: str,
+            loader: Callable[[], Awaitable[Optional[str]]],
+            ex: int = None,
+            local_ttl: Optional[float] = None,
+            negative_ttl: int = config.CACHE_NEGATIVE_TTL,
+    ) -> Optional[str]:
+        """
+        Read a key through both tiers, calling ``loader`` on a full miss.
+
+        Concurrent callers missing the same key wait for the first caller's
+        load instead of issuing their own Redis and loader calls. A ``None``
+        result is cached as a negative entry for ``negative_ttl`` seconds.
+        Redis errors are treated as misses so the loader still serves.
+
+        Args:
+            key (str): The cache key.
+            loader (Callable): Coroutine function returning the value or None.
+            ex (int): Redis TTL in seconds for loaded values.
+            local_ttl (float): In-process TTL in seconds; None keeps the value out of the local tier.
+            negative_ttl (int): TTL in seconds for cached misses.
+
+        Returns:
+            Optional[str]: The cached or loaded value.
+        """
+        value = self.local.get(key)
+        if value is not None:
+            self.counters["local_hits"] += 1
+            if value == NEGATIVE:
+                self.counters["negative_hits"] += 1
+                return None
+            return value
+
+        while key in self._inflight:
+            future = self._inflight[key]
+            self.counters["coalesced"] += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._load(key, loader, ex, local_ttl, negative_ttl)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _load(self, key, loader, ex, local_ttl, negative_ttl) -> Optional[str]:
+        try:
+            value = await self.redis.get(key)
+        except RedisError:
+            value = None
+
+        if value is not None:
+            self.counters["redis_hits"] += 1
+            if value == NEGATIVE:
+                self.counters["negative_hits"] += 1
+                if local_ttl:
+                    self.local.set(key, NEGATIVE, ttl=min(local_ttl, negative_ttl))
+                return None
+            if local_ttl:
+                self.local.set(key, value, ttl=local_ttl)
+            return value
+
+        self.counters["misses"] += 1
+        self.counters["loads"] += 1
+        value = await loader()
+        stored, ttl = (NEGATIVE, negative_ttl) if value is None else (value, ex)
+        try:
+            await self.redis.set(key, stored, ex=ttl)
+        except RedisError:
+            pass
+        if local_ttl:
+            self.local.set(key, stored, ttl=local_ttl if value is not None else min(local_ttl, negative_ttl))
+        return value
+
+    def stats(self) -> dict:
+        """
+        Snapshot of the cache counters.
+
+        Returns:
+            dict: Hit, miss, load and eviction counters and the local tier size.
+        """
+        return {
+            **self.counters,
+            "evictions": self.local.evictions,
+            "local_entries": len(self.local),
+            "local_bytes": self.local.size_bytes,
+        }
@@ -0,0 +1,68 @@
+import logging
+from typing import List
+
+from redis.exceptions import RedisError
+
+from src.conf.config import config
+from src.services.cache import CacheService
+
+logger = logging.getLogger(__name__)
+
+
+class ReadYourWrites:
+    """
+    Marks users who wrote recently so their reads go to the primary database.
+
+    ``mark`` is registered as a ``ContactRepository`` write hook and sets a
+    short-lived per-user key in Redis, shared by all workers; while it is
+    set, the user's reads skip the replicas, which may not have replayed the
+    write yet.
+    """
+
+    def __init__(self, cache_service: CacheService, window: int = config.DB_PRIMARY_STICKY_SECONDS):
+        self.cache_service = cache_service
+        self.window = window
+        self.counters = {"marks": 0, "sticky_reads": 0, "errors": 0}
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"db_primary:{user_id}"
+
+    async def mark(self, action: str, contacts: List):
+        """
+        Keep the owners' reads on the primary for the sticky window.
+
+        Args:
+            action (str): ``"create"``, ``"update"``, ``"upsert"`` or ``"delete"``.
+            contacts (List[Contact]): The written contacts.
+        """
+        for user_id in {contact.user_id for contact in contacts}:
+            try:
+                await self.cache_service.redis.set(self._key(user_id), 1, ex=self.window)
+            except RedisError as e:
+                self.counters["errors"] += 1
+                logger.warning("Failed to mark user %s for primary reads: %s", user_id, e)
+                continue
+            self.counters["marks"] += 1
+
+    async def recent(self, user_id: int) -> bool:
+        """
+        Check whether a user's reads must go to the primary.
+
+        Args:
+            user_id (int): The user ID.
+
+        Returns:
+            bool: True if the user wrote within the window, or if Redis cannot tell.
+        """
+        try:
+            sticky = bool(await self.cache_service.redis.exists(self._key(user_id)))
+        except RedisError:
+            self.counters["errors"] += 1
+            sticky = True
+        if sticky:
+            self.counters["sticky_reads"] += 1
+        return sticky
+
+    def stats(self) -> dict:
+        return dict(self.counters)
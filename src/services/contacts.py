@@ -1,75 +1,303 @@
+import base64
+import binascii
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.schemas.contact import ContactCreate, ContactUpdate
+from src.schemas.contact import ContactBulkResult, ContactCreate, ContactUpdate
 from src.repository.contacts import ContactRepository
+from src.services.autocomplete import AutocompleteIndex
+from src.services.birthdays import BirthdayDigest
+from src.services.bulk import validate_bulk_rows
+
+
+def encode_cursor(last_id: int, rank: Optional[int] = None) -> str:
+    """
+    Encode the position after a contact as an opaque pagination cursor.
+
+    Args:
+        last_id (int): The ID of the last contact on the page.
+        rank (Optional[int]): The search relevance tier of that contact.
+
+    Returns:
+        str: The cursor.
+    """
+    data = {"id": last_id} if rank is None else {"id": last_id, "rank": rank}
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, Optional[int]]:
+    """
+    Decode a pagination cursor.
+
+    Args:
+        cursor (str): The cursor returned with the previous page.
+
+    Returns:
+        Tuple[int, Optional[int]]: The ID and search relevance tier of the last contact on the previous page.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        last_id, rank = data["id"], data.get("rank")
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError, AttributeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(last_id, int) or not isinstance(rank, (int, type(None))):
+        raise ValueError("Invalid cursor")
+    return last_id, rank
+
+
+def query_digest(params: Dict[str, Any]) -> str:
+    """
+    Hash query parameters independently of their order; None values are ignored.
+
+    Args:
+        params (Dict[str, Any]): The query parameters.
+
+    Returns:
+        str: A short hex digest.
+    """
+    query = json.dumps(sorted((name, str(value)) for name, value in params.items() if value is not None))
+    return hashlib.sha1(query.encode()).hexdigest()[:16]
+
+
+def version_etag(version: int, fields: Optional[Sequence[str]] = None) -> str:
+    """
+    Build the entity tag of a contact version.
+
+    A sparse representation gets a tag of its own, suffixed with a digest of
+    its fields; ``parse_if_match`` accepts either.
+
+    Args:
+        version (int): The contact's version.
+        fields (Optional[Sequence[str]]): The fields of a sparse representation.
+
+    Returns:
+        str: The quoted ETag value.
+    """
+    if fields:
+        return f'"v{version}-{query_digest({"fields": ",".join(fields)})}"'
+    return f'"v{version}"'
+
+
+def contact_etag(contact, fields: Optional[Sequence[str]] = None) -> str:
+    """
+    Build the entity tag of a contact from its version.
+
+    Args:
+        contact (Contact): The contact, or a row with its ``version``.
+        fields (Optional[Sequence[str]]): The fields of a sparse representation.
+
+    Returns:
+        str: The quoted ETag value.
+    """
+    return version_etag(contact.version, fields)
+
+
+def parse_if_match(header: Optional[str]) -> Optional[List[int]]:
+    """
+    Extract the contact versions listed in an ``If-Match`` header.
+
+    Args:
+        header (Optional[str]): The header value.
+
+    Returns:
+        Optional[List[int]]: The acceptable versions, or None if any version is acceptable
+        (no header or ``*``). Tags that are not contact ETags match nothing.
+    """
+    if header is None or header.strip() == "*":
+        return None
+    versions = []
+    for tag in header.split(","):
+        tag = tag.strip()
+        version = tag[2:-1].partition("-")[0]
+        if tag.startswith('"v') and tag.endswith('"') and version.isdigit():
+            versions.append(int(version))
+    return versions
+
+
+def collection_etag(version: str, params: Dict[str, Any]) -> str:
+    """
+    Build the entity tag of a contact list from the collection version and query.
+
+    Args:
+        version (str): The owner's contacts collection version.
+        params (Dict[str, Any]): The query parameters that select the list.
+
+    Returns:
+        str: The quoted ETag value.
+    """
+    return f'"c{version}-{query_digest(params)}"'
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """
+    Check an ``If-None-Match`` header against an entity tag.
+
+    Uses weak comparison, as RFC 9110 requires for ``If-None-Match``.
+
+    Args:
+        header (Optional[str]): The header value.
+        etag (str): The current ETag.
+
+    Returns:
+        bool: True if the client's copy is current.
+    """
+    if header is None:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag.removeprefix("W/") for tag in header.split(","))
+
 
 class ContactService:
     def __init__(self, db: AsyncSession):
         self.repository = ContactRepository(db)
 
-    async def get_contacts(self, skip: int, limit: int):
+    async def get_contacts(
+            self,
+            skip: int,
+            limit: int,
+            user_id: int,
+            after_id: Optional[int] = None,
+            rows: bool = False,
+            fields: Optional[Sequence[str]] = None
+    ):
         """
         Get all contacts
 
         Args:
             skip (int): The number of contacts to skip.
             limit (int): The maximum number of contacts to return.
+            user_id (int): The user ID.
+            after_id (Optional[int]): Return only contacts after this ID instead of skipping.
+            rows (bool): Return plain rows for ``dump_contact_rows`` instead of ORM objects.
+            fields (Optional[Sequence[str]]): Select only these fields, as plain rows.
 
         Returns:
             List[Contact]: The list of contacts.
         """
-        return await self.repository.get_all(skip, limit)
+        return await self.repository.get_all(skip, limit, user_id, after_id, rows=rows, fields=fields)
 
-    async def get_contact(self, contact_id: int):
+    async def get_contact(self, contact_id: int, user_id: int, fields: Optional[Sequence[str]] = None):
         """
         Get a contact by ID
 
         Args:
             contact_id (int): The ID of the contact.
+            user_id (int): The user ID.
+            fields (Optional[Sequence[str]]): Select only these fields, as a plain row.
 
         Returns:
             Contact: The contact.
         """
-        return await self.repository.get_by_id(contact_id)
+        return await self.repository.get_by_id(contact_id, user_id, fields=fields)
 
-    async def create_contact(self, body: ContactCreate):
+    async def create_contact(self, body: ContactCreate, user_id: int):
         """
         Create a new contact.
 
         Args:
             body (ContactCreate): The contact data.
+            user_id (int): The user ID.
 
         Returns:
             Contact: The created contact.
         """
-        return await self.repository.create(body)
+        return await self.repository.create(body, user_id)
+
+    async def upsert_contacts(self, rows: List[Dict[str, Any]], user_id: int) -> List[ContactBulkResult]:
+        """
+        Create or update many contacts at once, matching existing ones by email.
+
+        Rows are validated one by one; valid rows are written in batches
+        within one transaction. An email already used by another user's
+        contact is reported as a conflict and left untouched.
+
+        Args:
+            rows (List[Dict[str, Any]]): Raw ``ContactCreate`` payloads.
+            user_id (int): The user ID.
+
+        Returns:
+            List[ContactBulkResult]: One result per input row, in input order.
+        """
+        results, candidates = validate_bulk_rows(rows, ContactCreate, ContactBulkResult)
 
-    async def update_contact(self, contact_id: int, body: ContactUpdate):
+        owners = await self.repository.get_email_owners(candidates)
+        for email, owner_id in owners.items():
+            if owner_id != user_id:
+                index, _ = candidates.pop(email)
+                results[index] = ContactBulkResult(index=index, email=email, status="conflict")
+
+        written = await self.repository.upsert_many(
+            [body.model_dump() for _, body in candidates.values()], user_id
+        )
+        ids = {contact.email: contact.id for contact in written}
+        for email, (index, _) in candidates.items():
+            if email not in ids:
+                results[index] = ContactBulkResult(index=index, email=email, status="conflict")
+            else:
+                status = "updated" if email in owners else "created"
+                results[index] = ContactBulkResult(index=index, email=email, status=status, id=ids[email])
+
+        return results
+
+    async def update_contact(
+            self,
+            contact_id: int,
+            body: Union[ContactCreate, ContactUpdate],
+            user_id: int,
+            versions: Optional[List[int]] = None
+    ):
         """
         Update a contact
 
         Args:
             contact_id (int): The ID of the contact.
-            body (ContactUpdate): The updated contact data.
+            body (Union[ContactCreate, ContactUpdate]): The full replacement or the changed fields.
+            user_id (int): The user ID.
+            versions (Optional[List[int]]): Only update if the current version is one of these.
 
         Returns:
             Contact: The updated contact.
+
+        Raises:
+            VersionConflictError: If the contact was modified in the meantime.
         """
-        return await self.repository.update(contact_id, body)
+        return await self.repository.update(contact_id, body, user_id, versions)
 
-    async def delete_contact(self, contact_id: int):
+    async def delete_contact(self, contact_id: int, user_id: int, versions: Optional[List[int]] = None):
         """
         Delete a contact
 
         Args:
             contact_id (int): The ID of the contact.
+            user_id (int): The user ID.
+            versions (Optional[List[int]]): Only delete if the current version is one of these.
 
         Returns:
             Contact: The deleted contact.
+
+        Raises:
+            VersionConflictError: If the contact was modified in the meantime.
         """
-        return await self.repository.delete(contact_id)
+        return await self.repository.delete(contact_id, user_id, versions)
 
-    async def search_contacts(self, query: str, skip: int, limit: int):
+    async def search_contacts(
+            self,
+            query: str,
+            skip: int,
+            limit: int,
+            user_id: int,
+            after_id: Optional[int] = None,
+            after_rank: Optional[int] = None,
+            rows: bool = False,
+            fields: Optional[Sequence[str]] = None
+    ):
         """
         Search for contacts
 
@@ -77,17 +305,57 @@ class ContactService:
             query (str): The search query.
             skip (int): The number of contacts to skip.
             limit (int): The maximum number of contacts to return.
+            user_id (int): The user ID.
+            after_id (Optional[int]): Return only contacts after this position instead of skipping.
+            after_rank (Optional[int]): Relevance tier of the position.
+            rows (bool): Return plain rows, ending with the relevance tier, instead of ORM objects.
+            fields (Optional[Sequence[str]]): Select only these fields, as plain rows.
 
         Returns:
             List[Contact]: The list of contacts.
         """
-        return await self.repository.search_contacts(query, skip, limit)
+        return await self.repository.search_contacts(
+            query, skip, limit, user_id, after_id, after_rank, rows=rows, fields=fields
+        )
 
-    async def get_upcoming_birthdays(self):
+    async def autocomplete(self, index: AutocompleteIndex, query: str, limit: int, user_id: int):
+        """
+        Suggest contacts whose name or email starts with the query.
+
+        Args:
+            index (AutocompleteIndex): The in-process prefix index to serve from.
+            query (str): The typed prefix.
+            limit (int): The maximum number of suggestions.
+            user_id (int): The user ID.
+
+        Returns:
+            List[dict]: The suggested contacts.
+        """
+        return await index.search(
+            user_id,
+            query,
+            limit,
+            lambda: self.repository.get_index_rows(user_id),
+            lambda: self.repository.get_prefix_matches(user_id, query, limit),
+        )
+
+    async def get_upcoming_birthdays(self, user_id: int, days: int = 7, digest: Optional[BirthdayDigest] = None):
         """
         Get a list of upcoming birthdays.
 
+        Served from the daily digest when it covers the requested window and
+        has been built, otherwise from the database.
+
+        Args:
+            user_id (int): The user ID.
+            days (int): How many days after today the window extends; today is always included.
+            digest (Optional[BirthdayDigest]): The precomputed daily digest.
+
         Returns:
             List[Contact]: The list of contacts with upcoming birthdays.
         """
-        return await self.repository.get_upcoming_birthdays()
\ No newline at end of file
+        if digest is not None and days == digest.days:
+            contacts = await digest.get(user_id)
+            if contacts is not None:
+                return contacts
+        return await self.repository.get_upcoming_birthdays(user_id, days)
@@ -0,0 +1,65 @@
+import csv
+import io
+import json
+from datetime import date
+from typing import AsyncIterator, Callable, List, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.conf.config import config
+from src.repository.contacts import EXPORT_COLUMNS, ContactRepository
+
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+"""Supported export formats and their media types."""
+
+FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+
+def _value(value):
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def _csv_chunk(rows: List[Tuple], header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(FIELDS)
+    writer.writerows([_value(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+def _ndjson_chunk(rows: List[Tuple]) -> str:
+    return "".join(
+        json.dumps(dict(zip(FIELDS, map(_value, row))), ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+
+async def export_contacts(
+        session_factory: Callable[[], AsyncSession],
+        user_id: int,
+        fmt: str,
+        chunk_size: int = config.EXPORT_CHUNK_SIZE
+) -> AsyncIterator[str]:
+    """
+    Stream a user's contacts serialised as CSV or NDJSON.
+
+    Opens its own database session, since the body is produced after the
+    request's session has been closed. Each chunk of rows read from the
+    cursor is serialised and yielded as soon as it arrives, so neither time
+    to first byte nor memory use depends on the number of contacts.
+
+    Args:
+        session_factory (Callable): Factory of database sessions.
+        user_id (int): The user ID.
+        fmt (str): ``"csv"`` or ``"ndjson"``.
+        chunk_size (int): Rows per chunk.
+
+    Yields:
+        str: Serialised chunks; for CSV the first one starts with the header row.
+    """
+    if fmt == "csv":
+        yield _csv_chunk([], header=True)
+    async with session_factory() as session:
+        async for rows in ContactRepository(session).stream_chunks(user_id, chunk_size):
+            yield _csv_chunk(rows) if fmt == "csv" else _ndjson_chunk(rows)
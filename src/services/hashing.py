@@ -0,0 +1,162 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional
+
+from src.conf.config import config
+
+
+class PoolSaturatedError(Exception):
+    """Raised when the hashing pool has no room left in its queue."""
+
+
+def _timed(fn: Callable, *args) -> tuple:
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+class HashingPool:
+    """
+    Bounded worker pool for CPU-heavy password hashing.
+
+    Jobs run in a thread or process pool so bcrypt never blocks the event
+    loop. At most ``workers + max_queue`` jobs are accepted at once; further
+    submissions fail fast with ``PoolSaturatedError``.
+    """
+
+    def __init__(
+            self,
+            kind: str = config.HASH_POOL_KIND,
+            workers: int = config.HASH_POOL_WORKERS,
+            max_queue: int = config.HASH_POOL_MAX_QUEUE,
+            initializer: Optional[Callable] = None,
+            initargs: tuple = (),
+    ):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown hashing pool kind: {kind}")
+        self.kind = kind
+        self.workers = workers
+        self.max_queue = max_queue
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.hash_seconds = 0.0
+        self.max_hash_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.initializer = initializer
+        self.initargs = initargs
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, initializer=self.initializer, initargs=self.initargs
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="hashing",
+                    initializer=self.initializer,
+                    initargs=self.initargs,
+                )
+        return self._executor
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """
+        Run a hashing function in the pool.
+
+        Args:
+            fn (Callable): A picklable function, e.g. ``get_password_hash``.
+            *args: Arguments for the function.
+
+        Returns:
+            Any: The function result.
+
+        Raises:
+            PoolSaturatedError: If the pool queue is full.
+        """
+        if self.pending >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise PoolSaturatedError("Password hashing pool is saturated")
+        return await self._execute(fn, *args)
+
+    async def map(self, fn: Callable, args_list: Iterable[tuple]) -> List[Any]:
+        """
+        Run a hashing function for many argument tuples in parallel.
+
+        Unlike ``run`` this never rejects: at most ``workers`` jobs of the
+        batch are submitted at a time, so the queue stays free for
+        interactive requests.
+
+        Args:
+            fn (Callable): A picklable function, e.g. ``get_password_hash``.
+            args_list (Iterable[tuple]): Argument tuples, one per call.
+
+        Returns:
+            List[Any]: The results in input order.
+        """
+        semaphore = asyncio.Semaphore(self.workers)
+
+        async def execute(args: tuple) -> Any:
+            async with semaphore:
+                return await self._execute(fn, *args)
+
+        return list(await asyncio.gather(*(execute(args) for args in args_list)))
+
+    async def _execute(self, fn: Callable, *args) -> Any:
+        self.pending += 1
+        submitted = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result, elapsed = await loop.run_in_executor(self._get_executor(), _timed, fn, *args)
+        finally:
+            self.pending -= 1
+
+        self.completed += 1
+        self.hash_seconds += elapsed
+        self.max_hash_seconds = max(self.max_hash_seconds, elapsed)
+        self.wait_seconds += time.perf_counter() - submitted - elapsed
+        return result
+
+    def stats(self) -> dict:
+        """
+        Snapshot of the pool metrics.
+
+        Returns:
+            dict: Queue depth, throughput and latency figures in milliseconds.
+        """
+        completed = self.completed or 1
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "in_flight": min(self.pending, self.workers),
+            "queue_depth": max(self.pending - self.workers, 0),
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_hash_ms": round(self.hash_seconds / completed * 1000, 3),
+            "max_hash_ms": round(self.max_hash_seconds * 1000, 3),
+            "avg_wait_ms": round(self.wait_seconds / completed * 1000, 3),
+        }
+
+    def set_initializer(self, initializer: Callable, initargs: tuple = ()):
+        """
+        Set a function run in every worker before its first job.
+
+        Workers that already exist are shut down, so the next job starts
+        fresh workers with the new initializer.
+
+        Args:
+            initializer (Callable): A picklable function.
+            initargs (tuple): Arguments for the initializer.
+        """
+        self.initializer = initializer
+        self.initargs = initargs
+        self.shutdown()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
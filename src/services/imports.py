@@ -0,0 +1,256 @@
+import asyncio
+import csv
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Callable, Dict, Iterator, Optional, TextIO
+
+from fastapi import UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.conf.config import config
+from src.services.cache import CacheService
+from src.services.contacts import ContactService
+from src.services.storage import read_chunks
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("csv", "vcard")
+MAX_REPORTED_ERRORS = 20
+
+
+def iter_csv_rows(file: TextIO) -> Iterator[dict]:
+    """
+    Parse contacts from a CSV file with a header row, one line at a time.
+
+    Columns are matched to ``ContactCreate`` fields by name; unknown columns
+    (such as the ``id`` and timestamps of an export) are ignored.
+
+    Args:
+        file (TextIO): The open file.
+
+    Yields:
+        dict: The raw field values of one contact.
+    """
+    for row in csv.DictReader(file):
+        yield {key.strip(): value for key, value in row.items() if key and value not in (None, "")}
+
+
+def _vcard_date(value: str) -> str:
+    value = value.strip()
+    if len(value) == 8 and value.isdigit():
+        return f"{value[:4]}-{value[4:6]}-{value[6:]}"
+    return value[:10]
+
+
+def _vcard_lines(file: TextIO) -> Iterator[str]:
+    line = None
+    for raw in file:
+        raw = raw.rstrip("\r\n")
+        if raw[:1] in (" ", "\t") and line is not None:
+            line += raw[1:]
+            continue
+        if line is not None:
+            yield line
+        line = raw
+    if line is not None:
+        yield line
+
+
+def iter_vcard_rows(file: TextIO) -> Iterator[dict]:
+    """
+    Parse contacts from a vCard (3.0/4.0) file, one card at a time.
+
+    ``N`` (or ``FN`` when ``N`` is absent), the first ``EMAIL`` and ``TEL``,
+    ``BDAY`` and ``NOTE`` are mapped to ``ContactCreate`` fields; folded
+    lines are unfolded.
+
+    Args:
+        file (TextIO): The open file.
+
+    Yields:
+        dict: The raw field values of one contact.
+    """
+    card = None
+    for line in _vcard_lines(file):
+        name, _, value = line.partition(":")
+        prop = name.split(";")[0].split(".")[-1].upper()
+        if prop == "BEGIN" and value.strip().upper() == "VCARD":
+            card = {}
+        elif card is None:
+            continue
+        elif prop == "END":
+            yield card
+            card = None
+        elif prop == "N":
+            parts = value.split(";")
+            card["last_name"] = parts[0].strip()
+            if len(parts) > 1:
+                card["first_name"] = parts[1].strip()
+        elif prop == "FN" and "first_name" not in card:
+            first, _, last = value.strip().partition(" ")
+            card.setdefault("first_name", first)
+            card.setdefault("last_name", last)
+        elif prop == "EMAIL":
+            card.setdefault("email", value.strip())
+        elif prop == "TEL":
+            card.setdefault("phone", value.strip())
+        elif prop == "BDAY":
+            card["birth_date"] = _vcard_date(value)
+        elif prop == "NOTE":
+            card["additional_data"] = value.replace("\\n", "\n").replace("\\,", ",").replace("\\;", ";")
+
+
+PARSERS = {"csv": iter_csv_rows, "vcard": iter_vcard_rows}
+
+
+class ImportJobs:
+    """
+    Background contact imports with their progress kept in Redis.
+
+    The upload is copied to a temporary file in chunks; a job then parses it
+    lazily, validates and upserts the rows ``chunk_size`` at a time, each
+    chunk in its own transaction, and publishes its counters after every
+    chunk so clients can poll them.
+    """
+
+    def __init__(
+            self,
+            cache_service: CacheService,
+            chunk_size: int = config.IMPORT_CHUNK_SIZE,
+            max_bytes: int = config.IMPORT_MAX_BYTES,
+    ):
+        self.cache_service = cache_service
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+        self.ttl = config.IMPORT_STATUS_TTL
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"import:{job_id}"
+
+    async def _publish(self, job_id: str, **fields):
+        key = self._key(job_id)
+        await self.cache_service.redis.hset(key, mapping={
+            name: json.dumps(value) for name, value in fields.items()
+        })
+        await self.cache_service.redis.expire(key, self.ttl)
+
+    async def spool(self, file: UploadFile) -> str:
+        """
+        Copy an upload to a temporary file without holding it in memory.
+
+        Args:
+            file (UploadFile): The uploaded file.
+
+        Returns:
+            str: The path of the copy; the job deletes it when done.
+
+        Raises:
+            FileTooLargeError: If the upload exceeds the size limit.
+        """
+        fd, path = tempfile.mkstemp(prefix="contacts-import-")
+        try:
+            with os.fdopen(fd, "wb") as target:
+                async for chunk in read_chunks(file, self.max_bytes, config.UPLOAD_CHUNK_SIZE):
+                    await asyncio.to_thread(target.write, chunk)
+        except BaseException:
+            os.remove(path)
+            raise
+        return path
+
+    async def create(self, user_id: int, fmt: str, filename: Optional[str]) -> str:
+        """
+        Register a new queued import job.
+
+        Args:
+            user_id (int): The owner of the imported contacts.
+            fmt (str): ``"csv"`` or ``"vcard"``.
+            filename (Optional[str]): The name of the uploaded file.
+
+        Returns:
+            str: The job ID.
+        """
+        job_id = uuid.uuid4().hex
+        await self._publish(
+            job_id, id=job_id, user_id=user_id, format=fmt, filename=filename, status="queued",
+            processed=0, created=0, updated=0, rejected=0, rows_per_second=0.0, errors=[],
+            started_at=None, finished_at=None,
+        )
+        return job_id
+
+    async def get(self, job_id: str, user_id: int) -> Optional[Dict]:
+        """
+        Get the progress of a user's import job.
+
+        Args:
+            job_id (str): The job ID.
+            user_id (int): The user ID.
+
+        Returns:
+            Optional[Dict]: The job status, or None if there is no such job for this user.
+        """
+        fields = await self.cache_service.redis.hgetall(self._key(job_id))
+        job = {name: json.loads(value) for name, value in fields.items()}
+        if job.get("user_id") != user_id:
+            return None
+        return job
+
+    async def run(
+            self,
+            job_id: str,
+            path: str,
+            fmt: str,
+            user_id: int,
+            session_factory: Callable[[], AsyncSession]
+    ):
+        """
+        Parse and import a spooled file, publishing progress after every chunk.
+
+        Args:
+            job_id (str): The job ID.
+            path (str): The spooled file, deleted when the job ends.
+            fmt (str): ``"csv"`` or ``"vcard"``.
+            user_id (int): The owner of the imported contacts.
+            session_factory (Callable): Factory of database sessions.
+        """
+        started = time.perf_counter()
+        counters = {"processed": 0, "created": 0, "updated": 0, "rejected": 0}
+        errors = []
+        try:
+            await self._publish(job_id, status="running", started_at=datetime.now(timezone.utc).isoformat())
+            with open(path, encoding="utf-8-sig", newline="" if fmt == "csv" else None) as file:
+                rows = PARSERS[fmt](file)
+                while chunk := await asyncio.to_thread(lambda: list(islice(rows, self.chunk_size))):
+                    async with session_factory() as session:
+                        results = await ContactService(session).upsert_contacts(chunk, user_id)
+                    for result in results:
+                        if result.status in ("created", "updated"):
+                            counters[result.status] += 1
+                            continue
+                        counters["rejected"] += 1
+                        if len(errors) < MAX_REPORTED_ERRORS:
+                            detail = f": {result.detail}" if result.detail else ""
+                            errors.append(f"row {counters['processed'] + result.index + 1}: {result.status}{detail}")
+                    counters["processed"] += len(chunk)
+                    await self._publish(
+                        job_id, **counters, errors=errors,
+                        rows_per_second=round(counters["processed"] / (time.perf_counter() - started), 1),
+                    )
+            status = "done"
+        except Exception as e:
+            logger.error("Contact import %s failed: %s", job_id, e)
+            errors.append(f"import failed after {counters['processed']} rows: {e}")
+            status = "failed"
+        finally:
+            os.remove(path)
+        await self._publish(
+            job_id, status=status, errors=errors[:MAX_REPORTED_ERRORS + 1],
+            rows_per_second=round(counters["processed"] / (time.perf_counter() - started), 1),
+            finished_at=datetime.now(timezone.utc).isoformat(),
+        )
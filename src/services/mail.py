@@ -0,0 +1,209 @@
+import asyncio
+import logging
+import smtplib
+from email.message import Message
+from typing import Callable, List, Optional
+
+from src.conf.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class Mailer:
+    """
+    Asynchronous mail delivery over a pool of authenticated SMTP connections.
+
+    Messages are queued and picked up by ``pool_size`` workers. Each worker
+    keeps its own connection open, so the STARTTLS handshake and login are
+    paid once per connection rather than once per message, and it sends up
+    to ``batch_size`` queued messages per trip to the worker thread. Failed
+    messages are re-queued with exponential backoff until ``max_retries``
+    is reached.
+    """
+
+    def __init__(
+            self,
+            host: str = config.SMTP_HOST,
+            port: int = config.SMTP_PORT,
+            username: Optional[str] = config.SMTP_USERNAME,
+            password: Optional[str] = config.SMTP_PASSWORD,
+            starttls: bool = config.SMTP_STARTTLS,
+            pool_size: int = config.MAIL_POOL_SIZE,
+            batch_size: int = config.MAIL_BATCH_SIZE,
+            max_retries: int = config.MAIL_MAX_RETRIES,
+            retry_delay: float = config.MAIL_RETRY_DELAY,
+            idle_timeout: float = config.MAIL_IDLE_TIMEOUT,
+            connection_factory: Callable[[str, int], smtplib.SMTP] = smtplib.SMTP,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.idle_timeout = idle_timeout
+        self.connection_factory = connection_factory
+        self.queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._retries: set = set()
+        self.counters = {"sent": 0, "failed": 0, "retried": 0, "connections": 0}
+
+    async def start(self):
+        if self._workers:
+            return
+        self.queue = asyncio.Queue()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.pool_size)]
+
+    async def stop(self, timeout: float = 10):
+        """
+        Wait for queued messages to be delivered and stop the workers.
+
+        Args:
+            timeout (float): Seconds to wait for the queue to drain.
+        """
+        if not self._workers:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Mail queue not drained, %d messages dropped", self.queue.qsize())
+        for task in [*self._workers, *self._retries]:
+            task.cancel()
+        await asyncio.gather(*self._workers, *self._retries, return_exceptions=True)
+        self._workers = []
+        self._retries = set()
+
+    async def send(self, message: Message):
+        """
+        Queue a message for delivery.
+
+        Args:
+            message (Message): The message with From and To headers set.
+        """
+        await self.start()
+        await self.queue.put((message, 0))
+
+    def _connect(self) -> smtplib.SMTP:
+        server = self.connection_factory(self.host, self.port)
+        try:
+            if self.starttls:
+                server.starttls()
+            if self.username:
+                server.login(self.username, self.password)
+        except BaseException:
+            server.close()
+            raise
+        self.counters["connections"] += 1
+        return server
+
+    @staticmethod
+    def _close(server: smtplib.SMTP):
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def _send_batch(self, server: Optional[smtplib.SMTP], batch: list) -> tuple:
+        """Deliver a batch on one connection; runs in a worker thread.
+
+        Returns the connection to keep and the failed messages as
+        ``(message, attempt, permanent)``; permanent failures are not retried.
+        """
+        failed = []
+        for message, attempt in batch:
+            try:
+                if server is None:
+                    server = self._connect()
+                server.send_message(message)
+            except (smtplib.SMTPServerDisconnected, OSError) as e:
+                logger.warning("SMTP connection lost: %s", e)
+                if server is not None:
+                    server.close()
+                server = None
+                failed.append((message, attempt, False))
+            except smtplib.SMTPException as e:
+                logger.warning("Failed to send email to %s: %s", message["To"], e)
+                failed.append((message, attempt, False))
+            except Exception as e:
+                # Not a delivery problem (a malformed header and the like):
+                # retrying cannot help, and the connection may be mid-command.
+                logger.error("Cannot send email to %s: %r", message["To"], e)
+                if server is not None:
+                    server.close()
+                server = None
+                failed.append((message, attempt, True))
+        return server, failed
+
+    async def _worker(self):
+        server = None
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), self.idle_timeout if server else None)
+                except asyncio.TimeoutError:
+                    await asyncio.to_thread(self._close, server)
+                    server = None
+                    continue
+
+                batch = [item]
+                while len(batch) < self.batch_size and not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+
+                try:
+                    server, failed = await asyncio.to_thread(self._send_batch, server, batch)
+                except asyncio.CancelledError:
+                    for _ in batch:
+                        self.queue.task_done()
+                    raise
+
+                self.counters["sent"] += len(batch) - len(failed)
+                for _ in range(len(batch) - len(failed)):
+                    self.queue.task_done()
+                for message, attempt, permanent in failed:
+                    self._retry(message, attempt, permanent)
+        finally:
+            if server is not None:
+                server.close()
+
+    def _retry(self, message: Message, attempt: int, permanent: bool = False):
+        """Schedule a failed message for another attempt.
+
+        The queue item is only marked done once the message is back in the
+        queue, so ``stop`` keeps waiting for messages that are backing off.
+        """
+        if permanent:
+            self.counters["failed"] += 1
+            self.queue.task_done()
+            return
+        if attempt >= self.max_retries:
+            self.counters["failed"] += 1
+            logger.error("Giving up on email to %s after %d attempts", message["To"], attempt + 1)
+            self.queue.task_done()
+            return
+        self.counters["retried"] += 1
+        task = asyncio.create_task(self._requeue(message, attempt + 1))
+        self._retries.add(task)
+        task.add_done_callback(self._retries.discard)
+
+    async def _requeue(self, message: Message, attempt: int):
+        try:
+            await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+            self.queue.put_nowait((message, attempt))
+        finally:
+            self.queue.task_done()
+
+    def stats(self) -> dict:
+        """
+        Snapshot of the mailer counters.
+
+        Returns:
+            dict: Delivery counters and the current queue size.
+        """
+        return {
+            **self.counters,
+            "queued": self.queue.qsize() if self.queue else 0,
+            "retrying": len(self._retries),
+        }
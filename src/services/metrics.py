@@ -0,0 +1,24 @@
+from typing import Callable, Dict
+
+_sources: Dict[str, Callable[[], dict]] = {}
+
+
+def register(name: str, source: Callable[[], dict]):
+    """
+    Register a metrics source.
+
+    Args:
+        name (str): The section name in the metrics output.
+        source (Callable): A function returning a snapshot dict.
+    """
+    _sources[name] = source
+
+
+def collect() -> dict:
+    """
+    Collect a snapshot from every registered source.
+
+    Returns:
+        dict: Metrics grouped by source name.
+    """
+    return {name: source() for name, source in _sources.items()}
@@ -0,0 +1,187 @@
+import time
+from typing import List, Optional, Tuple
+
+from fastapi import Request
+from redis.exceptions import RedisError
+
+from src.conf.config import config
+from src.services.cache import CacheService, TTLCache
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Token buckets checked and consumed together: either every bucket has a
+# token and one is taken from each, or nothing is consumed and the longest
+# wait is returned. KEYS are the buckets, ARGV holds capacity and refill
+# rate (tokens per second) for each of them.
+TOKEN_BUCKET_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local tokens = {}
+local retry_after = 0
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2 - 1])
+    local rate = tonumber(ARGV[i * 2])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local available = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    available = math.min(capacity, available + math.max(0, now - ts) * rate)
+    tokens[i] = available
+    if available < 1 then
+        retry_after = math.max(retry_after, (1 - available) / rate)
+    end
+end
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2 - 1])
+    local rate = tonumber(ARGV[i * 2])
+    local available = tokens[i]
+    if retry_after == 0 then
+        available = available - 1
+    end
+    redis.call('HSET', key, 'tokens', tostring(available), 'ts', tostring(now))
+    redis.call('EXPIRE', key, math.ceil(capacity / rate) + 1)
+end
+return tostring(retry_after)
+"""
+
+
+def client_ip(request: Request) -> str:
+    """
+    Get the address a request came from.
+
+    Args:
+        request (Request): The request.
+
+    Returns:
+        str: The client host, or ``"unknown"`` if the server does not know it.
+    """
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request is over its rate limit."""
+
+    def __init__(self, retry_after: float):
+        super().__init__("Too many requests")
+        self.retry_after = retry_after
+
+
+def parse_rate(rate: str) -> Tuple[int, float]:
+    """
+    Parse a rate such as ``"5/minute"``.
+
+    Args:
+        rate (str): Number of requests per ``second``, ``minute``, ``hour`` or ``day``.
+
+    Returns:
+        Tuple[int, float]: The bucket capacity and the refill rate in tokens per second.
+    """
+    count, period = rate.split("/")
+    capacity = int(count)
+    return capacity, capacity / PERIODS[period.strip()]
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiter backed by Redis.
+
+    Buckets live in Redis and are updated atomically by a Lua script, so
+    limits hold across workers. When Redis is unreachable the limiter keeps
+    going with per-process buckets.
+    """
+
+    def __init__(self, cache_service: CacheService, enabled: bool = config.RATE_LIMIT_ENABLED):
+        self.cache_service = cache_service
+        self.enabled = enabled
+        self.script = cache_service.redis.register_script(TOKEN_BUCKET_SCRIPT)
+        self.local = TTLCache(maxsize=100000, ttl=PERIODS["day"])
+        self.counters = {"allowed": 0, "limited": 0, "fallback": 0}
+
+    def _hit_local(self, buckets: List[Tuple[str, int, float]]) -> float:
+        now = time.monotonic()
+        states = []
+        retry_after = 0.0
+        for key, capacity, rate in buckets:
+            tokens, ts = self.local.get(key) or (capacity, now)
+            tokens = min(capacity, tokens + (now - ts) * rate)
+            states.append(tokens)
+            if tokens < 1:
+                retry_after = max(retry_after, (1 - tokens) / rate)
+        for (key, capacity, rate), tokens in zip(buckets, states):
+            if not retry_after:
+                tokens -= 1
+            self.local.set(key, (tokens, now), ttl=capacity / rate + 1)
+        return retry_after
+
+    async def hit(self, buckets: List[Tuple[str, str]]):
+        """
+        Take one token from every bucket, or none if any of them is empty.
+
+        Args:
+            buckets (List[Tuple[str, str]]): Pairs of bucket key and rate such as ``"5/minute"``.
+
+        Raises:
+            RateLimitExceeded: If any bucket is empty.
+        """
+        if not self.enabled:
+            return
+        parsed = [(f"ratelimit:{key}", *parse_rate(rate)) for key, rate in buckets]
+        args = [value for _, capacity, rate in parsed for value in (capacity, rate)]
+        try:
+            retry_after = float(await self.script(keys=[key for key, _, _ in parsed], args=args))
+        except RedisError:
+            self.counters["fallback"] += 1
+            retry_after = self._hit_local(parsed)
+
+        if retry_after > 0:
+            self.counters["limited"] += 1
+            raise RateLimitExceeded(retry_after)
+        self.counters["allowed"] += 1
+
+    async def check_email(self, scope: str, email: str, client: Optional[str] = None):
+        """
+        Apply the per-email limit of an endpoint.
+
+        With ``client``, the bucket is per email and client IP. Then nobody
+        can lock a victim out by exhausting the victim's bucket from another
+        address. The trade-off is that guessing one account's password from
+        many addresses is only bounded by the per-IP and global limits.
+
+        Args:
+            scope (str): The endpoint name.
+            email (str): The email the request is about.
+            client (Optional[str]): The client IP, to key the bucket on it too.
+
+        Raises:
+            RateLimitExceeded: If the limit is exceeded.
+        """
+        key = f"{scope}:email:{email.strip().lower()}"
+        if client is not None:
+            key = f"{key}:ip:{client}"
+        await self.hit([(key, config.RATE_LIMIT_EMAIL)])
+
+    def limit(self, scope: str):
+        """
+        Build a dependency applying the per-IP and global limits of an endpoint.
+
+        Args:
+            scope (str): The endpoint name.
+
+        Returns:
+            Callable: The FastAPI dependency.
+        """
+        async def dependency(request: Request):
+            await self.hit([
+                (f"{scope}:ip:{client_ip(request)}", config.RATE_LIMIT_IP),
+                (f"{scope}:global", config.RATE_LIMIT_GLOBAL),
+            ])
+
+        return dependency
+
+    def stats(self) -> dict:
+        """
+        Snapshot of the limiter counters.
+
+        Returns:
+            dict: Allowed, limited and fallback counters.
+        """
+        return dict(self.counters)
@@ -0,0 +1,91 @@
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from redis.exceptions import RedisError
+
+from src.conf.config import config
+from src.services.cache import CacheService
+from src.services.contacts import query_digest
+
+
+class ResponseCache:
+    """
+    Per-user cache of serialised contact read responses.
+
+    Entries are keyed by user, collection generation, endpoint and a digest
+    of the normalised query parameters. The generation is the user's
+    collection version, which every contact write bumps, so entries written
+    before a write are simply never looked up again and expire on their own;
+    nothing has to be deleted or scanned. Because a key can never go stale,
+    entries are also kept in the in-process tier of ``CacheService``.
+    Only bodies rendered from the primary database are stored.
+    """
+
+    def __init__(self, cache_service: CacheService, ttl: int = config.RESPONSE_CACHE_TTL):
+        self.cache_service = cache_service
+        self.ttl = ttl
+        self.counters = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def _key(user_id: int, generation: str, endpoint: str, params: Dict[str, Any]) -> str:
+        return f"responses:{user_id}:{generation}:{endpoint}:{query_digest(params)}"
+
+    async def get(self, user_id: int, generation: str, endpoint: str, params: Dict[str, Any]) -> Optional[str]:
+        """
+        Get a cached response body without rendering it on a miss.
+
+        Used for reads served by a replica, whose rendering may lag behind
+        the generation and so must not be stored under it.
+
+        Args:
+            user_id (int): The user ID.
+            generation (str): The user's current collection version.
+            endpoint (str): The name of the endpoint.
+            params (Dict[str, Any]): The query parameters that select the response.
+
+        Returns:
+            Optional[str]: The response body, or None if it is not cached.
+        """
+        try:
+            body = await self.cache_service.get(self._key(user_id, generation, endpoint, params))
+        except RedisError:
+            body = None
+        self.counters["misses" if body is None else "hits"] += 1
+        return body
+
+    async def get_or_load(
+            self,
+            user_id: int,
+            generation: str,
+            endpoint: str,
+            params: Dict[str, Any],
+            loader: Callable[[], Awaitable[str]]
+    ) -> str:
+        """
+        Get a cached response body, rendering it with ``loader`` on a miss.
+
+        Args:
+            user_id (int): The user ID.
+            generation (str): The user's current collection version.
+            endpoint (str): The name of the endpoint.
+            params (Dict[str, Any]): The query parameters that select the response.
+            loader (Callable): Coroutine function rendering the response body.
+
+        Returns:
+            str: The response body.
+        """
+        loaded = False
+
+        async def load():
+            nonlocal loaded
+            loaded = True
+            return await loader()
+
+        body = await self.cache_service.get_or_load(
+            self._key(user_id, generation, endpoint, params), load, ex=self.ttl, local_ttl=self.ttl
+        )
+        self.counters["misses" if loaded else "hits"] += 1
+        return body
+
+    def stats(self) -> dict:
+        requests = self.counters["hits"] + self.counters["misses"]
+        return {**self.counters, "hit_ratio": round(self.counters["hits"] / requests, 3) if requests else 0.0}
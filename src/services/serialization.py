@@ -0,0 +1,120 @@
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from typing_extensions import TypedDict
+
+from src.schemas.contact import ContactResponse, ContactRow
+
+CONTACT_FIELDS = tuple(ContactResponse.model_fields)
+"""``ContactResponse`` field names, in the order of ``RESPONSE_COLUMNS``."""
+
+
+def parse_fields(value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a ``fields=`` query parameter into a normalised field list.
+
+    Args:
+        value (Optional[str]): Comma-separated ``ContactResponse`` field names.
+
+    Returns:
+        Optional[Tuple[str, ...]]: The requested fields in ``ContactResponse`` order, or None for all fields.
+
+    Raises:
+        ValueError: If a field is unknown or none is given.
+    """
+    if value is None:
+        return None
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    if not requested:
+        raise ValueError("No fields requested")
+    unknown = requested - set(CONTACT_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}; allowed: {', '.join(CONTACT_FIELDS)}")
+    fields = tuple(name for name in CONTACT_FIELDS if name in requested)
+    return None if fields == CONTACT_FIELDS else fields
+
+
+@lru_cache(maxsize=256)
+def contact_rows_adapter(fields: Tuple[str, ...] = CONTACT_FIELDS) -> TypeAdapter:
+    """
+    Get the bulk validator of rows projected to some ``ContactRow`` fields.
+
+    The projected row types are created on first use and cached, since
+    building a pydantic validator costs far more than using one.
+
+    Args:
+        fields (Tuple[str, ...]): The fields, in ``ContactResponse`` order.
+
+    Returns:
+        TypeAdapter: A validator of ``List`` of the projected row type.
+    """
+    if fields == CONTACT_FIELDS:
+        return TypeAdapter(List[ContactRow])
+    row = TypedDict(f"ContactRow_{'_'.join(fields)}", {name: ContactRow.__annotations__[name] for name in fields})
+    return TypeAdapter(List[row])
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode a value as JSON the way pydantic's ``dump_json`` does.
+
+    Args:
+        content (Any): The value.
+
+    Returns:
+        bytes: Compact UTF-8 JSON; aware UTC datetimes end in ``Z``.
+    """
+    return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+def dump_contact_rows(rows: Iterable[Sequence], fields: Optional[Tuple[str, ...]] = None) -> bytes:
+    """
+    Encode plain contact rows as a ``List[ContactResponse]`` JSON array.
+
+    The rows come from database columns, so the whole list is validated in
+    one call against ``ContactRow``, which checks types but skips the email
+    and length validators that ``ContactResponse`` would run per object.
+    Extra trailing columns, such as a search rank, are ignored.
+
+    Args:
+        rows (Iterable[Sequence]): Rows of the ``response_columns`` of ``fields``.
+        fields (Optional[Tuple[str, ...]]): The fields of a sparse representation; None for all.
+
+    Returns:
+        bytes: The same bytes ``ContactResponse`` serialisation produces, restricted to ``fields``.
+    """
+    fields = fields or CONTACT_FIELDS
+    return dumps(contact_rows_adapter(fields).validate_python([dict(zip(fields, row)) for row in rows]))
+
+
+def dump_contact_row(row: Sequence, fields: Optional[Tuple[str, ...]] = None) -> bytes:
+    """
+    Encode one plain contact row as a ``ContactResponse`` JSON object.
+
+    Args:
+        row (Sequence): A row of the ``response_columns`` of ``fields``.
+        fields (Optional[Tuple[str, ...]]): The fields of a sparse representation; None for all.
+
+    Returns:
+        bytes: The encoded contact, restricted to ``fields``.
+    """
+    fields = fields or CONTACT_FIELDS
+    return dumps(contact_rows_adapter(fields).validate_python([dict(zip(fields, row))])[0])
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response encoded with orjson.
+
+    Content that is already encoded ``bytes`` is sent unchanged, so bodies
+    rendered ahead of time (for instance by the response cache) are not
+    decoded and encoded again.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
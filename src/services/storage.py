@@ -0,0 +1,146 @@
+import asyncio
+import os
+import re
+import tempfile
+import uuid
+from abc import ABC, abstractmethod
+from typing import AsyncIterator
+
+import cloudinary
+import cloudinary.uploader
+from fastapi import UploadFile
+
+from src.conf.config import config
+
+
+class FileTooLargeError(Exception):
+    """Raised when an uploaded file exceeds the size limit."""
+
+
+async def read_chunks(file: UploadFile, max_bytes: int, chunk_size: int) -> AsyncIterator[bytes]:
+    """
+    Read an uploaded file in chunks, enforcing a size limit.
+
+    Args:
+        file (UploadFile): The uploaded file.
+        max_bytes (int): The maximum allowed size.
+        chunk_size (int): The size of a single read.
+
+    Yields:
+        bytes: The next chunk of the file.
+
+    Raises:
+        FileTooLargeError: If the file is larger than ``max_bytes``.
+    """
+    total = 0
+    while chunk := await file.read(chunk_size):
+        total += len(chunk)
+        if total > max_bytes:
+            raise FileTooLargeError(f"File exceeds {max_bytes} bytes")
+        yield chunk
+
+
+def _suffix(filename: str) -> str:
+    suffix = os.path.splitext(filename or "")[1].lower()
+    return suffix if re.fullmatch(r"\.[a-z0-9]{1,10}", suffix) else ""
+
+
+class StorageBackend(ABC):
+    """
+    Base class for file storage backends.
+
+    ``save`` streams the upload off the event loop and returns once the
+    object is durably stored.
+    """
+
+    def __init__(self, max_bytes: int = config.AVATAR_MAX_BYTES, chunk_size: int = config.UPLOAD_CHUNK_SIZE):
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+
+    @abstractmethod
+    async def save(self, file: UploadFile, folder: str) -> str:
+        """
+        Store an uploaded file.
+
+        Args:
+            file (UploadFile): The uploaded file.
+            folder (str): The folder to store the file in.
+
+        Returns:
+            str: The public URL of the stored file.
+
+        Raises:
+            FileTooLargeError: If the file is larger than the size limit.
+        """
+
+
+class LocalStorage(StorageBackend):
+    """Stores files on the local filesystem, e.g. for load tests without network."""
+
+    def __init__(self, root: str = config.LOCAL_STORAGE_DIR, base_url: str = config.LOCAL_STORAGE_URL, **kwargs):
+        super().__init__(**kwargs)
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+
+    async def save(self, file: UploadFile, folder: str) -> str:
+        directory = os.path.join(self.root, folder)
+        await asyncio.to_thread(os.makedirs, directory, exist_ok=True)
+        name = f"{uuid.uuid4().hex}{_suffix(file.filename)}"
+        path = os.path.join(directory, name)
+
+        fd, tmp_path = await asyncio.to_thread(tempfile.mkstemp, dir=directory, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                async for chunk in read_chunks(file, self.max_bytes, self.chunk_size):
+                    await asyncio.to_thread(out.write, chunk)
+                await asyncio.to_thread(out.flush)
+                await asyncio.to_thread(os.fsync, out.fileno())
+            await asyncio.to_thread(os.replace, tmp_path, path)
+        except BaseException:
+            await asyncio.to_thread(_remove, tmp_path)
+            raise
+
+        return f"{self.base_url}/{folder}/{name}"
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class CloudinaryStorage(StorageBackend):
+    """Uploads files to Cloudinary."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        cloudinary.config(
+            cloud_name=config.CLOUDINARY_CLOUD_NAME,
+            api_key=config.CLOUDINARY_API_KEY,
+            api_secret=config.CLOUDINARY_API_SECRET
+        )
+
+    async def save(self, file: UploadFile, folder: str) -> str:
+        with tempfile.SpooledTemporaryFile(max_size=self.chunk_size * 16) as spool:
+            async for chunk in read_chunks(file, self.max_bytes, self.chunk_size):
+                await asyncio.to_thread(spool.write, chunk)
+            spool.seek(0)
+            result = await asyncio.to_thread(cloudinary.uploader.upload, spool, folder=folder)
+        return result["secure_url"]
+
+
+def get_storage() -> StorageBackend:
+    """
+    Create the storage backend selected by ``STORAGE_BACKEND``.
+
+    Returns:
+        StorageBackend: The configured backend.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    backends = {"cloudinary": CloudinaryStorage, "local": LocalStorage}
+    if config.STORAGE_BACKEND not in backends:
+        raise ValueError(f"Unknown storage backend: {config.STORAGE_BACKEND}")
+    return backends[config.STORAGE_BACKEND]()
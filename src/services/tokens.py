@@ -0,0 +1,111 @@
+import secrets
+from typing import Tuple
+
+from jose import JWTError
+
+from src.conf.config import config
+from src.services.auth import create_access_token, decode_token
+from src.services.cache import CacheService
+
+
+class InvalidRefreshTokenError(Exception):
+    """Raised when a refresh token is invalid, revoked or reused."""
+
+
+class RefreshTokenStore:
+    """
+    Rotating refresh tokens tracked in Redis.
+
+    Each login starts a token family that stores the id (``jti``) of the
+    only refresh token currently valid for it. Refreshing swaps in a new id
+    atomically; presenting an already rotated token revokes the whole
+    family. A per-user session version revokes every family at once, e.g.
+    after a password reset. Refreshing only touches Redis, never the
+    database or bcrypt.
+    """
+
+    def __init__(self, cache_service: CacheService):
+        self.cache_service = cache_service
+        self.ttl = config.REFRESH_TOKEN_EXPIRE_MINUTES * 60
+
+    @staticmethod
+    def _family_key(family_id: str) -> str:
+        return f"refresh_family:{family_id}"
+
+    @staticmethod
+    def _version_key(email: str) -> str:
+        return f"session_version:{email}"
+
+    async def _session_version(self, email: str) -> int:
+        return int(await self.cache_service.get(self._version_key(email)) or 0)
+
+    def _create_tokens(self, email: str, family_id: str, jti: str, version: int) -> Tuple[str, str]:
+        access_token = create_access_token(
+            data={"sub": email, "type": "access"},
+            expires_delta=config.ACCESS_TOKEN_EXPIRE_MINUTES
+        )
+        refresh_token = create_access_token(
+            data={"sub": email, "type": "refresh", "fid": family_id, "jti": jti, "ver": version},
+            expires_delta=config.REFRESH_TOKEN_EXPIRE_MINUTES
+        )
+        return access_token, refresh_token
+
+    async def issue(self, email: str) -> Tuple[str, str]:
+        """
+        Start a new token family for a user.
+
+        Args:
+            email (str): The user email.
+
+        Returns:
+            Tuple[str, str]: The access token and the refresh token.
+        """
+        family_id, jti = secrets.token_urlsafe(16), secrets.token_urlsafe(16)
+        version = await self._session_version(email)
+        await self.cache_service.set(self._family_key(family_id), jti, ex=self.ttl)
+        return self._create_tokens(email, family_id, jti, version)
+
+    async def rotate(self, refresh_token: str) -> Tuple[str, str]:
+        """
+        Exchange a refresh token for a new access and refresh token pair.
+
+        Args:
+            refresh_token (str): The current refresh token of the family.
+
+        Returns:
+            Tuple[str, str]: The new access token and refresh token.
+
+        Raises:
+            InvalidRefreshTokenError: If the token is invalid, expired, revoked or reused.
+        """
+        try:
+            payload = decode_token(refresh_token)
+        except JWTError:
+            raise InvalidRefreshTokenError("Invalid refresh token")
+
+        email, family_id, jti = payload.get("sub"), payload.get("fid"), payload.get("jti")
+        if payload.get("type") != "refresh" or not (email and family_id and jti):
+            raise InvalidRefreshTokenError("Invalid refresh token")
+
+        if payload.get("ver") != await self._session_version(email):
+            await self.cache_service.delete(self._family_key(family_id))
+            raise InvalidRefreshTokenError("Session has been revoked")
+
+        new_jti = secrets.token_urlsafe(16)
+        current = await self.cache_service.swap(self._family_key(family_id), new_jti, ex=self.ttl)
+        if current is None:
+            raise InvalidRefreshTokenError("Session has been revoked")
+        if current != jti:
+            await self.cache_service.delete(self._family_key(family_id))
+            raise InvalidRefreshTokenError("Refresh token reuse detected")
+
+        return self._create_tokens(email, family_id, new_jti, payload["ver"])
+
+    async def revoke_all(self, email: str):
+        """
+        Revoke every token family of a user.
+
+        Args:
+            email (str): The user email.
+        """
+        await self.cache_service.incr(self._version_key(email))
@@ -0,0 +1,127 @@
+import json
+from typing import Any, Dict, List, Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.conf.config import config
+from src.database.models import User, Role
+from src.repository.users import UserRepository
+from src.schemas.user import BulkUserResult, UserCreate
+from src.services.auth import get_password_hash, hashing_pool
+from src.services.bulk import validate_bulk_rows
+from src.services.cache import CacheService
+
+
+class UserCache:
+    """
+    Read-through cache of authenticated users keyed by the token subject.
+
+    Lookups go through the two tiers of ``CacheService`` and only reach the
+    database on a full miss. The password hash is never cached.
+    """
+
+    def __init__(self, cache_service: CacheService):
+        self.cache_service = cache_service
+
+    @staticmethod
+    def _key(email: str) -> str:
+        return f"user:{email}"
+
+    @staticmethod
+    def _to_dict(user: User) -> dict:
+        return {
+            "id": user.id,
+            "username": user.username,
+            "email": user.email,
+            "avatar": user.avatar,
+            "confirmed": user.confirmed,
+            "role": user.role.value if user.role else Role.USER.value,
+        }
+
+    @staticmethod
+    def _from_dict(data: dict) -> User:
+        return User(
+            id=data["id"],
+            username=data["username"],
+            email=data["email"],
+            avatar=data["avatar"],
+            confirmed=data["confirmed"],
+            role=Role(data["role"]),
+        )
+
+    async def get_user(self, email: str, db: AsyncSession) -> Optional[User]:
+        """
+        Get a user by email through the cache tiers.
+
+        Args:
+            email (str): The token subject.
+            db (AsyncSession): The database session used on a full miss.
+
+        Returns:
+            Optional[User]: A detached user, or None if the user does not exist.
+        """
+        async def load_user() -> Optional[str]:
+            user = await UserRepository(db).get_user_by_email(email)
+            return json.dumps(self._to_dict(user)) if user else None
+
+        cached = await self.cache_service.get_or_load(
+            self._key(email),
+            load_user,
+            ex=config.USER_CACHE_TTL,
+            local_ttl=config.USER_CACHE_LOCAL_TTL,
+        )
+        return self._from_dict(json.loads(cached)) if cached else None
+
+    async def invalidate(self, email: str):
+        """
+        Drop a cached user from both tiers.
+
+        Args:
+            email (str): The user email.
+        """
+        try:
+            await self.cache_service.delete(self._key(email))
+        except RedisError:
+            pass
+
+
+async def bulk_register_users(rows: List[Dict[str, Any]], db: AsyncSession) -> List[BulkUserResult]:
+    """
+    Register many users at once.
+
+    Rows are validated one by one, checked against existing users with a
+    single query, hashed in parallel in the hashing pool and inserted in
+    batches within one transaction. A row whose email was registered
+    concurrently, after the check, is skipped by the insert and reported
+    as existing too.
+
+    Args:
+        rows (List[Dict[str, Any]]): Raw ``UserCreate`` payloads.
+        db (AsyncSession): The database session.
+
+    Returns:
+        List[BulkUserResult]: One result per input row, in input order.
+    """
+    results, candidates = validate_bulk_rows(rows, UserCreate, BulkUserResult)
+
+    user_repo = UserRepository(db)
+    existing = await user_repo.get_existing_emails(candidates)
+    for email in existing:
+        index, _ = candidates.pop(email)
+        results[index] = BulkUserResult(index=index, email=email, status="exists")
+
+    pending = list(candidates.values())
+    hashes = await hashing_pool.map(get_password_hash, [(body.password,) for _, body in pending])
+    created = await user_repo.create_users([
+        {"username": body.username, "email": body.email, "password": hashed, "role": body.role}
+        for (_, body), hashed in zip(pending, hashes)
+    ])
+    ids = {row["email"]: row["id"] for row in created}
+    for index, body in pending:
+        if body.email in ids:
+            results[index] = BulkUserResult(index=index, email=body.email, status="created", id=ids[body.email])
+        else:
+            results[index] = BulkUserResult(index=index, email=body.email, status="exists")
+
+    return results
@@ -0,0 +1,142 @@
+import logging
+import time
+from typing import List, Optional, Set
+
+from redis.exceptions import RedisError
+
+from src.conf.config import config
+from src.services.cache import CacheService
+
+logger = logging.getLogger(__name__)
+
+# Bumps a collection version only if it exists; a missing one is recreated
+# from the clock on the next read, so it never goes back to an old value.
+BUMP_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('INCR', KEYS[1])
+end
+return false
+"""
+
+
+class CollectionVersions:
+    """
+    Per-user version counters of the contacts collection, kept in Redis.
+
+    Every committed contact write bumps the owner's counter through
+    ``bump``, which is registered as a ``ContactRepository`` write hook.
+    A counter is created from ``time.time_ns()``, so after Redis loses it
+    the new value is still greater than any value handed out before.
+
+    Alongside each counter value, the versions of single contacts that have
+    been read are remembered, so a conditional read of one contact can be
+    answered without a database query until the next write to the collection.
+
+    A counter that cannot be bumped is deleted instead, so the next read
+    starts a new generation. While even that fails, ``current`` raises for
+    every user until the pending deletes go through, so nothing is served
+    from caches tagged with a generation that missed a write.
+    """
+
+    def __init__(self, cache_service: CacheService, ttl: int = config.CONTACT_VERSIONS_TTL):
+        self.cache_service = cache_service
+        self.ttl = ttl
+        self.script = cache_service.redis.register_script(BUMP_SCRIPT)
+        self._unbumped: Set[int] = set()
+        self.counters = {"bumps": 0, "errors": 0, "resets": 0}
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"contacts_version:{user_id}"
+
+    @staticmethod
+    def _contacts_key(user_id: int, version: str) -> str:
+        return f"contact_versions:{user_id}:{version}"
+
+    async def current(self, user_id: int) -> str:
+        """
+        Get the version of a user's contacts collection, creating it if needed.
+
+        Read it before querying the contacts: a write racing with the query
+        then leaves the response tagged with the older version.
+
+        Args:
+            user_id (int): The user ID.
+
+        Returns:
+            str: The current version.
+
+        Raises:
+            RedisError: If Redis is unavailable or a missed bump cannot be reset yet.
+        """
+        redis = self.cache_service.redis
+        if self._unbumped:
+            pending = list(self._unbumped)
+            await redis.delete(*(self._key(uid) for uid in pending))
+            self._unbumped.difference_update(pending)
+            self.counters["resets"] += len(pending)
+        version = await redis.get(self._key(user_id))
+        if version is None:
+            await redis.set(self._key(user_id), time.time_ns(), nx=True)
+            version = await redis.get(self._key(user_id))
+        return version
+
+    async def bump(self, action: str, contacts: List):
+        """
+        Advance the owners' collection versions after contact writes, once per owner.
+
+        Args:
+            action (str): ``"create"``, ``"update"``, ``"upsert"`` or ``"delete"``.
+            contacts (List[Contact]): The written contacts.
+        """
+        for user_id in {contact.user_id for contact in contacts}:
+            try:
+                await self.script(keys=[self._key(user_id)])
+            except RedisError as e:
+                self.counters["errors"] += 1
+                logger.warning("Failed to bump contacts version of user %s: %s", user_id, e)
+                await self._reset(user_id)
+                continue
+            self.counters["bumps"] += 1
+
+    async def _reset(self, user_id: int):
+        try:
+            await self.cache_service.redis.delete(self._key(user_id))
+        except RedisError:
+            self._unbumped.add(user_id)
+            return
+        self.counters["resets"] += 1
+
+    async def contact_version(self, user_id: int, collection_version: str, contact_id: int) -> Optional[int]:
+        """
+        Get the remembered version of one contact at a collection version.
+
+        Args:
+            user_id (int): The user ID.
+            collection_version (str): The current collection version.
+            contact_id (int): The contact ID.
+
+        Returns:
+            Optional[int]: The contact's version, or None if it was not read since the last write.
+        """
+        version = await self.cache_service.redis.hget(self._contacts_key(user_id, collection_version), contact_id)
+        return int(version) if version is not None else None
+
+    async def remember(self, user_id: int, collection_version: str, contact_id: int, version: int):
+        """
+        Remember the version of a contact read at a collection version.
+
+        Args:
+            user_id (int): The user ID.
+            collection_version (str): The collection version read before the contact.
+            contact_id (int): The contact ID.
+            version (int): The contact's version.
+        """
+        key = self._contacts_key(user_id, collection_version)
+        async with self.cache_service.redis.pipeline(transaction=False) as pipe:
+            pipe.hset(key, contact_id, version)
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+
+    def stats(self) -> dict:
+        return dict(self.counters)
@@ -1,9 +1,15 @@
 import asyncio
+import uuid
+
 import pytest
 import pytest_asyncio
+from redis.exceptions import RedisError
 from sqlalchemy.pool import StaticPool
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from src.database.models import Base
+from src.services.birthdays import CORRECTION_SCRIPT
+from src.services.cache import CacheService
+from src.services.versions import BUMP_SCRIPT
 
 SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 
@@ -45,3 +51,123 @@ async def override_get_db():
 
     return get_db
 
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+        return queue
+
+    def __len__(self):
+        return len(self.calls)
+
+    async def execute(self):
+        calls, self.calls = self.calls, []
+        return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in calls]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeRedis:
+    """
+    In-memory stand-in for the Redis commands the services use.
+
+    Lua scripts are emulated in Python; the ``redis_service`` tests run the
+    real ones when a Redis server is available.
+    """
+
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def register_script(self, script):
+        emulations = {BUMP_SCRIPT: self._bump, CORRECTION_SCRIPT: self._correction}
+        return emulations[script]
+
+    async def _bump(self, keys, args=()):
+        if keys[0] not in self.data:
+            return None
+        self.data[keys[0]] = str(int(self.data[keys[0]]) + 1)
+        return int(self.data[keys[0]])
+
+    async def _correction(self, keys, args):
+        done, building, digest, dirty = keys
+        if building not in self.data and done not in self.data:
+            return 0
+        for i in range(1, len(args), 4):
+            op, field, value, member = args[i:i + 4]
+            if building in self.data:
+                self.data.setdefault(dirty, set()).add(member)
+            if op == "set":
+                self.data.setdefault(digest, {})[str(field)] = value
+            else:
+                self.data.get(digest, {}).pop(str(field), None)
+        return 1
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = str(value)
+        return True
+
+    async def exists(self, key):
+        return int(key in self.data)
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def expire(self, key, ttl):
+        return True
+
+    async def hset(self, key, field=None, value=None, mapping=None):
+        fields = self.data.setdefault(key, {})
+        if field is not None:
+            fields[str(field)] = str(value)
+        for name, item in (mapping or {}).items():
+            fields[str(name)] = str(item)
+
+    async def hget(self, key, field):
+        return self.data.get(key, {}).get(str(field))
+
+    async def hdel(self, key, field):
+        self.data.get(key, {}).pop(str(field), None)
+
+    async def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    async def smembers(self, key):
+        return set(self.data.get(key, set()))
+
+
+class FakeCacheService:
+    def __init__(self):
+        self.redis = FakeRedis()
+
+
+@pytest_asyncio.fixture
+async def redis_service():
+    """A ``CacheService`` on the configured Redis and a unique key prefix; skips without Redis."""
+    service = CacheService()
+    try:
+        await service.redis.ping()
+    except (RedisError, OSError):
+        pytest.skip("Redis is not available")
+    prefix = f"test:{uuid.uuid4().hex}"
+    yield service, prefix
+    keys = await service.redis.keys(f"*{prefix}*")
+    if keys:
+        await service.redis.delete(*keys)
@@ -1,9 +1,11 @@
 import pytest
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.repository.contacts import ContactRepository
+from src.repository.contacts import ContactRepository, VersionConflictError
 from src.schemas.contact import ContactCreate, ContactUpdate
 from src.database.models import Contact
 from datetime import date
+from tests.conftest import engine
 
 
 @pytest.mark.asyncio
@@ -95,3 +97,183 @@ async def test_delete_contact(async_session: AsyncSession):
 
     db_contact = await async_session.get(Contact, contact.id)
     assert db_contact is None
+
+
+@pytest.mark.asyncio
+async def test_get_all_keyset_pagination(async_session: AsyncSession):
+    repo = ContactRepository(async_session)
+    for i in range(5):
+        await repo.create(ContactCreate(
+            first_name=f"John{i}",
+            last_name="Doe",
+            email=f"john{i}@example.com",
+            phone="123-456-7890",
+            birth_date=date(1990, 1, 1),
+        ), user_id=1)
+
+    first_page = await repo.get_all(limit=3, user_id=1)
+    second_page = await repo.get_all(limit=3, user_id=1, after_id=first_page[-1].id)
+
+    assert [c.first_name for c in first_page] == ["John0", "John1", "John2"]
+    assert [c.first_name for c in second_page] == ["John3", "John4"]
+
+
+@pytest.mark.asyncio
+async def test_search_contacts_ranks_and_paginates(async_session: AsyncSession):
+    repo = ContactRepository(async_session)
+    people = [
+        ("Ann", "Johnson", "ann@example.com"),
+        ("John", "Doe", "jd@example.com"),
+        ("Mary", "Smith", "johnny@example.com"),
+        ("Johnny", "Walker", "walker@example.com"),
+        ("Peter", "Parker", "peter@example.com"),
+    ]
+    for first_name, last_name, email in people:
+        await repo.create(ContactCreate(
+            first_name=first_name,
+            last_name=last_name,
+            email=email,
+            phone="123-456-7890",
+            birth_date=date(1990, 1, 1),
+        ), user_id=1)
+    await repo.create(ContactCreate(
+        first_name="John", last_name="Other", email="other@example.com",
+        phone="1", birth_date=date(1990, 1, 1),
+    ), user_id=2)
+
+    results = await repo.search_contacts("JOHN", limit=10, user_id=1)
+    first_page = await repo.search_contacts("john", limit=2, user_id=1)
+    last = first_page[-1]
+    second_page = await repo.search_contacts(
+        "john", limit=2, user_id=1, after_id=last.id, after_rank=last.search_rank
+    )
+
+    assert [c.first_name for c in results] == ["Ann", "John", "Johnny", "Mary"]
+    assert [c.search_rank for c in results] == [0, 0, 0, 1]
+    assert [c.first_name for c in first_page + second_page] == ["Ann", "John", "Johnny", "Mary"]
+
+
+@pytest.mark.asyncio
+async def test_search_contacts_index_follows_updates_and_deletes(async_session: AsyncSession):
+    repo = ContactRepository(async_session)
+    contact = await repo.create(ContactCreate(
+        first_name="John", last_name="Doe", email="john@example.com",
+        phone="123-456-7890", birth_date=date(1990, 1, 1),
+    ), user_id=1)
+
+    await repo.update(contact.id, ContactUpdate(first_name="Jack", email="jack@example.com"), user_id=1)
+    assert await repo.search_contacts("john", user_id=1) == []
+    assert [c.id for c in await repo.search_contacts("jack", user_id=1)] == [contact.id]
+
+    await repo.delete(contact.id, user_id=1)
+    assert await repo.search_contacts("jack", user_id=1) == []
+
+
+@pytest.mark.asyncio
+async def test_search_contacts_escapes_wildcards(async_session: AsyncSession):
+    repo = ContactRepository(async_session)
+    await repo.create(ContactCreate(
+        first_name="John", last_name="Doe", email="john@example.com",
+        phone="123-456-7890", birth_date=date(1990, 1, 1),
+    ), user_id=1)
+
+    assert await repo.search_contacts("%", user_id=1) == []
+    assert await repo.search_contacts("j_", user_id=1) == []
+
+
+@pytest.mark.asyncio
+async def test_get_prefix_matches(async_session: AsyncSession):
+    repo = ContactRepository(async_session)
+    for first_name, last_name, email in [
+        ("Ann", "Johnson", "ann@example.com"),
+        ("Mary", "Smith", "johnny@example.com"),
+        ("Peter", "Bjohn", "peter@example.com"),
+    ]:
+        await repo.create(ContactCreate(
+            first_name=first_name, last_name=last_name, email=email,
+            phone="123-456-7890", birth_date=date(1990, 1, 1),
+        ), user_id=1)
+
+    assert [row[1] for row in await repo.get_prefix_matches(1, "john", 10)] == ["Ann", "Mary"]
+    assert [row[1] for row in await repo.get_prefix_matches(1, "ann j", 10)] == ["Ann"]
+    assert [row[1] for row in await repo.get_prefix_matches(1, "Pe", 10)] == ["Peter"]
+    assert await repo.get_prefix_matches(2, "john", 10) == []
+
+
+@pytest.mark.asyncio
+async def test_get_upcoming_birthdays_wraps_year_end(async_session: AsyncSession):
+    repo = ContactRepository(async_session)
+    for name, birth_date in [
+        ("Jan", date(1990, 1, 3)), ("Dec", date(1985, 12, 30)), ("Late", date(1980, 1, 20)),
+        ("Nov", date(1999, 11, 28)), ("Leap", date(2000, 2, 29)),
+    ]:
+        await repo.create(ContactCreate(
+            first_name=name, last_name="Doe", email=f"{name.lower()}@example.com",
+            phone="123-456-7890", birth_date=birth_date,
+        ), user_id=1)
+
+    new_year = await repo.get_upcoming_birthdays(user_id=1, days=7, today=date(2026, 12, 28))
+    month_end = await repo.get_upcoming_birthdays(user_id=1, days=3, today=date(2027, 2, 27))
+    whole_year = await repo.get_upcoming_birthdays(user_id=1, days=365, today=date(2026, 12, 28))
+
+    assert [c.first_name for c in new_year] == ["Dec", "Jan"]
+    assert [c.first_name for c in month_end] == ["Leap"]
+    assert [c.first_name for c in whole_year] == ["Dec", "Jan", "Late", "Leap", "Nov"]
+
+
+@pytest.mark.asyncio
+async def test_birth_md_follows_birth_date(async_session: AsyncSession):
+    repo = ContactRepository(async_session)
+    contact = await repo.create(ContactCreate(
+        first_name="John", last_name="Doe", email="john@example.com",
+        phone="123-456-7890", birth_date=date(1990, 3, 9),
+    ), user_id=1)
+    assert contact.birth_md == 309
+
+    contact = await repo.update(contact.id, ContactUpdate(birth_date=date(1990, 10, 21)), user_id=1)
+    assert contact.birth_md == 1021
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_are_single_statements_with_versions(async_session: AsyncSession):
+    repo = ContactRepository(async_session)
+    contact = await repo.create(ContactCreate(
+        first_name="John", last_name="Doe", email="john@example.com",
+        phone="123-456-7890", birth_date=date(1990, 1, 1), additional_data="note",
+    ), user_id=1)
+    assert contact.version == 1
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement.split()[0])
+    event.listen(engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        updated = await repo.update(contact.id, ContactUpdate(birth_date=date(1990, 5, 17)), user_id=1, versions=[1])
+        assert statements == ["UPDATE"]
+        with pytest.raises(VersionConflictError) as exc_info:
+            await repo.delete(contact.id, user_id=1, versions=[1])
+        deleted = await repo.delete(contact.id, user_id=1, versions=[2])
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", listener)
+
+    assert (updated.version, updated.birth_md, updated.additional_data) == (2, 517, "note")
+    assert exc_info.value.current_version == 2
+    assert deleted.id == contact.id
+    assert await repo.update(contact.id, ContactUpdate(first_name="Ghost"), user_id=1, versions=[2]) is None
+
+
+@pytest.mark.asyncio
+async def test_update_with_full_body_replaces_every_field(async_session: AsyncSession):
+    repo = ContactRepository(async_session)
+    contact = await repo.create(ContactCreate(
+        first_name="John", last_name="Doe", email="john@example.com",
+        phone="123-456-7890", birth_date=date(1990, 1, 1), additional_data="note",
+    ), user_id=1)
+
+    replaced = await repo.update(contact.id, ContactCreate(
+        first_name="Jack", last_name="Roe", email="jack@example.com",
+        phone="555", birth_date=date(1991, 2, 3),
+    ), user_id=1)
+    assert (replaced.first_name, replaced.additional_data, replaced.birth_md) == ("Jack", None, 203)
+
+    patched = await repo.update(contact.id, ContactUpdate(first_name=None, additional_data="again"), user_id=1)
+    assert (patched.first_name, patched.additional_data, patched.version) == ("Jack", "again", 3)
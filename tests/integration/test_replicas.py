@@ -0,0 +1,127 @@
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.api import contacts as contacts_api
+from src.api.auth import get_current_user
+from src.database.db import ReplicaRouter, get_db, get_session_factory
+from src.database.models import Base, Contact, Role, User
+from src.services.consistency import ReadYourWrites
+from src.services.versions import BUMP_SCRIPT
+from tests.conftest import FakeCacheService, FakeRedis
+
+
+async def make_database(path, first_name):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Contact), [{
+            "id": 1, "first_name": first_name, "last_name": "Doe", "email": f"{first_name.lower()}@example.com",
+            "phone": "123456789", "birth_date": date(1990, 1, 1), "birth_md": 101, "user_id": 1,
+        }])
+    return engine
+
+
+@pytest_asyncio.fixture
+async def databases(tmp_path):
+    primary = await make_database(tmp_path / "primary.db", "Primary")
+    replica = await make_database(tmp_path / "replica.db", "Replica")
+    broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    yield primary, replica, broken
+    for engine in (primary, replica, broken):
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_router_round_robins_and_skips_failed_replicas(databases):
+    primary, replica, broken = databases
+    router = ReplicaRouter([replica, broken], retry_after=60)
+    factory = async_sessionmaker(primary, class_=AsyncSession, expire_on_commit=False)
+
+    assert [router.pick() for _ in range(4)] == [replica, broken, replica, broken]
+
+    sessions = [await router.open_session(factory) for _ in range(3)]
+    assert all(session.bind is replica for session in sessions)
+    assert router.stats() == {
+        "replica_sessions": 3, "primary_fallbacks": 0, "failures": 1, "replicas": 2, "healthy": 1,
+    }
+    for session in sessions:
+        await session.close()
+
+
+@pytest.mark.asyncio
+async def test_router_falls_back_to_primary_and_retries(databases):
+    primary, _, broken = databases
+    router = ReplicaRouter([broken], retry_after=0)
+    factory = async_sessionmaker(primary, class_=AsyncSession, expire_on_commit=False)
+
+    assert await router.open_session(factory) is None
+    assert router.pick() is broken
+    assert router.stats()["primary_fallbacks"] == 1
+
+
+@pytest.fixture
+def client(databases, monkeypatch):
+    primary, replica, _ = databases
+    factory = async_sessionmaker(primary, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_db():
+        async with factory() as session:
+            yield session
+
+    monkeypatch.setattr(contacts_api, "replica_router", ReplicaRouter([replica]))
+    monkeypatch.setattr(contacts_api.read_your_writes, "cache_service", FakeCacheService())
+    app = FastAPI()
+    app.include_router(contacts_api.router)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: factory
+    app.dependency_overrides[get_current_user] = lambda: User(id=1, username="owner", email="owner@example.com", role=Role.USER)
+    contacts_api.autocomplete_index.clear()
+    with TestClient(app) as client:
+        yield client
+    contacts_api.autocomplete_index.clear()
+
+
+def test_reads_use_replica_until_the_user_writes(client):
+    assert client.get("/contacts/").json()[0]["first_name"] == "Replica"
+    assert client.get("/contacts/1").json()["first_name"] == "Replica"
+    assert client.get("/contacts/export", params={"format": "ndjson"}).text.count("Replica") == 1
+
+    client.patch("/contacts/1", json={"first_name": "Written"})
+
+    assert client.get("/contacts/").json()[0]["first_name"] == "Written"
+    assert client.get("/contacts/1").json()["first_name"] == "Written"
+
+
+def test_replica_reads_are_not_cached_or_tagged(client, monkeypatch):
+    from src.services.cache import CacheService
+
+    versions = FakeCacheService()
+    monkeypatch.setattr(contacts_api.collection_versions, "cache_service", versions)
+    monkeypatch.setattr(contacts_api.collection_versions, "script", versions.redis.register_script(BUMP_SCRIPT))
+    cache = CacheService()
+    cache.redis = FakeRedis()
+    monkeypatch.setattr(contacts_api.response_cache, "cache_service", cache)
+    sticky = contacts_api.read_your_writes.cache_service.redis.data
+
+    # The replica lags: it still has "Replica" where the primary has "Primary".
+    lagging = client.get("/contacts/")
+    assert lagging.json()[0]["first_name"] == "Replica"
+    assert "ETag" not in lagging.headers
+    client.get("/contacts/1")
+    assert not [key for key in versions.redis.data if key.startswith("contact_versions:")]
+
+    sticky["db_primary:1"] = 1
+    primary = client.get("/contacts/")
+    assert primary.json()[0]["first_name"] == "Primary"
+    assert "ETag" in primary.headers
+
+    del sticky["db_primary:1"]
+    cached = client.get("/contacts/")
+    assert cached.json()[0]["first_name"] == "Primary"
+    assert cached.headers["ETag"] == primary.headers["ETag"]
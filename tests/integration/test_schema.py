@@ -0,0 +1,86 @@
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert, inspect, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.database.models import Base, Contact
+from src.database.schema import upgrade_schema
+from src.repository.contacts import ContactRepository
+
+
+@pytest_asyncio.fixture
+async def old_database(tmp_path):
+    """A database created before the indexes, ``birth_md`` and ``version`` existed."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'old.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        for name in ("contacts_fts_ai", "contacts_fts_ad", "contacts_fts_au"):
+            await conn.execute(text(f"DROP TRIGGER {name}"))
+        await conn.execute(text("DROP TABLE contacts_fts"))
+        await conn.execute(insert(Contact), [{
+            "first_name": "Alice", "last_name": "Smith", "email": "alice@example.com",
+            "phone": "123456789", "birth_date": date(1990, 12, 30), "birth_md": 1230, "user_id": 1,
+        }])
+        await conn.execute(text("DROP INDEX ix_contacts_user_id_birth_md"))
+        await conn.execute(text("DROP INDEX ix_contacts_user_id_id"))
+        await conn.execute(text("ALTER TABLE contacts DROP COLUMN birth_md"))
+        await conn.execute(text("ALTER TABLE contacts DROP COLUMN version"))
+    yield engine
+    await engine.dispose()
+
+
+async def search(engine, query):
+    async with AsyncSession(engine) as session:
+        return [c.first_name for c in await ContactRepository(session).search_contacts(query, user_id=1)]
+
+
+@pytest.mark.asyncio
+async def test_upgrade_creates_and_fills_search_index(old_database):
+    assert await upgrade_schema(old_database) is True
+    assert await search(old_database, "smith") == ["Alice"]
+
+    assert await upgrade_schema(old_database) is True
+    async with old_database.begin() as conn:
+        await conn.execute(insert(Contact), [{
+            "first_name": "Bob", "last_name": "Smithson", "email": "bob@example.com",
+            "phone": "123456789", "birth_date": date(1990, 1, 1), "birth_md": 101, "user_id": 1,
+        }])
+    assert sorted(await search(old_database, "smith")) == ["Alice", "Bob"]
+
+
+@pytest.mark.asyncio
+async def test_upgrade_backfills_birth_md(old_database):
+    assert await upgrade_schema(old_database) is True
+
+    async with AsyncSession(old_database) as session:
+        contacts = await ContactRepository(session).get_upcoming_birthdays(user_id=1, days=7, today=date(2026, 12, 28))
+    assert [(c.first_name, c.birth_md) for c in contacts] == [("Alice", 1230)]
+
+
+@pytest.mark.asyncio
+async def test_upgrade_adds_version(old_database):
+    assert await upgrade_schema(old_database) is True
+
+    async with AsyncSession(old_database) as session:
+        contact = await ContactRepository(session).get_by_id(1, user_id=1)
+    assert (contact.first_name, contact.version) == ("Alice", 1)
+
+
+@pytest.mark.asyncio
+async def test_upgrade_creates_keyset_index(old_database):
+    assert await upgrade_schema(old_database) is True
+    assert await upgrade_schema(old_database) is True
+
+    async with old_database.connect() as conn:
+        indexes = await conn.run_sync(lambda sync: inspect(sync).get_indexes("contacts"))
+    assert {"ix_contacts_user_id_id", "ix_contacts_user_id_birth_md"} <= {index["name"] for index in indexes}
+
+
+@pytest.mark.asyncio
+async def test_upgrade_failure_is_reported(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'app.db'}")
+
+    assert await upgrade_schema(engine) is False
+    await engine.dispose()
@@ -1,9 +1,12 @@
 import pytest
+from unittest.mock import patch
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.database.models import User
 from src.repository.users import UserRepository
 from src.schemas.user import UserCreate
 from src.database.models import Role
+from src.services.auth import verify_password
+from src.services.users import bulk_register_users
 
 
 @pytest.mark.asyncio
@@ -47,3 +50,83 @@ async def test_get_user_by_email(async_session: AsyncSession):
     assert user is not None
     assert user.email == "test@example.com"
     assert user.username == "testuser"
+
+
+@pytest.mark.asyncio
+async def test_create_users_in_batches(async_session: AsyncSession):
+    repo = UserRepository(async_session)
+    rows = [
+        {"username": f"user{i}", "email": f"user{i}@example.com", "password": "hashed", "role": Role.USER}
+        for i in range(5)
+    ]
+
+    created = await repo.create_users(rows, batch_size=2)
+
+    assert [row["email"] for row in created] == [row["email"] for row in rows]
+    assert all(row["id"] is not None for row in created)
+    existing = await repo.get_existing_emails(["user1@example.com", "other@example.com"])
+    assert existing == {"user1@example.com"}
+
+
+@pytest.mark.asyncio
+async def test_bulk_register_users(async_session: AsyncSession):
+    repo = UserRepository(async_session)
+    await repo.create_user(
+        UserCreate(username="existing", email="existing@example.com", password="secure_password"),
+        hashed_password="hashed_password",
+    )
+    rows = [
+        {"username": "alice", "email": "alice@example.com", "password": "secure_password"},
+        {"username": "bob", "email": "not-an-email", "password": "secure_password"},
+        {"username": "alice2", "email": "alice@example.com", "password": "secure_password"},
+        {"username": "existing", "email": "existing@example.com", "password": "secure_password"},
+        {"username": "number", "email": 123, "password": "secure_password"},
+    ]
+
+    results = await bulk_register_users(rows, async_session)
+
+    assert [r.status for r in results] == ["created", "invalid", "duplicate", "exists", "invalid"]
+    assert results[4].email is None
+    assert results[0].id is not None
+    assert results[1].detail.startswith("email")
+    alice = await repo.get_user_by_email("alice@example.com")
+    assert verify_password("secure_password", alice.password)
+
+
+@pytest.mark.asyncio
+async def test_create_users_skips_registered_emails(async_session: AsyncSession):
+    repo = UserRepository(async_session)
+    await repo.create_user(
+        UserCreate(username="existing", email="existing@example.com", password="secure_password"),
+        hashed_password="hashed_password",
+    )
+    rows = [
+        {"username": "new", "email": "new@example.com", "password": "hashed", "role": Role.USER},
+        {"username": "existing", "email": "existing@example.com", "password": "hashed", "role": Role.USER},
+    ]
+
+    created = await repo.create_users(rows)
+
+    assert [row["email"] for row in created] == ["new@example.com"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_register_reports_concurrently_registered_email(async_session: AsyncSession):
+    repo = UserRepository(async_session)
+    rows = [
+        {"username": "alice", "email": "alice@example.com", "password": "secure_password"},
+        {"username": "racer", "email": "racer@example.com", "password": "secure_password"},
+    ]
+
+    async def registered_after_check(self, emails):
+        await repo.create_user(
+            UserCreate(username="racer", email="racer@example.com", password="secure_password"),
+            hashed_password="hashed_password",
+        )
+        return set()
+
+    with patch.object(UserRepository, "get_existing_emails", registered_after_check):
+        results = await bulk_register_users(rows, async_session)
+
+    assert [r.status for r in results] == ["created", "exists"]
+    assert results[1].id is None
@@ -0,0 +1,282 @@
+import csv
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.auth import get_current_user
+from src.api.contacts import router, autocomplete_index, collection_versions, import_jobs, response_cache
+from src.database.db import get_db, get_session_factory
+from src.database.models import User, Role
+from src.services.versions import BUMP_SCRIPT
+from tests.conftest import FakeCacheService, FakeRedis, TestingSessionLocal
+
+
+@pytest.fixture
+def client(async_session):
+    async def override_get_db():
+        async with TestingSessionLocal() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: User(id=1, username="owner", email="owner@example.com", role=Role.USER)
+    autocomplete_index.clear()
+    with TestClient(app) as client:
+        yield client
+    autocomplete_index.clear()
+
+
+def create_contacts(client, count):
+    for i in range(count):
+        response = client.post("/contacts/", json={
+            "first_name": f"Name{i}",
+            "last_name": "Doe",
+            "email": f"contact{i}@example.com",
+            "phone": "123456789",
+            "birth_date": "1990-01-01",
+        })
+        assert response.status_code == 201
+
+
+def test_read_contacts_with_cursor(client):
+    create_contacts(client, 5)
+
+    first = client.get("/contacts/", params={"limit": 2})
+    second = client.get("/contacts/", params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]})
+    third = client.get("/contacts/", params={"limit": 2, "cursor": second.headers["X-Next-Cursor"]})
+
+    ids = [c["id"] for page in (first, second, third) for c in page.json()]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == 5
+    assert "X-Next-Cursor" not in third.headers
+
+
+def test_read_contacts_rejects_invalid_cursor(client):
+    response = client.get("/contacts/", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+
+
+def test_autocomplete_follows_writes(client):
+    create_contacts(client, 3)
+
+    response = client.get("/contacts/autocomplete", params={"q": "name1"})
+    assert [c["first_name"] for c in response.json()] == ["Name1"]
+
+    contact_id = response.json()[0]["id"]
+    client.patch(f"/contacts/{contact_id}", json={"first_name": "Renamed"})
+    assert client.get("/contacts/autocomplete", params={"q": "name1"}).json() == []
+    assert client.get("/contacts/autocomplete", params={"q": "ren"}).json()[0]["id"] == contact_id
+
+    client.delete(f"/contacts/{contact_id}")
+    assert client.get("/contacts/autocomplete", params={"q": "ren"}).json() == []
+    assert len(client.get("/contacts/autocomplete", params={"q": "contact"}).json()) == 2
+
+
+def test_autocomplete_rejects_blank_query(client):
+    create_contacts(client, 1)
+
+    assert client.get("/contacts/autocomplete", params={"q": "   "}).status_code == 400
+    assert client.get("/contacts/autocomplete", params={"q": " name0 "}).json()[0]["first_name"] == "Name0"
+
+
+def test_bulk_upsert_reports_every_row(client):
+    contact = {"first_name": "Ann", "last_name": "Doe", "phone": "123456789", "birth_date": "1990-12-30"}
+    client.post("/contacts/", json={**contact, "email": "existing@example.com"})
+    client.app.dependency_overrides[get_current_user] = lambda: User(id=2, username="other", email="other@example.com")
+    client.post("/contacts/", json={**contact, "email": "taken@example.com"})
+    client.app.dependency_overrides[get_current_user] = lambda: User(id=1, username="owner", email="owner@example.com")
+
+    response = client.post("/contacts/bulk", json=[
+        {**contact, "email": "new@example.com"},
+        {**contact, "email": "existing@example.com", "first_name": "Anna"},
+        {**contact, "email": "new@example.com"},
+        {**contact, "email": "taken@example.com"},
+        {**contact, "email": "not-an-email"},
+    ])
+
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["status"] for r in results] == ["created", "updated", "duplicate", "conflict", "invalid"]
+    assert [r["index"] for r in results] == [0, 1, 2, 3, 4]
+    assert client.get(f"/contacts/{results[1]['id']}").json()["first_name"] == "Anna"
+    assert client.get(f"/contacts/{results[0]['id']}").json()["email"] == "new@example.com"
+    assert {c["first_name"] for c in client.get("/contacts/autocomplete", params={"q": "ann"}).json()} == {"Ann", "Anna"}
+
+
+def test_bulk_upsert_reports_non_string_email_as_invalid(client):
+    contact = {"first_name": "Ann", "last_name": "Doe", "phone": "123456789", "birth_date": "1990-12-30"}
+
+    response = client.post("/contacts/bulk", json=[{**contact, "email": 123}, {**contact, "email": "ok@example.com"}])
+
+    assert response.status_code == 200
+    assert [(r["status"], r["email"]) for r in response.json()] == [("invalid", None), ("created", "ok@example.com")]
+
+
+def test_bulk_upsert_rejects_oversized_batch(client):
+    with patch("src.api.contacts.config.BULK_CONTACTS_MAX_ROWS", 1):
+        response = client.post("/contacts/bulk", json=[{}, {}])
+
+    assert response.status_code == 413
+
+
+def test_export_streams_csv_and_ndjson(client):
+    client.app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
+    create_contacts(client, 3)
+
+    with patch("src.services.export.config.EXPORT_CHUNK_SIZE", 2):
+        csv_response = client.get("/contacts/export", params={"format": "csv"})
+        ndjson_response = client.get("/contacts/export", params={"format": "ndjson"})
+
+    assert csv_response.headers["content-type"].startswith("text/csv")
+    assert csv_response.headers["content-disposition"] == 'attachment; filename="contacts.csv"'
+    rows = list(csv.DictReader(io.StringIO(csv_response.text)))
+    assert [r["first_name"] for r in rows] == ["Name0", "Name1", "Name2"]
+    assert rows[0]["birth_date"] == "1990-01-01"
+
+    assert ndjson_response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in ndjson_response.text.splitlines()]
+    assert [line["email"] for line in lines] == ["contact0@example.com", "contact1@example.com", "contact2@example.com"]
+    assert lines[0]["additional_data"] is None
+
+
+def test_export_rejects_unknown_format(client):
+    assert client.get("/contacts/export", params={"format": "xml"}).status_code == 422
+
+
+def test_import_runs_in_background_and_reports_status(client, monkeypatch):
+    from tests.unit.test_services.test_services_imports import VCARD
+
+    monkeypatch.setattr(import_jobs, "cache_service", FakeCacheService())
+    client.app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
+
+    response = client.post("/contacts/import", files={"file": ("book.vcf", VCARD.encode(), "text/vcard")})
+
+    assert response.status_code == 202
+    assert response.json()["format"] == "vcard"
+    job = client.get(f"/contacts/import/{response.json()['id']}").json()
+    assert (job["status"], job["created"], job["rejected"]) == ("done", 2, 0)
+    assert [c["first_name"] for c in client.get("/contacts/").json()] == ["John", "Jane"]
+    assert client.get("/contacts/import/unknown").status_code == 404
+
+
+def test_conditional_reads_answer_not_modified(client, monkeypatch):
+
+    fake = FakeCacheService()
+    monkeypatch.setattr(collection_versions, "cache_service", fake)
+    monkeypatch.setattr(collection_versions, "script", fake.redis.register_script(BUMP_SCRIPT))
+    create_contacts(client, 2)
+
+    listed = client.get("/contacts/", params={"limit": 10})
+    etag = listed.headers["ETag"]
+    assert client.get("/contacts/", params={"limit": 10}, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/contacts/", params={"limit": 5}, headers={"If-None-Match": etag}).status_code == 200
+
+    url = f"/contacts/{listed.json()[0]['id']}"
+    assert client.get(url).headers["ETag"] == '"v1"'
+    with patch("src.api.contacts.ContactService.get_contact") as get_contact:
+        not_modified = client.get(url, headers={"If-None-Match": '"v1"'})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == '"v1"'
+    get_contact.assert_not_called()
+
+    client.patch(url, json={"first_name": "Changed"})
+    assert client.get("/contacts/", params={"limit": 10}, headers={"If-None-Match": etag}).status_code == 200
+    changed = client.get(url, headers={"If-None-Match": '"v1"'})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] == '"v2"'
+
+
+def test_contact_lists_are_cached_until_a_write(client, monkeypatch):
+    from src.services.cache import CacheService
+
+    fake = FakeCacheService()
+    monkeypatch.setattr(collection_versions, "cache_service", fake)
+    monkeypatch.setattr(collection_versions, "script", fake.redis.register_script(BUMP_SCRIPT))
+    cache = CacheService()
+    cache.redis = FakeRedis()
+    monkeypatch.setattr(response_cache, "cache_service", cache)
+    create_contacts(client, 3)
+
+    first = client.get("/contacts/", params={"limit": 2})
+    with patch("src.api.contacts.ContactService.get_contacts") as get_contacts:
+        cached = client.get("/contacts/", params={"limit": 2})
+    get_contacts.assert_not_called()
+    assert cached.json() == first.json()
+    assert cached.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+
+    client.patch(f"/contacts/{first.json()[0]['id']}", json={"first_name": "Changed"})
+    assert client.get("/contacts/", params={"limit": 2}).json()[0]["first_name"] == "Changed"
+    assert client.get("/contacts/birthdays/", params={"days": 366}).status_code == 200
+    assert len(client.get("/contacts/birthdays/", params={"days": 366}).json()) == 3
+    assert response_cache.stats()["hits"] >= 2
+
+
+def test_sparse_fieldsets(client):
+    create_contacts(client, 3)
+
+    listed = client.get("/contacts/", params={"limit": 2, "fields": "phone,first_name"})
+    assert listed.json() == [
+        {"first_name": "Name0", "phone": "123456789"},
+        {"first_name": "Name1", "phone": "123456789"},
+    ]
+    following = client.get("/contacts/", params={"limit": 2, "fields": "first_name", "cursor": listed.headers["X-Next-Cursor"]})
+    assert following.json() == [{"first_name": "Name2"}]
+    assert client.get("/contacts/", params={"search": "name", "fields": "email"}).json()[0] == {"email": "contact0@example.com"}
+
+    contact_id = client.get("/contacts/").json()[0]["id"]
+    sparse = client.get(f"/contacts/{contact_id}", params={"fields": "last_name"})
+    assert sparse.json() == {"last_name": "Doe"}
+    assert sparse.headers["ETag"].startswith('"v1-')
+    assert client.patch(f"/contacts/{contact_id}", json={"phone": "1"}, headers={"If-Match": sparse.headers["ETag"]}).status_code == 200
+
+    assert client.get("/contacts/", params={"fields": "password"}).status_code == 400
+    assert client.get(f"/contacts/{contact_id}", params={"fields": ""}).status_code == 400
+    assert "additional_data" in client.get(f"/contacts/{contact_id}").json()
+
+
+def test_sparse_fieldsets_are_documented(client):
+    schema = client.get("/openapi.json").json()
+    sparse = {"$ref": "#/components/schemas/SparseContactResponse"}
+
+    listed = schema["paths"]["/contacts/"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert {"type": "array", "items": sparse} in [{k: v for k, v in option.items() if k != "title"} for option in listed["anyOf"]]
+    single = schema["paths"]["/contacts/{contact_id}"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert sparse in single["anyOf"]
+    assert "required" not in schema["components"]["schemas"]["SparseContactResponse"]
+
+
+def test_conditional_writes_use_etags(client):
+    created = client.post("/contacts/", json={
+        "first_name": "Ann", "last_name": "Doe", "email": "ann@example.com",
+        "phone": "123456789", "birth_date": "1990-01-01", "additional_data": "note",
+    })
+    url = f"/contacts/{created.json()['id']}"
+    assert created.headers["ETag"] == '"v1"'
+    assert client.get(url).headers["ETag"] == '"v1"'
+
+    patched = client.patch(url, json={"first_name": "Anna"}, headers={"If-Match": '"v1"'})
+    assert patched.status_code == 200
+    assert patched.headers["ETag"] == '"v2"'
+    assert patched.json()["additional_data"] == "note"
+
+    stale = client.patch(url, json={"first_name": "Lost"}, headers={"If-Match": '"v1"'})
+    assert stale.status_code == 412
+    assert stale.headers["ETag"] == '"v2"'
+
+    replaced = client.put(url, json={
+        "first_name": "Anne", "last_name": "Roe", "email": "anne@example.com",
+        "phone": "987654321", "birth_date": "1991-02-03",
+    }, headers={"If-Match": '"v0", "v2"'})
+    assert replaced.json()["additional_data"] is None
+    assert replaced.json()["version"] == 3
+    assert client.put(url, json={"first_name": "Partial"}).status_code == 422
+
+    assert client.delete(url, headers={"If-Match": '"v2"'}).status_code == 412
+    assert client.delete(url, headers={"If-Match": "*"}).status_code == 200
+    assert client.patch(url, json={"first_name": "Gone"}, headers={"If-Match": '"v3"'}).status_code == 404
@@ -0,0 +1,36 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.auth import get_current_user
+from src.api.metrics import router
+from src.database.models import Role, User
+from src.services import metrics
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+def login_as(app, role):
+    app.dependency_overrides[get_current_user] = lambda: User(id=1, username="u", email="u@example.com", role=role)
+
+
+def test_read_metrics(app):
+    login_as(app, Role.ADMIN)
+    metrics.register("test_source", lambda: {"value": 1})
+
+    response = TestClient(app).get("/metrics/")
+
+    assert response.status_code == 200
+    assert response.json()["test_source"] == {"value": 1}
+
+
+def test_read_metrics_requires_admin(app):
+    assert TestClient(app).get("/metrics/").status_code == 401
+
+    login_as(app, Role.USER)
+    assert TestClient(app).get("/metrics/").status_code == 403
@@ -1,10 +1,10 @@
 import pytest
-from datetime import date, timedelta
+from datetime import date
 from unittest.mock import AsyncMock, patch
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.engine import Result
 
-from src.repository.contacts import ContactRepository
+from src.repository.contacts import ContactRepository, birthday_ranges
 from src.database.models import Contact
 from src.schemas.contact import ContactCreate, ContactUpdate
 
@@ -70,7 +70,7 @@ async def test_update():
     mock_session = AsyncMock(spec=AsyncSession)
     mock_result = AsyncMock(spec=Result)
     mock_result.scalar_one_or_none.return_value = Contact(
-        id=1, first_name="Alice", last_name="Smith", email="alice.smith@example.com"
+        id=1, first_name="Alice", last_name="Smith", email="alice.new@example.com", version=2
     )
     mock_session.execute.return_value = mock_result
     body = ContactUpdate(email="alice.new@example.com")
@@ -79,8 +79,10 @@ async def test_update():
     updated_contact = await repo.update(contact_id=1, body=body, user_id=1)
 
     assert updated_contact.email == "alice.new@example.com"
+    assert updated_contact.version == 2
     mock_session.commit.assert_called_once()
-    mock_session.refresh.assert_called_once()
+    mock_session.execute.assert_called_once()
+    mock_session.refresh.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -96,7 +98,8 @@ async def test_delete():
     deleted_contact = await repo.delete(contact_id=1, user_id=1)
 
     assert deleted_contact.first_name == "Alice"
-    mock_session.delete.assert_called_once()
+    mock_session.execute.assert_called_once()
+    mock_session.delete.assert_not_called()
     mock_session.commit.assert_called_once()
 
 
@@ -104,8 +107,8 @@ async def test_delete():
 async def test_search_contacts():
     mock_session = AsyncMock(spec=AsyncSession)
     mock_result = AsyncMock(spec=Result)
-    mock_result.scalars().all.return_value = [
-        Contact(id=1, first_name="Alice", last_name="Smith", email="alice.smith@example.com")
+    mock_result.all.return_value = [
+        (Contact(id=1, first_name="Alice", last_name="Smith", email="alice.smith@example.com"), 0)
     ]
     mock_session.execute.return_value = mock_result
 
@@ -127,14 +130,86 @@ async def test_get_upcoming_birthdays():
             first_name="Alice",
             last_name="Smith",
             email="alice.smith@example.com",
-            birth_date=date.today() + timedelta(days=3),
+            birth_date=date(1990, 6, 4),
         )
     ]
     mock_session.execute.return_value = mock_result
 
     repo = ContactRepository(mock_session)
-    birthdays = await repo.get_upcoming_birthdays(user_id=1)
+    birthdays = await repo.get_upcoming_birthdays(user_id=1, today=date(2024, 6, 1))
 
     assert len(birthdays) == 1
     assert birthdays[0].first_name == "Alice"
     mock_session.execute.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_upcoming_birthdays_splits_year_end_window():
+    mock_session = AsyncMock(spec=AsyncSession)
+    mock_result = AsyncMock(spec=Result)
+    mock_result.scalars().all.side_effect = [
+        [Contact(id=1, first_name="Dec", birth_date=date(1990, 12, 30))],
+        [Contact(id=2, first_name="Jan", birth_date=date(1990, 1, 2))],
+    ]
+    mock_session.execute.return_value = mock_result
+
+    repo = ContactRepository(mock_session)
+    birthdays = await repo.get_upcoming_birthdays(user_id=1, days=7, today=date(2024, 12, 28))
+
+    assert [c.first_name for c in birthdays] == ["Dec", "Jan"]
+    assert mock_session.execute.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_write_hooks_run_after_commit():
+    mock_session = AsyncMock(spec=AsyncSession)
+    mock_result = AsyncMock(spec=Result)
+    mock_result.scalar_one_or_none.side_effect = [
+        Contact(id=1, first_name="Alicia", user_id=1),
+        Contact(id=1, first_name="Alicia", user_id=1),
+    ]
+    mock_session.execute.return_value = mock_result
+    calls = []
+    hook = lambda action, contacts: calls.extend((action, contact.first_name) for contact in contacts)
+
+    ContactRepository.add_write_hook(hook)
+    try:
+        repo = ContactRepository(mock_session)
+        await repo.create(
+            ContactCreate(first_name="Bob", last_name="Brown", email="bob@example.com",
+                          phone="1234567890", birth_date=date(1990, 1, 1)),
+            user_id=1
+        )
+        await repo.update(contact_id=1, body=ContactUpdate(first_name="Alicia"), user_id=1)
+        await repo.delete(contact_id=1, user_id=1)
+    finally:
+        ContactRepository.remove_write_hook(hook)
+
+    assert calls == [("create", "Bob"), ("update", "Alicia"), ("delete", "Alicia")]
+
+
+@pytest.mark.asyncio
+async def test_upsert_many_notifies_hooks_once_per_call(async_session):
+    calls = []
+    hook = lambda action, contacts: calls.append((action, sorted(c.email for c in contacts)))
+    rows = [
+        dict(first_name=name, last_name="Batch", email=f"{name}@batch.com",
+             phone="1234567890", birth_date=date(1990, 1, 1))
+        for name in ("ann", "ben", "cid")
+    ]
+
+    ContactRepository.add_write_hook(hook)
+    try:
+        await ContactRepository(async_session).upsert_many(rows, user_id=1, batch_size=2)
+    finally:
+        ContactRepository.remove_write_hook(hook)
+
+    assert calls == [("upsert", ["ann@batch.com", "ben@batch.com", "cid@batch.com"])]
+
+
+def test_birthday_ranges_include_today_and_the_next_days():
+    today = date(2026, 12, 28)
+
+    assert birthday_ranges(today, 0) == [(1228, 1228)]
+    assert birthday_ranges(today, 7) == [(1228, 1231), (101, 104)]
+    assert birthday_ranges(today, 365) == [(1228, 1231), (101, 1227)]
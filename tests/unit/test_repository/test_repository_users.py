@@ -100,3 +100,19 @@ async def test_get_user_by_email():
     assert user.username == "testuser"
     assert user.email == "testuser@example.com"
     mock_session.execute.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_update_avatar():
+    mock_session = AsyncMock(spec=AsyncSession)
+    mock_result = AsyncMock(spec=Result)
+    mock_result.scalar_one_or_none.return_value = User(
+        id=1, username="testuser", email="testuser@example.com", password="hashed", role=Role.USER
+    )
+    mock_session.execute.return_value = mock_result
+    repo = UserRepository(mock_session)
+
+    user = await repo.update_avatar("testuser@example.com", "https://example.com/a.png")
+
+    assert user.avatar == "https://example.com/a.png"
+    mock_session.commit.assert_called_once()
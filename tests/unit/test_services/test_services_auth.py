@@ -1,16 +1,17 @@
-from email.mime.text import MIMEText
-
 import pytest
-from jose import jwt
+from jose import jwt, JWTError
 from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 from unittest.mock import AsyncMock, patch, MagicMock
 
 from src.services.auth import (
     create_access_token,
+    decode_token,
+    token_cache,
     verify_password,
     get_password_hash,
     authenticate_user,
+    calibrate_bcrypt_rounds,
     generate_email_verification_token,
     send_reset_password_email,
 )
@@ -27,6 +28,38 @@ async def test_create_access_token():
     assert "exp" in decoded_token
 
 
+def test_decode_token_caches_verified_payload():
+    token_cache.clear()
+    token = create_access_token({"sub": "test@example.com"}, expires_delta=15)
+
+    with patch("src.services.auth.jwt.decode", wraps=jwt.decode) as mock_decode:
+        first = decode_token(token)
+        second = decode_token(token)
+
+    assert first == second
+    assert first["sub"] == "test@example.com"
+    mock_decode.assert_called_once()
+
+
+def test_decode_token_entry_expires_with_token():
+    token_cache.clear()
+    token = create_access_token({"sub": "test@example.com"}, expires_delta=1)
+
+    with patch.object(token_cache, "set", wraps=token_cache.set) as mock_set:
+        decode_token(token)
+
+    assert mock_set.call_args.kwargs["ttl"] <= 60
+
+
+def test_decode_token_does_not_cache_invalid_tokens():
+    token_cache.clear()
+    token = create_access_token({"sub": "test@example.com"}, expires_delta=15)
+
+    with pytest.raises(JWTError):
+        decode_token(token + "x")
+    assert len(token_cache) == 0
+
+
 def test_verify_password():
     pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
     hashed = pwd_context.hash("password123")
@@ -61,30 +94,47 @@ async def test_authenticate_user():
         mock_repo.assert_called_with("test@example.com")
 
 
+@pytest.mark.asyncio
+async def test_authenticate_user_rehashes_outdated_cost():
+    mock_db = AsyncMock(spec=AsyncSession)
+    mock_user = AsyncMock()
+    mock_user.email = "test@example.com"
+    mock_user.password = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("password123")
+    context = CryptContext(
+        schemes=["bcrypt"], bcrypt__default_rounds=5, bcrypt__min_rounds=5, bcrypt__max_rounds=5
+    )
+
+    with patch("src.services.auth.pwd_context", context), patch(
+        "src.services.auth.UserRepository.get_user_by_email", return_value=mock_user
+    ), patch("src.services.auth.UserRepository.update_password") as mock_update:
+        user = await authenticate_user("test@example.com", "password123", mock_db)
+
+    assert user is mock_user
+    mock_update.assert_called_once()
+    new_hash = mock_update.call_args.args[1]
+    assert new_hash.startswith("$2b$05$")
+    assert context.verify("password123", new_hash)
+
+
+def test_calibrate_bcrypt_rounds_stays_within_bounds():
+    assert calibrate_bcrypt_rounds(target_ms=0, min_rounds=4, max_rounds=6) == 4
+    assert calibrate_bcrypt_rounds(target_ms=10 ** 9, min_rounds=4, max_rounds=6) == 6
+
+
 def test_generate_email_verification_token():
     token = generate_email_verification_token()
     assert isinstance(token, str)
     assert len(token) > 0
 
 
-def test_send_reset_password_email():
-    with patch("smtplib.SMTP", autospec=True) as mock_smtp:
-        mock_instance = MagicMock()
-        mock_smtp.return_value.__enter__.return_value = mock_instance
-
-        send_reset_password_email("test@example.com", "token123")
-
-        # Генеруємо очікуваний текст листа
-        expected_msg = MIMEText("Your password reset token is: token123")
-        expected_msg['Subject'] = 'Password Reset'
-        expected_msg['From'] = 'your_email@example.com'
-        expected_msg['To'] = "test@example.com"
-
-        mock_smtp.assert_called_once_with("smtp.example.com", 587)
-        mock_instance.starttls.assert_called_once()
-        mock_instance.login.assert_called_once_with("your_email@example.com", "your_password")
-        mock_instance.sendmail.assert_called_once_with(
-            "your_email@example.com",
-            ["test@example.com"],
-            expected_msg.as_string(),  # Враховуємо форматування MIMEText
-        )
\ No newline at end of file
+@pytest.mark.asyncio
+async def test_send_reset_password_email():
+    with patch("src.services.auth.mailer.send", new_callable=AsyncMock) as mock_send:
+        await send_reset_password_email("test@example.com", "token123")
+
+    mock_send.assert_awaited_once()
+    msg = mock_send.call_args.args[0]
+    assert msg['Subject'] == 'Password Reset'
+    assert msg['From'] == config.MAIL_FROM
+    assert msg['To'] == "test@example.com"
+    assert msg.get_payload() == "Your password reset token is: token123"
@@ -0,0 +1,158 @@
+import asyncio
+
+import pytest
+
+from src.database.models import Contact
+from src.services.autocomplete import AutocompleteIndex, UserIndex
+
+ROWS = [
+    (1, "Alice", "Smith", "alice@example.com"),
+    (2, "Bob", "Smithson", "bob@work.org"),
+    (3, "Carol", "Jones", "cj@example.com"),
+]
+
+
+def loader_for(rows, calls=None):
+    async def loader():
+        if calls is not None:
+            calls.append(1)
+        return list(rows)
+    return loader
+
+
+def test_user_index_matches_name_full_name_and_email_prefixes():
+    index = UserIndex(ROWS)
+
+    assert [c["id"] for c in index.search("smi", 10)] == [1, 2]
+    assert [c["id"] for c in index.search("alice s", 10)] == [1]
+    assert [c["id"] for c in index.search("CJ@", 10)] == [3]
+    assert index.search("zz", 10) == []
+    assert len(index.search("", 2)) == 2
+
+
+def test_user_index_add_and_remove_keep_entries_sorted():
+    index = UserIndex(ROWS)
+
+    index.add((2, "Bobby", "Stone", "bob@work.org"))
+    index.remove(1)
+
+    assert [c["id"] for c in index.search("smi", 10)] == []
+    assert index.search("st", 10)[0]["first_name"] == "Bobby"
+    assert index.entries == sorted(index.entries)
+    assert len(index) == 8
+
+
+@pytest.mark.asyncio
+async def test_search_builds_lazily_once():
+    index = AutocompleteIndex(max_users=10, max_entries=1000, ttl=60)
+    calls = []
+
+    first = await index.search(1, "ali", 5, loader_for(ROWS, calls))
+    second = await index.search(1, "bob", 5, loader_for(ROWS, calls))
+
+    assert first[0]["id"] == 1
+    assert second[0]["id"] == 2
+    assert len(calls) == 1
+    assert index.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_builds_are_coalesced():
+    index = AutocompleteIndex(max_users=10, max_entries=1000, ttl=60)
+    calls = []
+
+    async def slow_loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ROWS
+
+    results = await asyncio.gather(*(index.search(1, "c", 5, slow_loader) for _ in range(5)))
+
+    assert len(calls) == 1
+    assert all(r[0]["id"] == 3 for r in results)
+
+
+@pytest.mark.asyncio
+async def test_on_write_updates_loaded_index():
+    index = AutocompleteIndex(max_users=10, max_entries=1000, ttl=60)
+    await index.search(1, "a", 5, loader_for(ROWS))
+
+    index.on_write("create", [Contact(id=4, first_name="Dave", last_name="Lee", email="d@x.com", user_id=1)])
+    index.on_write("update", [Contact(id=1, first_name="Alicia", last_name="Smith", email="a@x.com", user_id=1)])
+    index.on_write("delete", [Contact(id=2, first_name="Bob", last_name="Smithson", email="bob@work.org", user_id=1)])
+
+    fail = loader_for([])
+    assert [c["id"] for c in await index.search(1, "dav", 5, fail)] == [4]
+    assert (await index.search(1, "alic", 5, fail))[0]["first_name"] == "Alicia"
+    assert await index.search(1, "bob", 5, fail) == []
+    assert index.stats()["builds"] == 1
+
+
+@pytest.mark.asyncio
+async def test_write_during_build_is_not_lost():
+    index = AutocompleteIndex(max_users=10, max_entries=1000, ttl=60)
+    calls = []
+
+    async def loader():
+        index.on_write("create", [Contact(id=9, first_name="Zed", last_name="Z", email="z@x.com", user_id=1)])
+        return ROWS
+
+    await index.search(1, "a", 5, loader)
+    await index.search(1, "a", 5, loader_for(ROWS + [(9, "Zed", "Z", "z@x.com")], calls))
+
+    assert len(calls) == 1
+    assert index.stats()["builds"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cold_users_are_evicted():
+    index = AutocompleteIndex(max_users=2, max_entries=1000, ttl=60)
+
+    for user_id in (1, 2, 1, 3):
+        await index.search(user_id, "a", 5, loader_for(ROWS))
+
+    stats = index.stats()
+    assert stats["users"] == 2
+    assert stats["evictions"] == 1
+    assert index._get(2) is None
+    assert index._get(1) is not None
+
+
+@pytest.mark.asyncio
+async def test_entry_cap_bounds_memory():
+    index = AutocompleteIndex(max_users=10, max_entries=20, ttl=60)
+
+    await index.search(1, "a", 5, loader_for(ROWS))
+    await index.search(2, "a", 5, loader_for(ROWS))
+
+    assert index.stats()["users"] == 1
+    assert index.total_entries == 12
+
+
+@pytest.mark.asyncio
+async def test_expired_index_is_rebuilt():
+    index = AutocompleteIndex(max_users=10, max_entries=1000, ttl=0)
+    calls = []
+
+    await index.search(1, "a", 5, loader_for(ROWS, calls))
+    await index.search(1, "a", 5, loader_for(ROWS, calls))
+
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_oversized_user_falls_back_to_query():
+    index = AutocompleteIndex(max_users=10, max_entries=5, ttl=60)
+    calls = []
+
+    async def fallback():
+        return [ROWS[2]]
+
+    first = await index.search(1, "a", 5, loader_for(ROWS, calls), fallback)
+    second = await index.search(1, "c", 5, loader_for(ROWS, calls), fallback)
+
+    assert first[0]["id"] == 1
+    assert second == [{"id": 3, "first_name": "Carol", "last_name": "Jones", "email": "cj@example.com"}]
+    assert len(calls) == 1
+    stats = index.stats()
+    assert (stats["users"], stats["entries"], stats["oversized"], stats["fallbacks"]) == (0, 0, 1, 1)
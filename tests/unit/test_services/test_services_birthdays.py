@@ -0,0 +1,175 @@
+import asyncio
+from contextlib import nullcontext
+from datetime import date, datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from redis.exceptions import RedisError
+
+from src.conf.config import config
+from src.database.models import Contact
+from src.repository.contacts import ContactRepository
+from src.schemas.contact import ContactCreate, ContactUpdate
+from src.services.birthdays import CORRECTION_SCRIPT, BirthdayDigest
+from tests.conftest import FakeCacheService
+
+TODAY = date(2026, 12, 28)
+
+
+def contact(contact_id, birth_date, user_id=1):
+    return Contact(
+        id=contact_id, first_name="John", last_name="Doe", email="john@example.com", phone="123456789",
+        birth_date=birth_date, user_id=user_id, version=1, created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 1, 1),
+    )
+
+
+@pytest.fixture
+def digest():
+    return BirthdayDigest(FakeCacheService(), days=7)
+
+
+async def create(repo, name, birth_date, user_id=1):
+    return await repo.create(ContactCreate(
+        first_name=name, last_name="Doe", email=f"{name.lower()}@example.com",
+        phone="123456789", birth_date=birth_date,
+    ), user_id=user_id)
+
+
+@pytest.mark.asyncio
+async def test_get_returns_none_until_built(digest):
+    assert await digest.get(1, today=TODAY) is None
+    assert digest.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_build_computes_every_users_digest(async_session, digest):
+    repo = ContactRepository(async_session)
+    await create(repo, "Jan", date(1990, 1, 2))
+    await create(repo, "Dec", date(1990, 12, 30))
+    await create(repo, "June", date(1990, 6, 1))
+    await create(repo, "Other", date(1991, 12, 29), user_id=2)
+
+    assert await digest.build(async_session, today=TODAY) is True
+    assert await digest.build(async_session, today=TODAY) is False
+
+    assert [c["first_name"] for c in await digest.get(1, today=TODAY)] == ["Dec", "Jan"]
+    assert [c["first_name"] for c in await digest.get(2, today=TODAY)] == ["Other"]
+    assert await digest.get(3, today=TODAY) == []
+
+
+@pytest.mark.asyncio
+async def test_on_write_corrects_built_digest(async_session, digest):
+    repo = ContactRepository(async_session)
+    jan = await create(repo, "Jan", date(1990, 1, 2))
+    await digest.build(async_session, today=TODAY)
+
+    new = await create(repo, "Dec", date(1990, 12, 30))
+    await digest.on_write("create", [new], today=TODAY)
+    moved = await repo.update(jan.id, ContactUpdate(birth_date=date(1990, 7, 1)), user_id=1)
+    await digest.on_write("update", [moved], today=TODAY)
+
+    assert [c["first_name"] for c in await digest.get(1, today=TODAY)] == ["Dec"]
+
+    await digest.on_write("delete", [new], today=TODAY)
+    assert await digest.get(1, today=TODAY) == []
+    assert digest.stats()["corrections"] == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_write_is_one_correction_per_user(async_session, digest):
+    repo = ContactRepository(async_session)
+    await digest.build(async_session, today=TODAY)
+    batch = [await create(repo, name, date(1990, 12, 30)) for name in ("Dec", "Eve")]
+    script = digest.script
+    digest.script = AsyncMock(side_effect=script)
+
+    await digest.on_write("upsert", batch, today=TODAY)
+
+    assert digest.script.await_count == 1
+    assert [c["first_name"] for c in await digest.get(1, today=TODAY)] == ["Dec", "Eve"]
+    assert digest.stats()["corrections"] == 2
+
+
+@pytest.mark.asyncio
+async def test_on_write_is_skipped_before_build(digest):
+    await digest.on_write("create", [contact(1, date(1990, 12, 30))], today=TODAY)
+
+    assert digest.stats()["corrections"] == 0
+    assert "birthdays:2026-12-28:1" not in digest.cache_service.redis.data
+
+
+@pytest.mark.asyncio
+async def test_write_during_build_is_reapplied(async_session, digest):
+    repo = ContactRepository(async_session)
+    dec = await create(repo, "Dec", date(1990, 12, 30))
+    stream = ContactRepository.stream_upcoming_birthdays
+
+    async def stream_then_write(self, days, today):
+        async for row in stream(self, days, today):
+            yield row
+        # Deleted after the job read it but before the job wrote it out.
+        await repo.delete(dec.id, user_id=1)
+        await digest.on_write("delete", [dec], today=TODAY)
+
+    with patch.object(ContactRepository, "stream_upcoming_birthdays", stream_then_write):
+        await digest.build(async_session, today=TODAY)
+
+    assert await digest.get(1, today=TODAY) == []
+    assert "birthdays:2026-12-28:dirty" not in digest.cache_service.redis.data
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_back(digest):
+    digest.script = AsyncMock(side_effect=RedisError())
+    digest.cache_service.redis.pipeline = lambda transaction=True: (_ for _ in ()).throw(RedisError())
+
+    await digest.on_write("create", [contact(1, date(1990, 12, 30))], today=TODAY)
+    assert await digest.get(1, today=TODAY) is None
+    assert digest.stats()["errors"] == 2
+
+
+@pytest.mark.asyncio
+async def test_run_daily_retries_while_another_worker_builds(async_session, digest):
+    building_key = digest._key(date.today(), "building")
+    digest.cache_service.redis.data[building_key] = "1"
+    sleeps = []
+
+    async def sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 1:
+            # The other worker died; its build lock expired.
+            del digest.cache_service.redis.data[building_key]
+        else:
+            raise asyncio.CancelledError
+
+    with patch("src.services.birthdays.asyncio.sleep", sleep):
+        with pytest.raises(asyncio.CancelledError):
+            await digest.run_daily(lambda: nullcontext(async_session))
+
+    assert len(sleeps) == 2
+    assert sleeps[0] == config.BIRTHDAY_DIGEST_RETRY
+    assert digest.stats()["builds"] == 1
+
+
+@pytest.mark.asyncio
+async def test_correction_script_on_redis(redis_service):
+    service, prefix = redis_service
+    script = service.redis.register_script(CORRECTION_SCRIPT)
+    done, building, digest, dirty = (f"birthdays:{prefix}:{suffix}" for suffix in ("done", "building", "1", "dirty"))
+    args = [60, "set", "1", '{"id": 1}', "1", "del", "2", "", "2"]
+
+    assert await script(keys=[done, building, digest, dirty], args=args) == 0
+    assert await service.redis.exists(digest) == 0
+
+    await service.redis.set(done, 1)
+    await service.redis.hset(digest, mapping={"2": '{"id": 2}', "3": '{"id": 3}'})
+    assert await script(keys=[done, building, digest, dirty], args=args) == 1
+    assert await service.redis.hgetall(digest) == {"1": '{"id": 1}', "3": '{"id": 3}'}
+    assert await service.redis.exists(dirty) == 0
+    assert 0 < await service.redis.ttl(digest) <= 60
+
+    await service.redis.delete(done)
+    await service.redis.set(building, 1)
+    assert await script(keys=[done, building, digest, dirty], args=args) == 1
+    assert await service.redis.smembers(dirty) == {"1", "2"}
+    assert 0 < await service.redis.ttl(dirty) <= 60
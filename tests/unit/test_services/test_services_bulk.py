@@ -0,0 +1,19 @@
+from src.schemas.contact import ContactBulkResult, ContactCreate
+from src.services.bulk import validate_bulk_rows
+
+
+def test_validate_bulk_rows_reports_invalid_and_repeated_rows():
+    rows = [
+        {"first_name": "Ann", "last_name": "Lee", "email": "ann@example.com", "phone": "1234567890", "birth_date": "1990-01-01"},
+        {"first_name": "Bob", "email": "bob@example.com"},
+        {"first_name": "Ann", "last_name": "Again", "email": "ann@example.com", "phone": "1234567890", "birth_date": "1990-01-01"},
+        "not a row",
+    ]
+
+    results, candidates = validate_bulk_rows(rows, ContactCreate, ContactBulkResult)
+
+    assert [r.status if r else None for r in results] == [None, "invalid", "duplicate", "invalid"]
+    assert results[1].email == "bob@example.com"
+    assert results[3].email is None
+    index, body = candidates["ann@example.com"]
+    assert index == 0 and body.last_name == "Lee"
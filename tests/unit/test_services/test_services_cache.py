@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from redis.exceptions import RedisError
+
+from src.services.cache import CacheService, TTLCache, NEGATIVE
+
+
+@pytest.fixture
+def cache_service():
+    service = CacheService(local_maxsize=100, local_max_bytes=1024)
+    service.redis = AsyncMock()
+    service.redis.get.return_value = None
+    return service
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=10, ttl=60)
+    with patch("src.services.cache.time.monotonic", return_value=100.0):
+        cache.set("a", "1", ttl=5)
+    with patch("src.services.cache.time.monotonic", return_value=104.0):
+        assert cache.get("a") == "1"
+    with patch("src.services.cache.time.monotonic", return_value=106.0):
+        assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("a") == "1"
+    assert cache.get("b") is None
+    assert cache.evictions == 1
+
+
+def test_ttl_cache_is_capped_by_size():
+    cache = TTLCache(maxsize=100, max_bytes=10)
+    cache.set("a", "x" * 6)
+    cache.set("b", "y" * 6)
+    cache.set("c", "z" * 11)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == "y" * 6
+    assert cache.get("c") is None
+    assert cache.size_bytes == 6
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_coalesces_concurrent_misses(cache_service):
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*[
+        cache_service.get_or_load("key", loader, ex=60, local_ttl=10) for _ in range(20)
+    ])
+
+    assert results == ["value"] * 20
+    assert calls == 1
+    cache_service.redis.get.assert_called_once_with("key")
+    cache_service.redis.set.assert_called_once_with("key", "value", ex=60)
+    assert cache_service.stats()["coalesced"] == 19
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_propagates_loader_errors_to_waiters(cache_service):
+    async def loader():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        *[cache_service.get_or_load("key", loader) for _ in range(3)],
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, ValueError) for r in results)
+    assert "key" not in cache_service._inflight
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_caches_missing_values(cache_service):
+    loader = AsyncMock(return_value=None)
+
+    assert await cache_service.get_or_load("key", loader, local_ttl=10, negative_ttl=5) is None
+    assert await cache_service.get_or_load("key", loader, local_ttl=10, negative_ttl=5) is None
+
+    loader.assert_called_once()
+    cache_service.redis.set.assert_called_once_with("key", NEGATIVE, ex=5)
+    assert cache_service.stats()["negative_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_serves_loader_when_redis_is_down(cache_service):
+    cache_service.redis.get.side_effect = RedisError()
+    cache_service.redis.set.side_effect = RedisError()
+
+    value = await cache_service.get_or_load("key", AsyncMock(return_value="value"))
+
+    assert value == "value"
+
+
+@pytest.mark.asyncio
+async def test_set_keeps_values_out_of_local_tier_by_default(cache_service):
+    await cache_service.set("token", "a@example.com", ex=60)
+    cache_service.redis.get.return_value = None
+
+    assert await cache_service.get("token") is None
+    assert len(cache_service.local) == 0
+
+
+@pytest.mark.asyncio
+async def test_delete_drops_local_entry(cache_service):
+    await cache_service.set("key", "value", local_ttl=10)
+    assert await cache_service.get("key") == "value"
+
+    await cache_service.delete("key")
+
+    assert await cache_service.get("key") is None
+    cache_service.redis.delete.assert_called_once_with("key")
@@ -1,10 +1,10 @@
 import pytest
-from datetime import date, timedelta
+from datetime import date
 from unittest.mock import AsyncMock, patch
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.engine import Result
 
-from src.services.contacts import ContactRepository
+from src.services.contacts import ContactRepository, encode_cursor, decode_cursor
 from src.database.models import Contact
 from src.schemas.contact import ContactCreate, ContactUpdate
 
@@ -70,7 +70,7 @@ async def test_update_contact():
     mock_session = AsyncMock(spec=AsyncSession)
     mock_result = AsyncMock(spec=Result)
     mock_result.scalar_one_or_none.return_value = Contact(
-        id=1, first_name="John", last_name="Doe", email="john.doe@example.com"
+        id=1, first_name="John", last_name="Doe", email="new.email@example.com", version=2
     )
     mock_session.execute.return_value = mock_result
     body = ContactUpdate(email="new.email@example.com")
@@ -80,8 +80,10 @@ async def test_update_contact():
 
     assert updated_contact is not None
     assert updated_contact.email == "new.email@example.com"
+    assert updated_contact.version == 2
     mock_session.commit.assert_called_once()
-    mock_session.refresh.assert_called_once()
+    mock_session.execute.assert_called_once()
+    mock_session.refresh.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -98,7 +100,8 @@ async def test_delete_contact():
 
     assert deleted_contact is not None
     assert deleted_contact.first_name == "John"
-    mock_session.delete.assert_called_once()
+    mock_session.execute.assert_called_once()
+    mock_session.delete.assert_not_called()
     mock_session.commit.assert_called_once()
 
 
@@ -106,8 +109,8 @@ async def test_delete_contact():
 async def test_search_contacts():
     mock_session = AsyncMock(spec=AsyncSession)
     mock_result = AsyncMock(spec=Result)
-    mock_result.scalars().all.return_value = [
-        Contact(id=1, first_name="John", last_name="Doe", email="john.doe@example.com")
+    mock_result.all.return_value = [
+        (Contact(id=1, first_name="John", last_name="Doe", email="john.doe@example.com"), 0)
     ]
     mock_session.execute.return_value = mock_result
 
@@ -129,14 +132,28 @@ async def test_get_upcoming_birthdays():
             first_name="John",
             last_name="Doe",
             email="john.doe@example.com",
-            birth_date=date.today() + timedelta(days=3),
+            birth_date=date(1990, 6, 4),
         )
     ]
     mock_session.execute.return_value = mock_result
 
     repo = ContactRepository(mock_session)
-    birthdays = await repo.get_upcoming_birthdays(user_id=1)
+    birthdays = await repo.get_upcoming_birthdays(user_id=1, today=date(2024, 6, 1))
 
     assert len(birthdays) == 1
     assert birthdays[0].first_name == "John"
     mock_session.execute.assert_called_once()
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(42)
+
+    assert "42" not in cursor
+    assert decode_cursor(cursor) == (42, None)
+    assert decode_cursor(encode_cursor(42, rank=1)) == (42, 1)
+
+
+@pytest.mark.parametrize("cursor", ["", "!!!", "eyJpZCI6ICJ4In0", "bnVsbA"])
+def test_decode_cursor_rejects_malformed(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
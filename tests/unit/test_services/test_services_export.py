@@ -0,0 +1,44 @@
+from datetime import date
+
+import pytest
+
+from src.repository.contacts import ContactRepository
+from src.schemas.contact import ContactCreate
+from src.services.export import export_contacts
+from tests.conftest import TestingSessionLocal
+
+
+async def create_contacts(session, count, user_id=1):
+    repo = ContactRepository(session)
+    for i in range(count):
+        await repo.create(ContactCreate(
+            first_name=f"Name{i}", last_name="Doe", email=f"user{user_id}-{i}@example.com",
+            phone="123456789", birth_date=date(1990, 1, 1),
+        ), user_id=user_id)
+
+
+@pytest.mark.asyncio
+async def test_export_yields_one_chunk_per_cursor_batch(async_session):
+    await create_contacts(async_session, 5)
+    await create_contacts(async_session, 2, user_id=2)
+
+    chunks = [chunk async for chunk in export_contacts(TestingSessionLocal, 1, "ndjson", chunk_size=2)]
+
+    assert [chunk.count("\n") for chunk in chunks] == [2, 2, 1]
+    assert "user2-" not in "".join(chunks)
+
+
+@pytest.mark.asyncio
+async def test_csv_header_is_sent_before_any_query(async_session):
+    opened = []
+
+    def session_factory():
+        opened.append(True)
+        return TestingSessionLocal()
+
+    stream = export_contacts(session_factory, 1, "csv")
+    header = await stream.__anext__()
+
+    assert header.startswith("id,first_name,last_name,email,phone,birth_date")
+    assert opened == []
+    assert [chunk async for chunk in stream] == []
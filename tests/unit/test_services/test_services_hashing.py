@@ -0,0 +1,56 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.services.auth import get_password_hash, verify_password
+from src.services.hashing import HashingPool, PoolSaturatedError
+
+
+@pytest.mark.asyncio
+async def test_run_hashes_in_pool():
+    pool = HashingPool(kind="thread", workers=2, max_queue=2)
+
+    hashed = await pool.run(get_password_hash, "password123")
+
+    assert await pool.run(verify_password, "password123", hashed) is True
+    stats = pool.stats()
+    assert stats["completed"] == 2
+    assert stats["queue_depth"] == 0
+    assert stats["avg_hash_ms"] > 0
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_rejects_when_saturated():
+    pool = HashingPool(kind="thread", workers=1, max_queue=1)
+    release = threading.Event()
+
+    running = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0)
+    assert pool.stats()["queue_depth"] == 1
+
+    with pytest.raises(PoolSaturatedError):
+        await pool.run(release.wait)
+
+    release.set()
+    await asyncio.gather(*running)
+    assert pool.stats()["rejected"] == 1
+    assert pool.pending == 0
+    pool.shutdown()
+
+
+def test_unknown_pool_kind():
+    with pytest.raises(ValueError):
+        HashingPool(kind="fiber")
+
+
+@pytest.mark.asyncio
+async def test_map_waits_instead_of_rejecting():
+    pool = HashingPool(kind="thread", workers=2, max_queue=0)
+
+    results = await pool.map(pow, [(2, i) for i in range(10)])
+
+    assert results == [2 ** i for i in range(10)]
+    assert pool.stats()["rejected"] == 0
+    pool.shutdown()
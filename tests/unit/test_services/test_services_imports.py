@@ -0,0 +1,115 @@
+import io
+from unittest.mock import AsyncMock
+
+import pytest
+from redis.exceptions import RedisError
+
+from src.services.imports import ImportJobs, iter_csv_rows, iter_vcard_rows
+from tests.conftest import FakeCacheService, TestingSessionLocal
+
+VCARD = """BEGIN:VCARD\r
+VERSION:3.0\r
+N:Doe;John;;;\r
+FN:John Doe\r
+EMAIL;TYPE=work:john@example.com\r
+EMAIL:john.other@example.com\r
+TEL:+380 44 123 4567\r
+BDAY:19900102\r
+NOTE:Met at the\r
+  conference\\, 2019\r
+END:VCARD\r
+BEGIN:VCARD\r
+VERSION:4.0\r
+FN:Jane Roe\r
+item1.EMAIL:jane@example.com\r
+TEL:555\r
+BDAY:1985-12-30\r
+END:VCARD\r
+"""
+
+
+def write_file(tmp_path, content):
+    path = tmp_path / "upload"
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+def test_iter_csv_rows_ignores_unknown_and_empty_columns():
+    file = io.StringIO("id,first_name,last_name,email,phone,birth_date,additional_data\n"
+                       "7,John,Doe,john@example.com,123,1990-01-02,\n")
+
+    assert list(iter_csv_rows(file)) == [{
+        "id": "7", "first_name": "John", "last_name": "Doe", "email": "john@example.com",
+        "phone": "123", "birth_date": "1990-01-02",
+    }]
+
+
+def test_iter_vcard_rows_maps_properties():
+    cards = list(iter_vcard_rows(io.StringIO(VCARD, newline="")))
+
+    assert cards[0] == {
+        "last_name": "Doe", "first_name": "John", "email": "john@example.com",
+        "phone": "+380 44 123 4567", "birth_date": "1990-01-02", "additional_data": "Met at the conference, 2019",
+    }
+    assert cards[1] == {
+        "first_name": "Jane", "last_name": "Roe", "email": "jane@example.com",
+        "phone": "555", "birth_date": "1985-12-30",
+    }
+
+
+def test_parsers_are_lazy():
+    lines = iter(["first_name,last_name,email,phone,birth_date\n", "A,B,a@example.com,1,1990-01-01\n"])
+    rows = iter_csv_rows(lines)
+
+    next(rows)
+    with pytest.raises(StopIteration):
+        next(rows)
+
+
+@pytest.mark.asyncio
+async def test_run_imports_in_chunks_and_reports_progress(async_session, tmp_path):
+    jobs = ImportJobs(FakeCacheService(), chunk_size=2)
+    rows = ["first_name,last_name,email,phone,birth_date"]
+    rows += [f"Name{i},Doe,user{i}@example.com,123,1990-01-0{i + 1}" for i in range(4)]
+    rows += ["Bad,Row,not-an-email,123,1990-01-01", "Name0,Again,user0@example.com,123,1990-01-01"]
+    path = write_file(tmp_path, "\n".join(rows) + "\n")
+
+    job_id = await jobs.create(1, "csv", "contacts.csv")
+    assert (await jobs.get(job_id, 1))["status"] == "queued"
+    await jobs.run(job_id, path, "csv", 1, TestingSessionLocal)
+
+    job = await jobs.get(job_id, 1)
+    assert job["status"] == "done"
+    assert (job["processed"], job["created"], job["updated"], job["rejected"]) == (6, 4, 1, 1)
+    assert job["errors"][0].startswith("row 5: invalid: email")
+    assert job["rows_per_second"] > 0
+    assert not (tmp_path / "upload").exists()
+    assert await jobs.get(job_id, 2) is None
+
+
+@pytest.mark.asyncio
+async def test_run_marks_job_failed_on_unreadable_file(async_session, tmp_path):
+    jobs = ImportJobs(FakeCacheService())
+    path = tmp_path / "upload"
+    path.write_bytes(b"\xff\xfe\x00bad")
+
+    job_id = await jobs.create(1, "csv", "contacts.csv")
+    await jobs.run(job_id, str(path), "csv", 1, TestingSessionLocal)
+
+    job = await jobs.get(job_id, 1)
+    assert job["status"] == "failed"
+    assert "import failed after 0 rows" in job["errors"][-1]
+
+
+@pytest.mark.asyncio
+async def test_run_removes_file_when_first_publish_fails(async_session, tmp_path):
+    jobs = ImportJobs(FakeCacheService())
+    path = write_file(tmp_path, "first_name,last_name,email,phone,birth_date\n")
+    job_id = await jobs.create(1, "csv", "contacts.csv")
+    jobs._publish = AsyncMock(side_effect=[RedisError("down"), None])
+
+    await jobs.run(job_id, path, "csv", 1, TestingSessionLocal)
+
+    assert not (tmp_path / "upload").exists()
+    assert jobs._publish.await_args.kwargs["status"] == "failed"
+    assert "import failed after 0 rows: down" in jobs._publish.await_args.kwargs["errors"][-1]
@@ -0,0 +1,113 @@
+import asyncio
+import smtplib
+from email.mime.text import MIMEText
+
+import pytest
+from unittest.mock import MagicMock
+
+from src.services.mail import Mailer
+
+
+def make_message(to: str) -> MIMEText:
+    msg = MIMEText("body")
+    msg['From'] = "noreply@example.com"
+    msg['To'] = to
+    return msg
+
+
+def make_mailer(factory, **kwargs) -> Mailer:
+    options = dict(
+        host="localhost",
+        port=1025,
+        username="user",
+        password="secret",
+        starttls=True,
+        pool_size=1,
+        batch_size=10,
+        max_retries=2,
+        retry_delay=0.001,
+        idle_timeout=5,
+        connection_factory=factory,
+    )
+    options.update(kwargs)
+    return Mailer(**options)
+
+
+@pytest.mark.asyncio
+async def test_mailer_reuses_authenticated_connection():
+    server = MagicMock()
+    factory = MagicMock(return_value=server)
+    mailer = make_mailer(factory)
+
+    for i in range(5):
+        await mailer.send(make_message(f"user{i}@example.com"))
+    await mailer.stop()
+
+    factory.assert_called_once_with("localhost", 1025)
+    server.starttls.assert_called_once()
+    server.login.assert_called_once_with("user", "secret")
+    assert server.send_message.call_count == 5
+    assert mailer.stats()["sent"] == 5
+
+
+@pytest.mark.asyncio
+async def test_mailer_retries_after_disconnect():
+    broken = MagicMock()
+    broken.send_message.side_effect = smtplib.SMTPServerDisconnected("gone")
+    healthy = MagicMock()
+    factory = MagicMock(side_effect=[broken, healthy])
+    mailer = make_mailer(factory)
+
+    await mailer.send(make_message("user@example.com"))
+    await mailer.stop()
+
+    assert factory.call_count == 2
+    healthy.send_message.assert_called_once()
+    stats = mailer.stats()
+    assert stats["sent"] == 1
+    assert stats["retried"] == 1
+    assert stats["failed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_mailer_gives_up_after_max_retries():
+    server = MagicMock()
+    server.send_message.side_effect = smtplib.SMTPRecipientsRefused({})
+    mailer = make_mailer(MagicMock(return_value=server), max_retries=2)
+
+    await mailer.send(make_message("user@example.com"))
+    await mailer.stop()
+
+    assert server.send_message.call_count == 3
+    stats = mailer.stats()
+    assert stats["sent"] == 0
+    assert stats["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_mailer_survives_unexpected_errors():
+    server = MagicMock()
+    server.send_message.side_effect = [ValueError("bad header"), None]
+    factory = MagicMock(return_value=server)
+    mailer = make_mailer(factory)
+
+    await mailer.send(make_message("broken@example.com"))
+    await mailer.send(make_message("user@example.com"))
+    await asyncio.wait_for(mailer.stop(timeout=5), 2)
+
+    assert server.send_message.call_count == 2
+    stats = mailer.stats()
+    assert (stats["sent"], stats["failed"], stats["retried"]) == (1, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_mailer_closes_connection_when_login_fails():
+    server = MagicMock()
+    server.login.side_effect = [smtplib.SMTPAuthenticationError(535, b"denied"), None]
+    mailer = make_mailer(MagicMock(return_value=server))
+
+    await mailer.send(make_message("user@example.com"))
+    await mailer.stop()
+
+    server.close.assert_called()
+    assert mailer.stats()["sent"] == 1
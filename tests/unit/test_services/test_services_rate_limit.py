@@ -0,0 +1,118 @@
+import uuid
+
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, patch
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from redis.exceptions import RedisError
+
+from src.services.cache import CacheService
+from src.services.rate_limit import RateLimiter, RateLimitExceeded, parse_rate
+
+
+@pytest.fixture
+def limiter():
+    limiter = RateLimiter(CacheService(), enabled=True)
+    limiter.script = AsyncMock(side_effect=RedisError())
+    return limiter
+
+
+@pytest_asyncio.fixture
+async def redis_limiter():
+    limiter = RateLimiter(CacheService(), enabled=True)
+    try:
+        await limiter.cache_service.redis.ping()
+    except (RedisError, OSError):
+        pytest.skip("Redis is not available")
+    prefix = f"test:{uuid.uuid4().hex}"
+    yield limiter, prefix
+    keys = await limiter.cache_service.redis.keys(f"ratelimit:{prefix}:*")
+    if keys:
+        await limiter.cache_service.redis.delete(*keys)
+
+
+def test_parse_rate():
+    assert parse_rate("5/minute") == (5, 5 / 60)
+    assert parse_rate("100/second") == (100, 100)
+
+
+@pytest.mark.asyncio
+async def test_hit_uses_redis_script():
+    limiter = RateLimiter(CacheService(), enabled=True)
+    limiter.script = AsyncMock(side_effect=["0", "2.5"])
+
+    await limiter.hit([("login:ip:1.2.3.4", "2/second"), ("login:global", "10/second")])
+    with pytest.raises(RateLimitExceeded) as exc_info:
+        await limiter.hit([("login:ip:1.2.3.4", "2/second")])
+
+    assert exc_info.value.retry_after == 2.5
+    first_call = limiter.script.call_args_list[0].kwargs
+    assert first_call["keys"] == ["ratelimit:login:ip:1.2.3.4", "ratelimit:login:global"]
+    assert first_call["args"] == [2, 2.0, 10, 10.0]
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_script_on_redis(redis_limiter):
+    limiter, prefix = redis_limiter
+
+    await limiter.hit([(f"{prefix}:a", "2/minute")])
+    await limiter.hit([(f"{prefix}:a", "2/minute")])
+    with pytest.raises(RateLimitExceeded) as exc_info:
+        await limiter.hit([(f"{prefix}:b", "5/minute"), (f"{prefix}:a", "2/minute")])
+
+    assert 0 < exc_info.value.retry_after <= 30
+    for _ in range(5):
+        await limiter.hit([(f"{prefix}:b", "5/minute")])
+    assert limiter.stats()["fallback"] == 0
+
+
+@pytest.mark.asyncio
+async def test_login_bucket_is_per_email_and_client(limiter):
+    with patch("src.services.rate_limit.config.RATE_LIMIT_EMAIL", "1/minute"):
+        await limiter.check_email("login", "victim@example.com", "10.0.0.1")
+        with pytest.raises(RateLimitExceeded):
+            await limiter.check_email("login", "victim@example.com", "10.0.0.1")
+
+        await limiter.check_email("login", "victim@example.com", "10.0.0.2")
+
+
+@pytest.mark.asyncio
+async def test_local_fallback_limits_requests(limiter):
+    with patch("src.services.rate_limit.config.RATE_LIMIT_EMAIL", "3/minute"):
+        for _ in range(3):
+            await limiter.check_email("login", "Test@Example.com ")
+
+        with pytest.raises(RateLimitExceeded) as exc_info:
+            await limiter.check_email("login", "test@example.com")
+
+    assert 0 < exc_info.value.retry_after <= 20
+    assert limiter.stats()["fallback"] == 4
+
+
+@pytest.mark.asyncio
+async def test_local_fallback_consumes_nothing_when_denied(limiter):
+    await limiter.hit([("a", "1/minute")])
+
+    with pytest.raises(RateLimitExceeded):
+        await limiter.hit([("b", "1/minute"), ("a", "1/minute")])
+
+    await limiter.hit([("b", "1/minute")])
+
+
+def test_limit_dependency_returns_429_with_retry_after(limiter):
+    from main import rate_limit_handler
+
+    app = FastAPI()
+    app.add_exception_handler(RateLimitExceeded, rate_limit_handler)
+
+    @app.post("/login", dependencies=[Depends(limiter.limit("login"))])
+    async def login():
+        return {"ok": True}
+
+    client = TestClient(app)
+    with patch("src.services.rate_limit.config.RATE_LIMIT_IP", "2/minute"):
+        responses = [client.post("/login") for _ in range(3)]
+
+    assert [r.status_code for r in responses] == [200, 200, 429]
+    assert int(responses[2].headers["Retry-After"]) >= 1
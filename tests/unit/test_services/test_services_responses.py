@@ -0,0 +1,46 @@
+import pytest
+
+from src.services.cache import CacheService
+from src.services.responses import ResponseCache
+from tests.conftest import FakeRedis
+
+
+@pytest.fixture
+def responses():
+    cache_service = CacheService()
+    cache_service.redis = FakeRedis()
+    return ResponseCache(cache_service)
+
+
+def loader(body):
+    calls = []
+
+    async def load():
+        calls.append(body)
+        return body
+    return load, calls
+
+
+@pytest.mark.asyncio
+async def test_repeated_query_is_served_from_cache(responses):
+    load, calls = loader("[1]")
+
+    assert await responses.get_or_load(1, "10", "list", {"limit": 2, "search": None}, load) == "[1]"
+    assert await responses.get_or_load(1, "10", "list", {"limit": 2}, load) == "[1]"
+
+    assert len(calls) == 1
+    assert responses.stats() == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+
+@pytest.mark.asyncio
+async def test_new_generation_user_or_query_misses(responses):
+    load, calls = loader("[]")
+
+    await responses.get_or_load(1, "10", "list", {"limit": 2}, load)
+    await responses.get_or_load(1, "11", "list", {"limit": 2}, load)
+    await responses.get_or_load(2, "11", "list", {"limit": 2}, load)
+    await responses.get_or_load(2, "11", "list", {"limit": 3}, load)
+    await responses.get_or_load(2, "11", "birthdays", {"limit": 3}, load)
+
+    assert len(calls) == 5
+    assert responses.stats()["hit_ratio"] == 0.0
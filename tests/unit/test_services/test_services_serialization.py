@@ -0,0 +1,87 @@
+from datetime import date, datetime, timezone
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+
+from src.repository.contacts import ContactRepository
+from src.schemas.contact import ContactCreate, ContactResponse
+from src.services.serialization import (
+    ORJSONResponse, contact_rows_adapter, dump_contact_row, dump_contact_rows, dumps, parse_fields
+)
+
+adapter = TypeAdapter(List[ContactResponse])
+
+
+async def seed(repo):
+    await repo.create(ContactCreate(
+        first_name="Zoë", last_name="Ørsted \"Q\"", email="zoe@example.com",
+        phone="+380 50 123", birth_date=date(1990, 2, 28), additional_data="line\nbreak ✓",
+    ), user_id=1)
+    await repo.create(ContactCreate(
+        first_name="John", last_name="Doe", email="john@example.com",
+        phone="123456789", birth_date=date(1985, 12, 31),
+    ), user_id=1)
+
+
+@pytest.mark.asyncio
+async def test_row_path_matches_model_serialisation(async_session):
+    repo = ContactRepository(async_session)
+    await seed(repo)
+
+    fast = dump_contact_rows(await repo.get_all(user_id=1, rows=True))
+    slow = adapter.dump_json(adapter.validate_python(await repo.get_all(user_id=1), from_attributes=True))
+
+    assert fast == slow
+
+
+@pytest.mark.asyncio
+async def test_search_rows_match_and_keep_rank(async_session):
+    repo = ContactRepository(async_session)
+    await seed(repo)
+
+    rows = await repo.search_contacts("doe", user_id=1, rows=True)
+    contacts = await repo.search_contacts("doe", user_id=1)
+
+    assert [row.search_rank for row in rows] == [c.search_rank for c in contacts]
+    assert dump_contact_rows(rows) == adapter.dump_json(adapter.validate_python(contacts, from_attributes=True))
+
+
+def test_dumps_matches_pydantic_for_timestamps():
+    row = ("A", "B", "a@example.com", "1", date(2000, 1, 1), None, 1, 2,
+           datetime(2024, 1, 1, 10, 0, 0, 123456), datetime(2024, 1, 1, tzinfo=timezone.utc))
+    model = ContactResponse(**dict(zip(ContactResponse.model_fields, row)))
+
+    assert dump_contact_rows([row]) == adapter.dump_json([model])
+    assert dumps({"ok": True}) == b'{"ok":true}'
+
+
+def test_orjson_response_passes_encoded_bodies_through():
+    assert ORJSONResponse(content=b'[1, 2]').body == b'[1, 2]'
+    assert ORJSONResponse(content=[1, 2]).body == b"[1,2]"
+
+
+def test_parse_fields_normalises_order_and_rejects_unknown():
+    assert parse_fields(None) is None
+    assert parse_fields(" phone,first_name,phone ") == ("first_name", "phone")
+    assert parse_fields(",".join(reversed(ContactResponse.model_fields))) is None
+    with pytest.raises(ValueError, match="password"):
+        parse_fields("first_name,password")
+    with pytest.raises(ValueError):
+        parse_fields(" , ")
+
+
+@pytest.mark.asyncio
+async def test_projected_rows_select_only_requested_columns(async_session):
+    repo = ContactRepository(async_session)
+    await seed(repo)
+    fields = ("first_name", "phone")
+
+    rows = await repo.get_all(user_id=1, fields=fields)
+    contact = await repo.get_by_id(rows[0].id, user_id=1, fields=fields)
+
+    assert rows[0]._fields == ("first_name", "phone", "id", "version")
+    assert dump_contact_rows(rows, fields) == b'[{"first_name":"Zo\xc3\xab","phone":"+380 50 123"},' \
+                                              b'{"first_name":"John","phone":"123456789"}]'
+    assert dump_contact_row(contact, fields) == b'{"first_name":"Zo\xc3\xab","phone":"+380 50 123"}'
+    assert contact_rows_adapter(fields) is contact_rows_adapter(fields)
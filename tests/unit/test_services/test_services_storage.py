@@ -0,0 +1,76 @@
+import io
+import os
+
+import pytest
+from unittest.mock import patch
+from fastapi import UploadFile
+
+from src.services.storage import LocalStorage, CloudinaryStorage, FileTooLargeError, StorageBackend
+
+
+def make_upload(data: bytes, filename: str = "avatar.png") -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename=filename)
+
+
+@pytest.mark.asyncio
+async def test_local_storage_saves_file(tmp_path):
+    storage = LocalStorage(root=str(tmp_path), base_url="/uploads/", max_bytes=1024, chunk_size=4)
+
+    url = await storage.save(make_upload(b"image-bytes"), "avatars")
+
+    assert url.startswith("/uploads/avatars/")
+    assert url.endswith(".png")
+    stored = tmp_path / "avatars" / url.rsplit("/", 1)[1]
+    assert stored.read_bytes() == b"image-bytes"
+    assert os.listdir(tmp_path / "avatars") == [stored.name]
+
+
+@pytest.mark.asyncio
+async def test_local_storage_rejects_large_file(tmp_path):
+    storage = LocalStorage(root=str(tmp_path), max_bytes=8, chunk_size=4)
+
+    with pytest.raises(FileTooLargeError):
+        await storage.save(make_upload(b"x" * 9), "avatars")
+
+    assert os.listdir(tmp_path / "avatars") == []
+
+
+@pytest.mark.asyncio
+async def test_local_storage_drops_unsafe_suffix(tmp_path):
+    storage = LocalStorage(root=str(tmp_path))
+
+    url = await storage.save(make_upload(b"data", filename="../../evil.p/hp"), "avatars")
+
+    assert "." not in url.rsplit("/", 1)[1]
+
+
+@pytest.mark.asyncio
+async def test_cloudinary_storage_uploads_streamed_file():
+    storage = CloudinaryStorage(max_bytes=1024, chunk_size=4)
+
+    with patch("src.services.storage.cloudinary.uploader.upload") as mock_upload:
+        mock_upload.side_effect = lambda f, folder: {
+            "secure_url": f"https://cdn/{folder}/{f.read().decode()}"
+        }
+        url = await storage.save(make_upload(b"image"), "avatars")
+
+    assert url == "https://cdn/avatars/image"
+
+
+@pytest.mark.asyncio
+async def test_cloudinary_storage_rejects_large_file():
+    storage = CloudinaryStorage(max_bytes=4, chunk_size=2)
+
+    with patch("src.services.storage.cloudinary.uploader.upload") as mock_upload:
+        with pytest.raises(FileTooLargeError):
+            await storage.save(make_upload(b"too large"), "avatars")
+
+    mock_upload.assert_not_called()
+
+
+def test_storage_backend_requires_save():
+    class Incomplete(StorageBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,87 @@
+import pytest
+
+from src.services.auth import decode_token
+from src.services.tokens import InvalidRefreshTokenError, RefreshTokenStore
+
+
+class FakeCache:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def swap(self, key, value, ex=None):
+        if key not in self.data:
+            return None
+        old, self.data[key] = self.data[key], value
+        return old
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+
+@pytest.fixture
+def store():
+    return RefreshTokenStore(FakeCache())
+
+
+@pytest.mark.asyncio
+async def test_issue_creates_token_family(store):
+    access_token, refresh_token = await store.issue("test@example.com")
+
+    access = decode_token(access_token)
+    refresh = decode_token(refresh_token)
+    assert access["type"] == "access"
+    assert refresh["type"] == "refresh"
+    assert store.cache_service.data[f"refresh_family:{refresh['fid']}"] == refresh["jti"]
+
+
+@pytest.mark.asyncio
+async def test_rotate_issues_new_refresh_token(store):
+    _, refresh_token = await store.issue("test@example.com")
+
+    access_token, new_refresh_token = await store.rotate(refresh_token)
+
+    assert decode_token(access_token)["sub"] == "test@example.com"
+    old, new = decode_token(refresh_token), decode_token(new_refresh_token)
+    assert new["fid"] == old["fid"]
+    assert new["jti"] != old["jti"]
+
+
+@pytest.mark.asyncio
+async def test_reuse_revokes_family(store):
+    _, refresh_token = await store.issue("test@example.com")
+    _, new_refresh_token = await store.rotate(refresh_token)
+
+    with pytest.raises(InvalidRefreshTokenError):
+        await store.rotate(refresh_token)
+    with pytest.raises(InvalidRefreshTokenError):
+        await store.rotate(new_refresh_token)
+
+
+@pytest.mark.asyncio
+async def test_revoke_all_invalidates_existing_tokens(store):
+    _, refresh_token = await store.issue("test@example.com")
+
+    await store.revoke_all("test@example.com")
+
+    with pytest.raises(InvalidRefreshTokenError):
+        await store.rotate(refresh_token)
+    _, fresh_token = await store.issue("test@example.com")
+    await store.rotate(fresh_token)
+
+
+@pytest.mark.asyncio
+async def test_access_token_is_not_a_refresh_token(store):
+    access_token, _ = await store.issue("test@example.com")
+
+    with pytest.raises(InvalidRefreshTokenError):
+        await store.rotate(access_token)
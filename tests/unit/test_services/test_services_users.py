@@ -0,0 +1,97 @@
+import json
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models import User, Role
+from src.services.cache import CacheService
+from src.services.users import UserCache
+
+
+def make_user():
+    return User(
+        id=1,
+        username="testuser",
+        email="test@example.com",
+        password="hashed",
+        avatar=None,
+        confirmed=True,
+        role=Role.USER,
+    )
+
+
+@pytest.fixture
+def cache_service():
+    service = CacheService()
+    service.redis = AsyncMock()
+    service.redis.get.return_value = None
+    return service
+
+
+@pytest.mark.asyncio
+async def test_get_user_loads_from_db_on_miss(cache_service):
+    user_cache = UserCache(cache_service)
+
+    with patch(
+        "src.services.users.UserRepository.get_user_by_email", return_value=make_user()
+    ) as mock_repo:
+        user = await user_cache.get_user("test@example.com", AsyncMock(spec=AsyncSession))
+
+    assert user.id == 1
+    assert user.password is None
+    mock_repo.assert_called_once_with("test@example.com")
+    cache_service.redis.set.assert_called_once()
+    assert "hashed" not in cache_service.redis.set.call_args.args[1]
+
+
+@pytest.mark.asyncio
+async def test_get_user_uses_redis_before_db(cache_service):
+    cache_service.redis.get.return_value = json.dumps(UserCache._to_dict(make_user()))
+    user_cache = UserCache(cache_service)
+
+    with patch("src.services.users.UserRepository.get_user_by_email") as mock_repo:
+        user = await user_cache.get_user("test@example.com", AsyncMock(spec=AsyncSession))
+
+    assert user.email == "test@example.com"
+    assert user.role == Role.USER
+    mock_repo.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_user_uses_local_tier_before_redis(cache_service):
+    user_cache = UserCache(cache_service)
+
+    with patch("src.services.users.UserRepository.get_user_by_email", return_value=make_user()):
+        await user_cache.get_user("test@example.com", AsyncMock(spec=AsyncSession))
+        await user_cache.get_user("test@example.com", AsyncMock(spec=AsyncSession))
+
+    cache_service.redis.get.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_user_falls_back_to_db_when_redis_is_down(cache_service):
+    cache_service.redis.get.side_effect = RedisError()
+    cache_service.redis.set.side_effect = RedisError()
+    user_cache = UserCache(cache_service)
+
+    with patch("src.services.users.UserRepository.get_user_by_email", return_value=make_user()):
+        user = await user_cache.get_user("test@example.com", AsyncMock(spec=AsyncSession))
+
+    assert user.id == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate_clears_both_tiers(cache_service):
+    user_cache = UserCache(cache_service)
+
+    with patch(
+        "src.services.users.UserRepository.get_user_by_email", return_value=make_user()
+    ) as mock_repo:
+        await user_cache.get_user("test@example.com", AsyncMock(spec=AsyncSession))
+        await user_cache.invalidate("test@example.com")
+        await user_cache.get_user("test@example.com", AsyncMock(spec=AsyncSession))
+
+    cache_service.redis.delete.assert_called_once_with("user:test@example.com")
+    assert mock_repo.call_count == 2
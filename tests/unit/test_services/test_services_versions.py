@@ -0,0 +1,102 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from redis.exceptions import RedisError
+
+from src.services.contacts import collection_etag, etag_matches
+from src.services.versions import BUMP_SCRIPT, CollectionVersions
+from tests.conftest import FakeCacheService
+
+
+@pytest.fixture
+def versions():
+    return CollectionVersions(FakeCacheService())
+
+
+@pytest.mark.asyncio
+async def test_current_is_created_once_and_bumped_on_write(versions):
+    first = await versions.current(1)
+    assert await versions.current(1) == first
+
+    await versions.bump("update", [MagicMock(user_id=1)])
+    assert int(await versions.current(1)) == int(first) + 1
+    assert versions.stats() == {"bumps": 1, "errors": 0, "resets": 0}
+
+
+@pytest.mark.asyncio
+async def test_lost_counter_restarts_above_old_values(versions):
+    old = await versions.current(1)
+    versions.cache_service.redis.data.clear()
+
+    await versions.bump("create", [MagicMock(user_id=1)])
+    assert int(await versions.current(1)) > int(old)
+
+
+@pytest.mark.asyncio
+async def test_contact_versions_are_forgotten_after_a_write(versions):
+    version = await versions.current(1)
+    await versions.remember(1, version, 5, 3)
+    assert await versions.contact_version(1, version, 5) == 3
+    assert await versions.contact_version(1, version, 6) is None
+
+    await versions.bump("update", [MagicMock(user_id=1)])
+    assert await versions.contact_version(1, await versions.current(1), 5) is None
+
+
+@pytest.mark.asyncio
+async def test_failed_bump_starts_a_new_generation(versions):
+    old = await versions.current(1)
+    versions.script = AsyncMock(side_effect=RedisError())
+
+    await versions.bump("delete", [MagicMock(user_id=1)])
+
+    assert versions.stats()["errors"] == 1
+    assert versions.stats()["resets"] == 1
+    assert await versions.current(1) != old
+
+
+@pytest.mark.asyncio
+async def test_unreachable_redis_blocks_generations_until_reset(versions):
+    redis = versions.cache_service.redis
+    old = await versions.current(1)
+    versions.script = AsyncMock(side_effect=RedisError())
+    delete = redis.delete
+    redis.delete = AsyncMock(side_effect=RedisError())
+
+    await versions.bump("update", [MagicMock(user_id=1)])
+    with pytest.raises(RedisError):
+        await versions.current(2)
+
+    redis.delete = delete
+    assert await versions.current(1) != old
+    assert versions.stats()["resets"] == 1
+
+
+def test_collection_etag_depends_on_version_and_query():
+    etag = collection_etag("10", {"limit": 2, "search": None})
+
+    assert etag == collection_etag("10", {"limit": 2})
+    assert etag != collection_etag("11", {"limit": 2})
+    assert etag != collection_etag("10", {"limit": 3})
+    assert etag.startswith('"c10-')
+
+
+def test_etag_matches_uses_weak_comparison():
+    assert etag_matches('"a", W/"v1"', '"v1"')
+    assert etag_matches("*", '"v1"')
+    assert not etag_matches('"v2"', '"v1"')
+    assert not etag_matches(None, '"v1"')
+
+
+@pytest.mark.asyncio
+async def test_bump_script_on_redis(redis_service):
+    service, prefix = redis_service
+    script = service.redis.register_script(BUMP_SCRIPT)
+    key = f"contacts_version:{prefix}"
+
+    assert await script(keys=[key]) is None
+    assert await service.redis.exists(key) == 0
+
+    await service.redis.set(key, 41)
+    assert await script(keys=[key]) == 42
+    assert await service.redis.get(key) == "42"